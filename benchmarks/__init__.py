@@ -0,0 +1 @@
+"""Benchmarks that run without the Win32 API."""
@@ -0,0 +1,178 @@
+"""
+Benchmark for the frozen build profiles.
+
+Builds NoMore2ndScreen.exe with each profile of build_exe.py (into
+dist/bench/<profile>), then reports the artifact size and how long a launch
+takes until the tray is up. Each launch passes --exit-after-startup, so the
+time is measured from starting the process to its exit, including the
+unpacking the onefile build does first and the cleanup of its temp folder.
+
+The first launch after a build is reported as "cold". For launches with a
+really cold file cache (as after a logon), pass --flush-command with a tool
+that empties the standby list, e.g. "RAMMap64.exe -Et" (needs admin), and it
+is run before every cold launch. Windows only; the launched application
+enforces the current config while it runs.
+
+Usage:
+    python -m benchmarks.bench_build
+    python -m benchmarks.bench_build --no-build --runs 10 --json build_results.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Optional, Tuple
+
+if __package__ in (None, ""):
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from build_exe import APP_NAME, PROFILES, get_executable_path
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCH_DISTPATH = os.path.join("dist", "bench")
+
+# A launch taking longer than this counts as failed
+LAUNCH_TIMEOUT_S = 120.0
+
+
+def get_distpath(profile: str) -> str:
+    """Get the folder a profile is built into."""
+    return os.path.join(BENCH_DISTPATH, profile)
+
+
+def build(profile: str):
+    """Build one profile with build_exe.py."""
+    subprocess.run(
+        [sys.executable, "build_exe.py", "--profile", profile, "--distpath", get_distpath(profile)],
+        cwd=ROOT,
+        check=True,
+    )
+
+
+def get_artifact_size(profile: str) -> Tuple[int, int]:
+    """
+    Get the size of a built profile.
+
+    Args:
+        profile: One of build_exe.PROFILES
+
+    Returns:
+        (total bytes, number of files) of everything that has to be shipped.
+    """
+    executable = os.path.join(ROOT, get_executable_path(profile, get_distpath(profile)))
+    if profile != "slim":
+        return os.path.getsize(executable), 1
+
+    total = 0
+    files = 0
+    for root, _, names in os.walk(os.path.dirname(executable)):
+        for name in names:
+            total += os.path.getsize(os.path.join(root, name))
+            files += 1
+    return total, files
+
+
+def time_launch(profile: str, flush_command: Optional[str] = None) -> float:
+    """
+    Launch a build until it exited after startup.
+
+    Args:
+        profile: One of build_exe.PROFILES
+        flush_command: Shell command run first to empty the file cache
+
+    Returns:
+        Seconds from launch to exit.
+    """
+    if flush_command:
+        subprocess.run(flush_command, shell=True, check=False)
+
+    executable = os.path.join(ROOT, get_executable_path(profile, get_distpath(profile)))
+    start = time.perf_counter()
+    result = subprocess.run(
+        [executable, "--exit-after-startup"],
+        timeout=LAUNCH_TIMEOUT_S,
+        check=False,
+    )
+    elapsed = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(f"{APP_NAME} ({profile}) exited with code {result.returncode}")
+    return elapsed
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the frozen build profiles")
+    parser.add_argument(
+        "--profiles", default=",".join(PROFILES),
+        help=f"comma-separated build profiles (default: {','.join(PROFILES)})",
+    )
+    parser.add_argument(
+        "--runs", type=int, default=5, help="warm launches per profile (default: 5)"
+    )
+    parser.add_argument(
+        "--no-build", action="store_true", help="measure the existing builds in dist/bench"
+    )
+    parser.add_argument(
+        "--flush-command", help="command that empties the file cache before the cold launch"
+    )
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args(argv)
+
+    if sys.platform != "win32":
+        print("The frozen builds only run on Windows", file=sys.stderr)
+        return 1
+
+    profiles = [part.strip() for part in args.profiles.split(",") if part.strip()]
+    for profile in profiles:
+        if profile not in PROFILES:
+            parser.error(f"unknown profile: {profile}")
+
+    if not args.no_build:
+        for profile in profiles:
+            build(profile)
+
+    header = (
+        f"{'profile':>8} {'size MB':>8} {'files':>6} {'cold s':>7} "
+        f"{'warm s':>7} {'warm min':>8}"
+    )
+    print(header)
+    print("-" * len(header))
+
+    results = []
+    for profile in profiles:
+        size, files = get_artifact_size(profile)
+        cold = time_launch(profile, args.flush_command)
+        warm = [time_launch(profile) for _ in range(args.runs)]
+        result = {
+            "profile": profile,
+            "size_bytes": size,
+            "files": files,
+            "cold_s": round(cold, 3),
+            "warm_median_s": round(statistics.median(warm), 3) if warm else None,
+            "warm_min_s": round(min(warm), 3) if warm else None,
+            "warm_s": [round(seconds, 3) for seconds in warm],
+        }
+        results.append(result)
+
+        print(
+            f"{profile:>8} {size / (1024 * 1024):>8.1f} {files:>6} {cold:>7.2f} "
+            f"{result['warm_median_s'] or 0.0:>7.2f} {result['warm_min_s'] or 0.0:>8.2f}",
+            flush=True,
+        )
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(
+                {"flush_command": args.flush_command, "runs": args.runs, "results": results},
+                f, indent=4,
+            )
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
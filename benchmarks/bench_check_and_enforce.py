@@ -0,0 +1,273 @@
+"""
+Benchmark for WindowMonitor.check_and_enforce.
+
+Runs the full enforcement check against FakeWindowSystem, so it works on any
+platform. Each scenario combines a window count, a monitor count, a
+whitelist size and a drag state; --churn puts windows back on a protected
+monitor before every tick so the move path is measured too. It reports:
+
+- ticks/s: full checks per second
+- us/window: time per enumerated window
+- alloc: peak bytes allocated during one tick and bytes still held after it
+
+Usage:
+    python -m benchmarks.bench_check_and_enforce
+    python -m benchmarks.bench_check_and_enforce --windows 500 --monitors 2,4 --drag off
+    python -m benchmarks.bench_check_and_enforce --windows 500 --monitors 2 --churn 10
+    python -m benchmarks.bench_check_and_enforce --json results.json
+"""
+
+import argparse
+import gc
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from typing import List
+
+if __package__ in (None, ""):
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fake_window_system import FakeWindowSystem
+from core.whitelist import Whitelist, DEFAULT_WHITELIST
+from core.window_monitor import WindowMonitor
+
+
+DEFAULT_WINDOW_COUNTS = [50, 500, 5000]
+DEFAULT_MONITOR_COUNTS = [1, 2, 4, 8]
+DEFAULT_WHITELIST_SIZES = [0, 100, 1000]
+
+
+@dataclass
+class ScenarioResult:
+    """Measurements of one benchmark scenario."""
+
+    windows: int
+    monitors: int
+    whitelist: int
+    dragging: bool
+    churn: int
+    ticks: int
+    ticks_per_sec: float
+    us_per_tick: float
+    us_per_window: float
+    moves: int
+    alloc_peak_kib: float
+    alloc_retained_kib: float
+
+
+def make_whitelist(directory: str, size: int) -> Whitelist:
+    """
+    Create a whitelist with extra entries in a temporary config file.
+
+    Every other entry names a process that FakeWindowSystem.populate() uses,
+    so lookups hit as well as miss.
+    """
+    entries = list(DEFAULT_WHITELIST)
+    entries += [
+        f"APP{index:05d}.EXE" if index % 2 == 0 else f"EXTRA{index:05d}.EXE"
+        for index in range(size)
+    ]
+    config_path = os.path.join(directory, f"whitelist_{size}.json")
+    with open(config_path, "w", encoding="utf-8") as f:
+        json.dump({"whitelist": entries, "custom_whitelist": []}, f)
+    return Whitelist(config_path)
+
+
+def make_monitor(
+    system: FakeWindowSystem, whitelist: Whitelist, dragging: bool
+) -> WindowMonitor:
+    """Create a WindowMonitor on a populated fake window system."""
+    system.dragging = dragging
+    if dragging:
+        # The user holds a window on a protected monitor
+        for hwnd, window in system.windows.items():
+            if window.visible and window.hmonitor != system.monitors[0].handle:
+                system.foreground = hwnd
+                break
+
+    protected = [monitor.device_name for monitor in system.monitors[1:]]
+    monitor = WindowMonitor(
+        protected_device_names=protected, whitelist=whitelist, window_system=system
+    )
+    monitor.set_primary_device(system.monitors[0].device_name)
+    return monitor
+
+
+def run_scenario(
+    window_count: int,
+    monitor_count: int,
+    whitelist: Whitelist,
+    whitelist_size: int,
+    dragging: bool,
+    duration: float,
+    churn: int = 0,
+    measure_alloc: bool = True,
+) -> ScenarioResult:
+    """
+    Run one scenario.
+
+    Args:
+        window_count: Number of fake windows
+        monitor_count: Number of fake monitors
+        whitelist: Whitelist to enforce
+        whitelist_size: Number of extra whitelist entries (for the report)
+        dragging: Hold the left mouse button on a window for the whole run
+        duration: Minimum measured time in seconds
+        churn: Windows put back on a protected monitor before each tick
+        measure_alloc: Trace allocations of an extra tick
+
+    Returns:
+        ScenarioResult object
+    """
+    system = FakeWindowSystem(monitor_count)
+    system.populate(window_count)
+    monitor = make_monitor(system, whitelist, dragging)
+
+    visible = [hwnd for hwnd, window in system.windows.items() if window.visible]
+    cursor = 0
+
+    def apply_churn():
+        nonlocal cursor
+        if monitor_count < 2 or not visible:
+            return
+        for _ in range(churn):
+            system.place_window(visible[cursor], 1 + cursor % (monitor_count - 1))
+            cursor = (cursor + 1) % len(visible)
+
+    # The first tick fills the process cache and moves the initial violators
+    monitor.check_and_enforce()
+    moves_before = monitor.get_stats().total_moves
+
+    gc.collect()
+    ticks = 0
+    elapsed = 0.0
+    deadline = time.perf_counter() + duration
+    while True:
+        apply_churn()
+        start = time.perf_counter()
+        monitor.check_and_enforce()
+        end = time.perf_counter()
+        elapsed += end - start
+        ticks += 1
+        if end >= deadline and ticks >= 3:
+            break
+
+    moves = monitor.get_stats().total_moves - moves_before
+
+    alloc_peak = 0.0
+    alloc_retained = 0.0
+    if measure_alloc:
+        apply_churn()
+        gc.collect()
+        tracemalloc.start()
+        try:
+            before, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            monitor.check_and_enforce()
+            after, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        alloc_peak = (peak - before) / 1024.0
+        alloc_retained = (after - before) / 1024.0
+
+    us_per_tick = elapsed / ticks * 1e6
+    return ScenarioResult(
+        windows=window_count,
+        monitors=monitor_count,
+        whitelist=whitelist_size,
+        dragging=dragging,
+        churn=churn,
+        ticks=ticks,
+        ticks_per_sec=ticks / elapsed,
+        us_per_tick=us_per_tick,
+        us_per_window=us_per_tick / window_count,
+        moves=moves,
+        alloc_peak_kib=alloc_peak,
+        alloc_retained_kib=alloc_retained,
+    )
+
+
+def _parse_int_list(value: str) -> List[int]:
+    return [int(part) for part in value.split(",") if part.strip()]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark WindowMonitor.check_and_enforce")
+    parser.add_argument(
+        "--windows", type=_parse_int_list, default=DEFAULT_WINDOW_COUNTS,
+        help="comma-separated window counts (default: 50,500,5000)",
+    )
+    parser.add_argument(
+        "--monitors", type=_parse_int_list, default=DEFAULT_MONITOR_COUNTS,
+        help="comma-separated monitor counts (default: 1,2,4,8)",
+    )
+    parser.add_argument(
+        "--whitelist", type=_parse_int_list, default=DEFAULT_WHITELIST_SIZES,
+        help="comma-separated extra whitelist sizes (default: 0,100,1000)",
+    )
+    parser.add_argument(
+        "--drag", choices=["off", "on", "both"], default="both",
+        help="drag states to run (default: both)",
+    )
+    parser.add_argument(
+        "--duration", type=float, default=0.5,
+        help="minimum measured seconds per scenario (default: 0.5)",
+    )
+    parser.add_argument(
+        "--churn", type=int, default=0,
+        help="windows moved onto a protected monitor before each tick (default: 0)",
+    )
+    parser.add_argument("--no-alloc", action="store_true", help="skip allocation tracing")
+    parser.add_argument("--json", metavar="PATH", help="also write results to a JSON file")
+    args = parser.parse_args(argv)
+
+    drag_states = {"off": [False], "on": [True], "both": [False, True]}[args.drag]
+
+    header = (
+        f"{'windows':>7} {'mons':>4} {'wlist':>5} {'drag':>4} "
+        f"{'ticks/s':>9} {'us/tick':>10} {'us/win':>7} {'moves':>5} "
+        f"{'peak KiB':>8} {'kept KiB':>8}"
+    )
+    print(header)
+    print("-" * len(header))
+
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        whitelists = {size: make_whitelist(directory, size) for size in args.whitelist}
+        for window_count in args.windows:
+            for monitor_count in args.monitors:
+                for size in args.whitelist:
+                    for dragging in drag_states:
+                        result = run_scenario(
+                            window_count,
+                            monitor_count,
+                            whitelists[size],
+                            size,
+                            dragging,
+                            args.duration,
+                            churn=args.churn,
+                            measure_alloc=not args.no_alloc,
+                        )
+                        results.append(result)
+                        print(
+                            f"{result.windows:>7} {result.monitors:>4} {size:>5} "
+                            f"{'yes' if dragging else 'no':>4} "
+                            f"{result.ticks_per_sec:>9.1f} {result.us_per_tick:>10.1f} "
+                            f"{result.us_per_window:>7.2f} {result.moves:>5} "
+                            f"{result.alloc_peak_kib:>8.1f} {result.alloc_retained_kib:>8.1f}",
+                            flush=True,
+                        )
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump([asdict(result) for result in results], f, indent=4)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,174 @@
+"""
+Microbenchmark for the compiled whitelist matcher.
+
+Builds a whitelist of exact names, globs, regular expressions, folders and
+class/title qualified rules (10,000 by default) and times lookups through
+WhitelistMatcher against checking every rule one by one. Lookups are timed
+for names seen before (warm, the steady state of the enforcement loop; served
+from the per-name cache) and for names seen for the first time (cold; these
+grow linearly with the number of glob, regex and qualified rules).
+
+Usage:
+    python -m benchmarks.bench_whitelist_rules
+    python -m benchmarks.bench_whitelist_rules --rules 1000,10000 --lookups 20000
+"""
+
+import argparse
+import fnmatch
+import os
+import random
+import re
+import sys
+import time
+from typing import List, Tuple
+
+if __package__ in (None, ""):
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.whitelist_rules import WhitelistMatcher
+
+
+# (name, exe, class_name, title)
+Query = Tuple[str, str, str, str]
+
+
+def make_rules(count: int, seed: int = 0) -> List[str]:
+    """
+    Generate a realistic mix of whitelist rules.
+
+    Args:
+        count: Number of rules
+        seed: Random seed
+
+    Returns:
+        List of whitelist entries.
+    """
+    rng = random.Random(seed)
+    rules = []
+    for index in range(count):
+        kind = rng.random()
+        if kind < 0.70:
+            rules.append(f"APP{index:05d}.EXE")
+        elif kind < 0.80:
+            rules.append(f"*VIEWER{index:05d}*.EXE")
+        elif kind < 0.85:
+            rules.append(f"re:^TOOL{index:05d}(_\\d+)?\\.EXE$")
+        elif kind < 0.95:
+            rules.append(f"C:\\Program Files\\Vendor{index:05d}\\")
+        else:
+            rules.append(f"QUAL{index:05d}.EXE | class=Class{index % 7} | title=*Slides*")
+    return rules
+
+
+def make_queries(count: int, rule_count: int, seed: int = 1) -> List[Query]:
+    """Generate lookups that hit and miss the generated rules."""
+    rng = random.Random(seed)
+    queries = []
+    for _ in range(count):
+        index = rng.randrange(rule_count * 2)
+        name = rng.choice(
+            [f"APP{index:05d}.EXE", f"PDFVIEWER{index:05d}X.EXE", f"TOOL{index:05d}_2.EXE",
+             f"QUAL{index:05d}.EXE", f"OTHER{index:05d}.EXE"]
+        )
+        exe = f"C:\\Program Files\\Vendor{index:05d}\\bin\\{name}"
+        queries.append((name, exe, f"Class{index % 7}", "Quarterly Slides"))
+    return queries
+
+
+class NaiveMatcher:
+    """Reference matcher that checks every rule in turn."""
+
+    def __init__(self, rules: List[str]):
+        self.rules = []
+        for rule in rules:
+            parts = [part.strip() for part in re.split(r"\s*\|\s*(?=(?:class|title)=)", rule)]
+            base = parts[0]
+            if not base.startswith("re:"):
+                base = base.upper()
+            qualifiers = dict(part.split("=", 1) for part in parts[1:])
+            self.rules.append((base, qualifiers))
+
+    def matches(self, name: str, exe: str, class_name: str, title: str) -> bool:
+        for base, qualifiers in self.rules:
+            if base.startswith("re:"):
+                if not re.match(base[3:], name, re.IGNORECASE):
+                    continue
+            elif "\\" in base:
+                if not exe.upper().startswith(base):
+                    continue
+            elif not fnmatch.fnmatchcase(name, base):
+                continue
+            if "class" in qualifiers and qualifiers["class"].upper() != class_name.upper():
+                continue
+            if "title" in qualifiers and not fnmatch.fnmatch(title.upper(), qualifiers["title"].upper()):
+                continue
+            return True
+        return False
+
+
+def time_lookups(matcher, queries: List[Query]) -> Tuple[float, int]:
+    """Time a list of lookups, returning (microseconds per lookup, hits)."""
+    hits = 0
+    start = time.perf_counter()
+    for query in queries:
+        if matcher.matches(*query):
+            hits += 1
+    elapsed = time.perf_counter() - start
+    return elapsed / len(queries) * 1e6, hits
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the whitelist matcher")
+    parser.add_argument(
+        "--rules", default="100,1000,10000",
+        help="comma-separated rule counts (default: 100,1000,10000)",
+    )
+    parser.add_argument(
+        "--lookups", type=int, default=20000, help="lookups per measurement (default: 20000)"
+    )
+    parser.add_argument(
+        "--naive-lookups", type=int, default=200,
+        help="lookups for the rule-by-rule reference (default: 200)",
+    )
+    args = parser.parse_args(argv)
+
+    header = (
+        f"{'rules':>6} {'compile ms':>10} {'warm us':>8} {'cold us':>8} "
+        f"{'naive us':>9} {'hit rate':>8}"
+    )
+    print(header)
+    print("-" * len(header))
+
+    for rule_count in [int(part) for part in args.rules.split(",") if part.strip()]:
+        rules = make_rules(rule_count)
+
+        start = time.perf_counter()
+        matcher = WhitelistMatcher(rules)
+        compile_ms = (time.perf_counter() - start) * 1000.0
+
+        # Cold: every name is looked up for the first time
+        cold_queries = make_queries(args.lookups, rule_count, seed=2)
+        cold_us, _ = time_lookups(WhitelistMatcher(rules), cold_queries)
+
+        # Warm: a desktop's worth of distinct processes, looked up repeatedly
+        distinct = make_queries(200, rule_count, seed=3)
+        warm_queries = [distinct[index % len(distinct)] for index in range(args.lookups)]
+        time_lookups(matcher, distinct)
+        warm_us, hits = time_lookups(matcher, warm_queries)
+
+        naive_us, naive_hits = time_lookups(NaiveMatcher(rules), warm_queries[: args.naive_lookups])
+        compiled_hits = sum(matcher.matches(*query) for query in warm_queries[: args.naive_lookups])
+        if naive_hits != compiled_hits:
+            print(f"warning: compiled matcher found {compiled_hits} hits, reference {naive_hits}")
+
+        print(
+            f"{rule_count:>6} {compile_ms:>10.1f} {warm_us:>8.2f} {cold_us:>8.2f} "
+            f"{naive_us:>9.1f} {hits / len(warm_queries):>8.1%}",
+            flush=True,
+        )
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
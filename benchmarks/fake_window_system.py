@@ -0,0 +1,286 @@
+"""
+In-memory window system for benchmarks.
+
+FakeWindowSystem implements the interface of core.window_system's
+Win32WindowSystem on top of plain dicts: a row of monitors, a set of
+top-level windows and a process table. It lets WindowMonitor run unchanged
+on any platform.
+"""
+
+import random
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+from core.monitor_info import MonitorInfo
+
+
+MONITOR_WIDTH = 1920
+MONITOR_HEIGHT = 1080
+
+# Process names handed out to fake windows; the first entries are in the
+# default whitelist, POWERPNT.EXE exercises the slideshow special case
+COMMON_PROCESS_NAMES = [
+    "OBS64.EXE",
+    "POWERPNT.EXE",
+    "CHROME.EXE",
+    "EXPLORER.EXE",
+    "CODE.EXE",
+    "OUTLOOK.EXE",
+    "TEAMS.EXE",
+    "NOTEPAD.EXE",
+]
+
+
+class FakeProcess:
+    """Process object with the psutil.Process methods used by ProcessCache."""
+
+    __slots__ = ("pid", "_name", "_create_time")
+
+    def __init__(self, pid: int, name: str, create_time: float):
+        self.pid = pid
+        self._name = name
+        self._create_time = create_time
+
+    def create_time(self) -> float:
+        return self._create_time
+
+    def name(self) -> str:
+        return self._name
+
+    def exe(self) -> str:
+        return f"C:\\Program Files\\{self._name[:-4]}\\{self._name}"
+
+
+@dataclass
+class FakeWindow:
+    """State of one fake top-level window."""
+
+    hwnd: int
+    pid: int
+    title: str
+    class_name: str
+    rect: Tuple[int, int, int, int]
+    visible: bool = True
+    hmonitor: Optional[int] = None
+
+
+class FakeWindowSystem:
+    """Window system kept entirely in memory."""
+
+    def __init__(self, monitor_count: int = 2):
+        """
+        Initialize the fake window system.
+
+        Args:
+            monitor_count: Number of monitors, laid out left to right; the
+                first one is the primary monitor
+        """
+        self.monitors: List[MonitorInfo] = []
+        for index in range(monitor_count):
+            left = index * MONITOR_WIDTH
+            rect = (left, 0, left + MONITOR_WIDTH, MONITOR_HEIGHT)
+            self.monitors.append(
+                MonitorInfo(
+                    handle=0x10000 + index,
+                    index=index,
+                    is_primary=index == 0,
+                    rc_monitor=rect,
+                    rc_work=(rect[0], rect[1], rect[2], rect[3] - 40),
+                    device_name=f"\\\\.\\DISPLAY{index + 1}",
+                )
+            )
+        self._devices_by_handle: Dict[int, FrozenSet[str]] = {
+            monitor.handle: frozenset([monitor.device_name]) for monitor in self.monitors
+        }
+
+        self.windows: Dict[int, FakeWindow] = {}
+        self.processes: Dict[int, FakeProcess] = {}
+        self.dragging = False
+        self.foreground = 0
+        self.last_input_tick = 0
+        self.topology_generation = 1
+        self.monitor_invalidations = 0
+
+        # Counters for sanity checks in benchmark output
+        self.single_moves = 0
+        self.batch_moves = 0
+
+    # Setup
+
+    def add_process(self, pid: int, name: str, create_time: float = 1.0):
+        """Add a process to the process table."""
+        self.processes[pid] = FakeProcess(pid, name, create_time)
+
+    def add_window(
+        self,
+        hwnd: int,
+        pid: int,
+        rect: Tuple[int, int, int, int],
+        title: str = "",
+        class_name: str = "FakeWindowClass",
+        visible: bool = True,
+    ):
+        """Add a top-level window."""
+        window = FakeWindow(hwnd, pid, title, class_name, rect, visible)
+        window.hmonitor = self._monitor_for_rect(rect)
+        self.windows[hwnd] = window
+
+    def place_window(self, hwnd: int, monitor_index: int):
+        """Move a window onto a monitor, keeping its size."""
+        window = self.windows[hwnd]
+        monitor = self.monitors[monitor_index]
+        width = window.rect[2] - window.rect[0]
+        height = window.rect[3] - window.rect[1]
+        x = monitor.left + 100
+        y = monitor.top + 100
+        self._set_rect(window, (x, y, x + width, y + height))
+
+    def populate(
+        self,
+        window_count: int,
+        windows_per_process: int = 4,
+        protected_fraction: float = 0.2,
+        seed: int = 0,
+    ):
+        """
+        Fill the system with windows spread over the monitors.
+
+        Args:
+            window_count: Number of top-level windows
+            windows_per_process: Average number of windows owned by one process
+            protected_fraction: Share of windows placed on non-primary monitors
+            seed: Random seed, so every run sees the same layout
+        """
+        rng = random.Random(seed)
+        process_count = max(1, window_count // max(1, windows_per_process))
+        for index in range(process_count):
+            pid = 1000 + index * 4
+            if index < len(COMMON_PROCESS_NAMES):
+                name = COMMON_PROCESS_NAMES[index]
+            else:
+                name = f"APP{index:05d}.EXE"
+            self.add_process(pid, name, create_time=1000.0 + index)
+
+        pids = sorted(self.processes)
+        for index in range(window_count):
+            hwnd = 0x20000 + index * 2
+            if len(self.monitors) > 1 and rng.random() < protected_fraction:
+                monitor = self.monitors[rng.randrange(1, len(self.monitors))]
+            else:
+                monitor = self.monitors[0]
+            x = monitor.left + rng.randrange(0, MONITOR_WIDTH - 800)
+            y = monitor.top + rng.randrange(0, MONITOR_HEIGHT - 600)
+            self.add_window(
+                hwnd,
+                pids[rng.randrange(len(pids))],
+                (x, y, x + 800, y + 600),
+                title=f"Window {index}",
+                # Roughly a third of real top-level windows are hidden
+                visible=rng.random() > 0.3,
+            )
+
+    def _monitor_for_rect(self, rect: Tuple[int, int, int, int]) -> Optional[int]:
+        """Get the monitor with the largest intersection, like MonitorFromWindow."""
+        best_handle = None
+        best_area = 0
+        for monitor in self.monitors:
+            width = min(rect[2], monitor.right) - max(rect[0], monitor.left)
+            height = min(rect[3], monitor.bottom) - max(rect[1], monitor.top)
+            if width > 0 and height > 0 and width * height > best_area:
+                best_area = width * height
+                best_handle = monitor.handle
+        return best_handle
+
+    def _set_rect(self, window: FakeWindow, rect: Tuple[int, int, int, int]):
+        window.rect = rect
+        window.hmonitor = self._monitor_for_rect(rect)
+
+    # Windows
+
+    def enum_windows(self, callback, extra):
+        for hwnd in list(self.windows):
+            if callback(hwnd, extra) is False:
+                break
+
+    def _get(self, hwnd: int) -> FakeWindow:
+        window = self.windows.get(hwnd)
+        if window is None:
+            raise OSError(f"Invalid window handle {hwnd:#x}")
+        return window
+
+    def is_window(self, hwnd: int) -> bool:
+        return hwnd in self.windows
+
+    def is_window_visible(self, hwnd: int) -> bool:
+        window = self.windows.get(hwnd)
+        return window is not None and window.visible
+
+    def get_window_text(self, hwnd: int) -> str:
+        return self._get(hwnd).title
+
+    def get_class_name(self, hwnd: int) -> str:
+        return self._get(hwnd).class_name
+
+    def get_window_rect(self, hwnd: int) -> Tuple[int, int, int, int]:
+        return self._get(hwnd).rect
+
+    def get_foreground_window(self) -> int:
+        return self.foreground
+
+    def get_window_pid(self, hwnd: int) -> int:
+        return self._get(hwnd).pid
+
+    def set_window_pos(self, hwnd: int, x: int, y: int, width: int, height: int):
+        self._set_rect(self._get(hwnd), (x, y, x + width, y + height))
+        self.single_moves += 1
+
+    def set_window_pos_batch(self, placements: Sequence[Tuple[int, int, int, int, int]]):
+        for hwnd, x, y, width, height in placements:
+            self._set_rect(self._get(hwnd), (x, y, x + width, y + height))
+        self.batch_moves += 1
+
+    # Input
+
+    def is_left_button_down(self) -> bool:
+        return self.dragging
+
+    def get_last_input_tick(self) -> int:
+        return self.last_input_tick
+
+    # Monitors
+
+    def get_monitors(self) -> List[MonitorInfo]:
+        return list(self.monitors)
+
+    def get_primary_monitor(self) -> Optional[MonitorInfo]:
+        return self.monitors[0] if self.monitors else None
+
+    def get_monitor_by_device_name(self, device_name: str) -> Optional[MonitorInfo]:
+        for monitor in self.monitors:
+            if monitor.device_name == device_name:
+                return monitor
+        return None
+
+    def has_projectors(self) -> bool:
+        return len(self.monitors) > 1
+
+    def get_topology_generation(self) -> int:
+        return self.topology_generation
+
+    def invalidate_monitors(self):
+        self.monitor_invalidations += 1
+
+    def get_device_names_for_handle(self, handle: Optional[int]) -> FrozenSet[str]:
+        return self._devices_by_handle.get(handle, frozenset())
+
+    def monitor_from_window(self, hwnd: int) -> Optional[int]:
+        window = self.windows.get(hwnd)
+        return window.hmonitor if window is not None else None
+
+    # Processes
+
+    def open_process(self, pid: int) -> FakeProcess:
+        process = self.processes.get(pid)
+        if process is None:
+            raise LookupError(f"No process with PID {pid}")
+        return process
@@ -1,14 +1,100 @@
 """
 Build script to create the executable using PyInstaller.
+
+Two build profiles are available:
+
+- ``onefile`` (default): a single NoMore2ndScreen.exe. Every launch unpacks
+  the bundled Python and Qt files to a temporary folder first.
+- ``slim``: a NoMore2ndScreen folder with the executable next to its files,
+  so nothing is unpacked at launch. Only the Qt modules the application
+  imports are bundled, and the Python code is byte-compiled with
+  optimization (needs PyInstaller 6.6 or later).
+
+Usage:
+    python build_exe.py
+    python build_exe.py --profile slim
 """
 
-import PyInstaller.__main__
+import argparse
 import os
 import shutil
 
+
+APP_NAME = "NoMore2ndScreen"
+PROFILES = ("onefile", "slim")
+
+HIDDEN_IMPORTS = [
+    'PySide6.QtCore',
+    'PySide6.QtGui',
+    'PySide6.QtWidgets',
+    'win32gui',
+    'win32con',
+    'win32process',
+    'win32api',
+    'psutil',
+    'win32timezone',
+]
+
+# Qt modules the application never imports; kept out of the slim build even
+# if some other package asks for them
+UNUSED_QT_MODULES = [
+    'PySide6.Qt3DAnimation',
+    'PySide6.Qt3DCore',
+    'PySide6.Qt3DExtras',
+    'PySide6.Qt3DInput',
+    'PySide6.Qt3DLogic',
+    'PySide6.Qt3DRender',
+    'PySide6.QtBluetooth',
+    'PySide6.QtCharts',
+    'PySide6.QtConcurrent',
+    'PySide6.QtDataVisualization',
+    'PySide6.QtDesigner',
+    'PySide6.QtGraphs',
+    'PySide6.QtHelp',
+    'PySide6.QtHttpServer',
+    'PySide6.QtLocation',
+    'PySide6.QtMultimedia',
+    'PySide6.QtMultimediaWidgets',
+    'PySide6.QtNetwork',
+    'PySide6.QtNetworkAuth',
+    'PySide6.QtNfc',
+    'PySide6.QtOpenGL',
+    'PySide6.QtOpenGLWidgets',
+    'PySide6.QtPdf',
+    'PySide6.QtPdfWidgets',
+    'PySide6.QtPositioning',
+    'PySide6.QtPrintSupport',
+    'PySide6.QtQml',
+    'PySide6.QtQuick',
+    'PySide6.QtQuick3D',
+    'PySide6.QtQuickControls2',
+    'PySide6.QtQuickWidgets',
+    'PySide6.QtRemoteObjects',
+    'PySide6.QtScxml',
+    'PySide6.QtSensors',
+    'PySide6.QtSerialBus',
+    'PySide6.QtSerialPort',
+    'PySide6.QtSpatialAudio',
+    'PySide6.QtSql',
+    'PySide6.QtStateMachine',
+    'PySide6.QtSvg',
+    'PySide6.QtSvgWidgets',
+    'PySide6.QtTest',
+    'PySide6.QtTextToSpeech',
+    'PySide6.QtUiTools',
+    'PySide6.QtWebChannel',
+    'PySide6.QtWebEngineCore',
+    'PySide6.QtWebEngineQuick',
+    'PySide6.QtWebEngineWidgets',
+    'PySide6.QtWebSockets',
+    'PySide6.QtXml',
+    'tkinter',
+]
+
+
 # Cleanup function to remove build artifacts
 def cleanup():
-    artifacts = ['__pycache__', 'build', '.ruff_cache', '.idea', 'NoMore2ndScreen.spec']
+    artifacts = ['__pycache__', 'build', '.ruff_cache', '.idea', f'{APP_NAME}.spec']
     for artifact in artifacts:
         if os.path.exists(artifact):
             if os.path.isdir(artifact):
@@ -25,35 +111,86 @@ def cleanup():
             shutil.rmtree(pycache_path)
             print(f"Removed: {pycache_path}")
 
-# Build the executable with all necessary hidden imports
-PyInstaller.__main__.run([
-    'main.py',
-    '--name=NoMore2ndScreen',
-    '--onefile',
-    '--noconsole',
-    '--windowed',
-    '--hidden-import=PySide6.QtCore',
-    '--hidden-import=PySide6.QtGui',
-    '--hidden-import=PySide6.QtWidgets',
-    '--hidden-import=win32gui',
-    '--hidden-import=win32con',
-    '--hidden-import=win32process',
-    '--hidden-import=win32api',
-    '--hidden-import=psutil',
-    '--hidden-import=win32timezone',
-    '--collect-all=PySide6',
-    '--clean',
-])
-
-print("\n" + "="*60)
-print("Build complete!")
-print("="*60)
-print("Executable location: dist/NoMore2ndScreen.exe")
-print("\nTo run the app:")
-print("  dist/NoMore2ndScreen.exe")
-print("="*60)
-
-# Cleanup build artifacts
-print("\nCleaning up build artifacts...")
-cleanup()
-print("\nCleanup complete! Only dist/ folder remains.")
+
+def get_pyinstaller_args(profile: str, distpath: str = "dist") -> list:
+    """
+    Get the PyInstaller command line for a build profile.
+
+    Args:
+        profile: One of PROFILES
+        distpath: Folder the build is written to
+
+    Returns:
+        List of PyInstaller arguments.
+    """
+    args = [
+        'main.py',
+        f'--name={APP_NAME}',
+        '--noconsole',
+        '--windowed',
+        f'--distpath={distpath}',
+        '--clean',
+        '--noconfirm',
+    ]
+    args += [f'--hidden-import={module}' for module in HIDDEN_IMPORTS]
+
+    if profile == "slim":
+        args += ['--onedir', '--optimize=2']
+        args += [f'--exclude-module={module}' for module in UNUSED_QT_MODULES]
+    else:
+        args += ['--onefile', '--collect-all=PySide6']
+
+    return args
+
+
+def get_executable_path(profile: str, distpath: str = "dist") -> str:
+    """
+    Get the path of the built executable.
+
+    Args:
+        profile: One of PROFILES
+        distpath: Folder the build was written to
+
+    Returns:
+        Path of NoMore2ndScreen.exe.
+    """
+    if profile == "slim":
+        return os.path.join(distpath, APP_NAME, f"{APP_NAME}.exe")
+    return os.path.join(distpath, f"{APP_NAME}.exe")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the No More 2nd Screen executable")
+    parser.add_argument(
+        "--profile", choices=PROFILES, default="onefile",
+        help="onefile: single exe (default); slim: folder build, faster start",
+    )
+    parser.add_argument("--distpath", default="dist", help="output folder (default: dist)")
+    args = parser.parse_args(argv)
+
+    # Imported here so the helpers above work without PyInstaller installed
+    import PyInstaller.__main__
+
+    # Build the executable with all necessary hidden imports
+    PyInstaller.__main__.run(get_pyinstaller_args(args.profile, args.distpath))
+
+    executable = get_executable_path(args.profile, args.distpath)
+
+    print("\n" + "="*60)
+    print(f"Build complete! ({args.profile})")
+    print("="*60)
+    print(f"Executable location: {executable}")
+    if args.profile == "slim":
+        print("Copy the whole folder; the exe needs the files next to it.")
+    print("\nTo run the app:")
+    print(f"  {executable}")
+    print("="*60)
+
+    # Cleanup build artifacts
+    print("\nCleaning up build artifacts...")
+    cleanup()
+    print(f"\nCleanup complete! Only {args.distpath}/ folder remains.")
+
+
+if __name__ == "__main__":
+    main()
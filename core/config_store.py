@@ -0,0 +1,434 @@
+"""
+Configuration store module.
+
+This module owns the parsed config.json. The application, the whitelist and
+the settings dialog all read and change the same in-memory dict; changes are
+written back after a short delay, so a burst of edits costs one write, and
+every write replaces the file atomically (temp file + rename), so a crash
+never leaves a truncated config behind.
+
+Changes made to the file by other programs are picked up with
+check_for_changes(): the file is only stat()ed unless its modification time
+or size changed, and only parsed if its contents really differ.
+"""
+
+import atexit
+import copy
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional, Sequence, Set, Tuple
+
+
+# Delay between a change and the write that persists it
+DEFAULT_WRITE_DELAY = 0.25
+
+# Delay before a failed write is tried again
+WRITE_RETRY_DELAY = 5.0
+
+
+DEFAULT_CONFIG: Dict[str, Any] = {
+    "autostart": False,
+    "protection_enabled": True,
+    "check_interval_ms": 500,
+    "adaptive_interval": False,
+    "max_check_interval_ms": 2000,
+    "engine_mode": "poll",
+    "safety_sweep_interval_ms": 5000,
+    "protected_monitors": [2, 3],
+    "whitelist": ["OBS64.EXE", "OBS32.EXE"],
+    "custom_whitelist": [],
+}
+
+
+def get_config_path() -> Path:
+    """Get config file path, using AppData for PyInstaller builds."""
+    if getattr(sys, 'frozen', False):
+        # Running as exe - use AppData directory
+        config_dir = Path(os.environ.get('APPDATA', os.path.expanduser('~')))
+        config_dir = config_dir / "NoMore2ndScreen"
+    else:
+        # Running as Python script - use the project directory
+        config_dir = Path(__file__).parent.parent
+
+    config_dir.mkdir(parents=True, exist_ok=True)
+    return config_dir / "config.json"
+
+
+def get_default_config() -> Dict[str, Any]:
+    """Get a fresh copy of the default configuration."""
+    return copy.deepcopy(DEFAULT_CONFIG)
+
+
+def migrate_protected_monitors(config: Dict[str, Any], monitors: Sequence) -> bool:
+    """
+    Convert protected monitors stored as 1-based indices to device names.
+
+    Args:
+        config: Config dict, changed in place
+        monitors: Current monitors (MonitorInfo objects), in index order
+
+    Returns:
+        True if the config was changed and should be saved.
+    """
+    protected = config.get("protected_monitors", [])
+    if not (isinstance(protected, list) and protected and isinstance(protected[0], int)):
+        return False
+
+    device_names = []
+    for idx in protected:
+        if 0 < idx <= len(monitors):
+            device_names.append(monitors[idx - 1].device_name)
+
+    if not device_names:
+        return False
+    config["protected_monitors"] = device_names
+    return True
+
+
+class ConfigStore:
+    """In-memory config with debounced, atomic write-behind."""
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        write_delay: float = DEFAULT_WRITE_DELAY,
+    ):
+        """
+        Initialize the config store.
+
+        Args:
+            path: Path to the config file. If None, uses get_config_path()
+            write_delay: Seconds to wait for further changes before writing
+        """
+        self.path = Path(path) if path is not None else get_config_path()
+        self.write_delay = write_delay
+
+        # Shared by every reader; replaced in place so references stay valid
+        self.data: Dict[str, Any] = {}
+        self.loaded = False
+        self.writes = 0
+        self.last_error: Optional[Exception] = None
+
+        self.reloads = 0
+
+        self._lock = threading.RLock()
+        self._dirty = False
+        self._timer: Optional[threading.Timer] = None
+        # (mtime_ns, size) and SHA-1 of the file as last read or written
+        self._signature: Optional[Tuple[int, int]] = None
+        self._digest: Optional[bytes] = None
+        # Contents of the file as last read or written, to tell which keys
+        # have changes that are not written yet
+        self._saved: Dict[str, Any] = {}
+        # The file could not be parsed; it is backed up before it is replaced
+        self._unparsable = False
+
+    def load(self) -> Dict[str, Any]:
+        """
+        Read the config file into memory, discarding unsaved changes.
+
+        A missing file is created with the defaults; an unparsable one is
+        replaced by the defaults in memory, and copied to config.json.bak
+        before the next write replaces it, so hand edits are not lost.
+
+        Returns:
+            The config dict (the same object on every call).
+        """
+        with self._lock:
+            self._cancel_timer()
+            self._dirty = False
+
+            loaded = None
+            missing = not self.path.exists()
+            if not missing:
+                try:
+                    loaded = self._parse(self._read())
+                except Exception as e:
+                    self.last_error = e
+                    loaded = None
+            self._unparsable = not missing and loaded is None
+            self._saved = copy.deepcopy(loaded) if loaded is not None else {}
+
+            self.data.clear()
+            self.data.update(loaded if loaded is not None else get_default_config())
+            self.loaded = True
+
+            if missing:
+                self.save()
+
+            return self.data
+
+    def ensure_loaded(self) -> Dict[str, Any]:
+        """
+        Get the config dict, reading the file only if it was not read yet.
+
+        Returns:
+            The config dict.
+        """
+        with self._lock:
+            if not self.loaded:
+                self.load()
+            return self.data
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        Get a config value.
+
+        Args:
+            key: Config key
+            default: Value returned if the key is not set
+
+        Returns:
+            The value.
+        """
+        return self.ensure_loaded().get(key, default)
+
+    def set(self, key: str, value: Any):
+        """
+        Set a config value and schedule a write.
+
+        Args:
+            key: Config key
+            value: New value (must be JSON serializable)
+        """
+        self.update({key: value})
+
+    def update(self, values: Mapping[str, Any]):
+        """
+        Set several config values and schedule a single write.
+
+        Args:
+            values: Keys and their new values
+        """
+        with self._lock:
+            self.ensure_loaded().update(values)
+            self.save()
+
+    def save(self):
+        """
+        Schedule a write of the current config.
+
+        Callers that changed self.data directly (holding self.lock) use this
+        to persist it; writes requested within write_delay of each other are
+        coalesced.
+        """
+        with self._lock:
+            self._dirty = True
+            if self._timer is not None:
+                return
+            if self.write_delay <= 0:
+                self.flush()
+                return
+            self._schedule(self.write_delay)
+
+    def flush(self) -> bool:
+        """
+        Write pending changes now.
+
+        A failed write is stored in last_error and tried again after
+        WRITE_RETRY_DELAY, so the change is not lost until the next save().
+
+        Returns:
+            True if the file is up to date, False if the write failed.
+        """
+        with self._lock:
+            self._cancel_timer()
+            if not self._dirty:
+                return True
+            try:
+                self._write(json.dumps(self.data, indent=4))
+                self._saved = copy.deepcopy(self.data)
+            except Exception as e:
+                self.last_error = e
+                self._schedule(WRITE_RETRY_DELAY)
+                return False
+            self._dirty = False
+            self.writes += 1
+            return True
+
+    def check_for_changes(self) -> Set[str]:
+        """
+        Reload the config if another program changed the file.
+
+        Costs one stat() when the file is unchanged. If it changed, the new
+        contents replace the in-memory config and the keys whose values
+        differ are reported. Keys changed in the application but not written
+        yet keep their in-memory values (and are still written). A deleted
+        file is ignored until it changes again; an unparsable one too, and it
+        is backed up before the next write replaces it.
+
+        Returns:
+            Set of changed top-level keys (empty if nothing changed).
+        """
+        with self._lock:
+            if not self.loaded:
+                return set()
+
+            signature = self._stat()
+            if signature is None or signature == self._signature:
+                return set()
+
+            previous_digest = self._digest
+            try:
+                raw = self._read()
+            except OSError:
+                return set()
+            if self._digest == previous_digest:
+                # Touched, or rewritten with the same contents
+                return set()
+
+            try:
+                loaded = self._parse(raw)
+            except Exception as e:
+                self.last_error = e
+                loaded = None
+            if loaded is None:
+                self._unparsable = True
+                return set()
+            self._unparsable = False
+
+            # Changes made here that are not written yet win over the file
+            merged = dict(loaded)
+            pending = False
+            if self._dirty:
+                for key in set(self.data) | set(self._saved):
+                    if key not in self.data:
+                        if key in self._saved:
+                            merged.pop(key, None)
+                            pending = True
+                    elif self.data[key] != self._saved.get(key):
+                        merged[key] = self.data[key]
+                        pending = True
+
+            changed = {
+                key for key in set(self.data) | set(merged)
+                if self.data.get(key) != merged.get(key)
+            }
+
+            self._saved = copy.deepcopy(loaded)
+            self.data.clear()
+            self.data.update(merged)
+            self.reloads += 1
+
+            if pending:
+                if self._timer is None:
+                    self.save()
+            else:
+                self._cancel_timer()
+                self._dirty = False
+            return changed
+
+    @property
+    def lock(self) -> threading.RLock:
+        """
+        Lock guarding self.data.
+
+        Hold it while changing self.data in place; set() and update() take
+        it themselves. The write-behind timer serializes under it.
+        """
+        return self._lock
+
+    @property
+    def dirty(self) -> bool:
+        """Check if there are changes that are not written yet."""
+        return self._dirty
+
+    def _timer_fired(self):
+        with self._lock:
+            self._timer = None
+        self.flush()
+
+    def _schedule(self, delay: float):
+        """Start the write timer (call with the lock held)."""
+        self._timer = threading.Timer(delay, self._timer_fired)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _cancel_timer(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _stat(self) -> Optional[Tuple[int, int]]:
+        """Get the (mtime_ns, size) of the config file, None if it is missing."""
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _read(self) -> bytes:
+        """Read the config file and remember what was read."""
+        signature = self._stat()
+        with open(self.path, "rb") as f:
+            raw = f.read()
+        self._signature = signature
+        self._digest = hashlib.sha1(raw).digest()
+        return raw
+
+    @staticmethod
+    def _parse(raw: bytes) -> Optional[Dict[str, Any]]:
+        """Parse config file contents, None if they are not a JSON object."""
+        loaded = json.loads(raw.decode("utf-8-sig"))
+        return loaded if isinstance(loaded, dict) else None
+
+    def _write(self, text: str):
+        """Replace the config file atomically with the given contents."""
+        directory = self.path.parent
+        directory.mkdir(parents=True, exist_ok=True)
+        raw = text.encode("utf-8")
+
+        if self._unparsable and self.path.exists():
+            # Keep a hand-edited file that could not be read
+            shutil.copy2(self.path, self.path.with_name(self.path.name + ".bak"))
+        self._unparsable = False
+
+        fd, temp_path = tempfile.mkstemp(
+            prefix=self.path.name + ".", suffix=".tmp", dir=str(directory)
+        )
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(raw)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.path)
+        except BaseException:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            raise
+
+        # Our own writes are not reported as external changes
+        self._signature = self._stat()
+        self._digest = hashlib.sha1(raw).digest()
+
+
+# Global config store instance
+_store_instance = None
+
+
+def get_config_store(path: Optional[Path] = None) -> ConfigStore:
+    """
+    Get the global config store instance.
+
+    Args:
+        path: Optional path to config file (only used on first call)
+
+    Returns:
+        ConfigStore instance
+    """
+    global _store_instance
+
+    if _store_instance is None:
+        _store_instance = ConfigStore(path)
+        # Pending changes survive an exit that skips the normal shutdown path
+        atexit.register(_store_instance.flush)
+
+    return _store_instance
@@ -0,0 +1,197 @@
+"""
+Display change notification module.
+
+This module watches for monitors being added, removed or rearranged so that
+the cached monitor topology is only rebuilt when it can have changed. A
+hidden window receives the broadcasts Windows sends on these changes; its
+messages are dispatched by whichever thread created it while that thread
+pumps messages (the enforcement engine's worker thread).
+"""
+
+from typing import Callable
+
+from .window_events import pump_messages, WM_NULL
+
+
+WM_SETTINGCHANGE = 0x001A
+WM_DISPLAYCHANGE = 0x007E
+WM_DEVICECHANGE = 0x0219
+
+DBT_DEVNODES_CHANGED = 0x0007
+DBT_DEVICEARRIVAL = 0x8000
+DBT_DEVICEREMOVECOMPLETE = 0x8004
+
+# WM_SETTINGCHANGE wParam when the taskbar changes a monitor's work area
+SPI_SETWORKAREA = 0x002F
+
+WATCHER_CLASS_NAME = "NoMore2ndScreenDisplayWatcher"
+
+
+def is_display_change(message: int, wparam: int) -> bool:
+    """
+    Check if a window message can mean the monitor topology changed.
+
+    Args:
+        message: Window message
+        wparam: Message wParam
+
+    Returns:
+        True for display mode, device and work area changes.
+    """
+    if message == WM_DISPLAYCHANGE:
+        return True
+    if message == WM_DEVICECHANGE:
+        return wparam in (DBT_DEVNODES_CHANGED, DBT_DEVICEARRIVAL, DBT_DEVICEREMOVECOMPLETE)
+    if message == WM_SETTINGCHANGE:
+        return wparam == SPI_SETWORKAREA
+    return False
+
+
+class DisplayChangeWatcher:
+    """
+    Hidden window that reports display and device changes.
+
+    The window is a regular (never shown) top-level window rather than a
+    message-only window, because broadcasts such as WM_DISPLAYCHANGE are not
+    sent to message-only windows.
+    """
+
+    def __init__(self, on_change: Callable[[], None]):
+        """
+        Initialize the watcher.
+
+        Args:
+            on_change: Called on the creating thread for every notification
+                that can mean the monitors changed; expected to be cheap
+        """
+        self.on_change = on_change
+        self.notifications = 0
+        self._user32 = None
+        self._hwnd = None
+        self._wndproc = None
+        self._hinstance = None
+        self._thread_id = 0
+
+    def start(self) -> bool:
+        """
+        Create the hidden window on the calling thread.
+
+        Returns:
+            True if the window was created, False otherwise (e.g. not on
+            Windows).
+        """
+        import ctypes
+        from ctypes import wintypes
+
+        try:
+            user32 = ctypes.windll.user32
+            kernel32 = ctypes.windll.kernel32
+        except Exception:
+            return False
+
+        LRESULT = ctypes.c_ssize_t
+        WNDPROC = ctypes.WINFUNCTYPE(
+            LRESULT, wintypes.HWND, wintypes.UINT, wintypes.WPARAM, wintypes.LPARAM
+        )
+
+        class WNDCLASSW(ctypes.Structure):
+            _fields_ = [
+                ("style", wintypes.UINT),
+                ("lpfnWndProc", WNDPROC),
+                ("cbClsExtra", ctypes.c_int),
+                ("cbWndExtra", ctypes.c_int),
+                ("hInstance", wintypes.HINSTANCE),
+                ("hIcon", wintypes.HICON),
+                ("hCursor", wintypes.HANDLE),
+                ("hbrBackground", wintypes.HBRUSH),
+                ("lpszMenuName", wintypes.LPCWSTR),
+                ("lpszClassName", wintypes.LPCWSTR),
+            ]
+
+        user32.DefWindowProcW.argtypes = [
+            wintypes.HWND, wintypes.UINT, wintypes.WPARAM, wintypes.LPARAM
+        ]
+        user32.DefWindowProcW.restype = LRESULT
+        user32.RegisterClassW.argtypes = [ctypes.POINTER(WNDCLASSW)]
+        user32.RegisterClassW.restype = wintypes.ATOM
+        user32.UnregisterClassW.argtypes = [wintypes.LPCWSTR, wintypes.HINSTANCE]
+        user32.UnregisterClassW.restype = wintypes.BOOL
+        user32.CreateWindowExW.argtypes = [
+            wintypes.DWORD, wintypes.LPCWSTR, wintypes.LPCWSTR, wintypes.DWORD,
+            ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int,
+            wintypes.HWND, wintypes.HMENU, wintypes.HINSTANCE, wintypes.LPVOID,
+        ]
+        user32.CreateWindowExW.restype = wintypes.HWND
+        user32.DestroyWindow.argtypes = [wintypes.HWND]
+        user32.DestroyWindow.restype = wintypes.BOOL
+        kernel32.GetModuleHandleW.argtypes = [wintypes.LPCWSTR]
+        kernel32.GetModuleHandleW.restype = wintypes.HMODULE
+
+        def wnd_proc(hwnd, message, wparam, lparam):
+            try:
+                if is_display_change(message, wparam):
+                    self.notifications += 1
+                    self.on_change()
+            except Exception:
+                pass
+            return user32.DefWindowProcW(hwnd, message, wparam, lparam)
+
+        # Keep a reference so the callback is not garbage collected
+        self._wndproc = WNDPROC(wnd_proc)
+        self._hinstance = kernel32.GetModuleHandleW(None)
+
+        window_class = WNDCLASSW()
+        window_class.lpfnWndProc = self._wndproc
+        window_class.hInstance = self._hinstance
+        window_class.lpszClassName = WATCHER_CLASS_NAME
+        # Fails harmlessly if a previous watcher left the class registered
+        user32.RegisterClassW(ctypes.byref(window_class))
+
+        hwnd = user32.CreateWindowExW(
+            0, WATCHER_CLASS_NAME, WATCHER_CLASS_NAME, 0,
+            0, 0, 0, 0, None, None, self._hinstance, None,
+        )
+        if not hwnd:
+            user32.UnregisterClassW(WATCHER_CLASS_NAME, self._hinstance)
+            self._wndproc = None
+            return False
+
+        self._user32 = user32
+        self._hwnd = hwnd
+        self._thread_id = kernel32.GetCurrentThreadId()
+        return True
+
+    def stop(self):
+        """Destroy the hidden window (on the thread that created it)."""
+        user32 = self._user32
+        if user32 is None:
+            return
+        try:
+            if self._hwnd:
+                user32.DestroyWindow(self._hwnd)
+            user32.UnregisterClassW(WATCHER_CLASS_NAME, self._hinstance)
+        except Exception:
+            pass
+        self._hwnd = None
+        self._user32 = None
+
+    def wake(self):
+        """Make a pending or the next wait() return immediately (any thread)."""
+        if self._user32 is not None and self._thread_id:
+            try:
+                self._user32.PostThreadMessageW(self._thread_id, WM_NULL, 0, 0)
+            except Exception:
+                pass
+
+    def wait(self, timeout: float) -> int:
+        """
+        Pump the thread's message queue so notifications are delivered.
+
+        Args:
+            timeout: Maximum time to wait in seconds
+
+        Returns:
+            Number of messages dispatched.
+        """
+        return pump_messages(self._user32, timeout)
+
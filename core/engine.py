@@ -0,0 +1,407 @@
+"""
+Enforcement engine module.
+
+This module runs the WindowMonitor on a dedicated worker thread with its own
+scheduling loop, so slow window or process calls never block the UI thread.
+Settings changes are handed over as one immutable EngineSettings object and
+applied between checks; move notifications leave the thread through
+callbacks that the UI marshals onto its own thread.
+"""
+
+import time
+import threading
+import dataclasses
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional
+
+from .display_events import DisplayChangeWatcher
+from .profiling import get_memory_usage
+from .scheduler import AdaptiveScheduler
+from .window_events import WinEventHookSource, HOOKED_EVENT_RANGES, DRAG_EVENT_RANGES
+from .window_monitor import WindowMonitor, WindowMoveStats
+
+
+# Without display change notifications, monitors are re-enumerated this often
+TOPOLOGY_FALLBACK_REFRESH_S = 5.0
+
+# Config keys read by EngineSettings.from_config()
+CONFIG_KEYS = frozenset({
+    "protection_enabled",
+    "protected_monitors",
+    "primary_monitor",
+    "check_interval_ms",
+    "adaptive_interval",
+    "max_check_interval_ms",
+    "engine_mode",
+    "safety_sweep_interval_ms",
+})
+
+
+@dataclass(frozen=True)
+class EngineSettings:
+    """Engine configuration, replaced as a whole when settings change."""
+
+    enabled: bool = True
+    protected_devices: List[str] = field(default_factory=list)
+    primary_device: Optional[str] = None
+    check_interval_ms: int = 500
+    adaptive_interval: bool = False
+    max_check_interval_ms: int = 2000
+    engine_mode: str = "poll"
+    safety_sweep_interval_ms: int = 5000
+
+    @classmethod
+    def from_config(cls, config: dict) -> "EngineSettings":
+        """
+        Build settings from the application config dict.
+
+        Args:
+            config: Parsed config.json contents
+
+        Returns:
+            EngineSettings object
+        """
+        return cls(
+            enabled=config.get("protection_enabled", True),
+            protected_devices=list(
+                config.get("protected_monitors", ["\\\\.\\DISPLAY2", "\\\\.\\DISPLAY3"])
+            ),
+            primary_device=config.get("primary_monitor", None),
+            check_interval_ms=config.get("check_interval_ms", 500),
+            adaptive_interval=config.get("adaptive_interval", False),
+            max_check_interval_ms=config.get("max_check_interval_ms", 2000),
+            engine_mode=config.get("engine_mode", "poll"),
+            safety_sweep_interval_ms=config.get("safety_sweep_interval_ms", 5000),
+        )
+
+
+class EnforcementEngine:
+    """Runs window enforcement on a worker thread."""
+
+    def __init__(
+        self,
+        window_monitor: WindowMonitor,
+        settings: EngineSettings,
+        event_source_factory: Optional[Callable] = None,
+        display_watcher_factory: Optional[Callable] = None,
+    ):
+        """
+        Initialize the engine.
+
+        Args:
+            window_monitor: WindowMonitor to drive (only used from the worker thread)
+            settings: Initial engine settings
+            event_source_factory: Creates the event source, called with the
+                event_ranges to subscribe (defaults to WinEventHookSource).
+                Event mode subscribes to all window events; poll mode only to
+                move/size start and end, to track the window being dragged
+            display_watcher_factory: Creates the display change watcher,
+                called with the change callback (defaults to
+                DisplayChangeWatcher)
+        """
+        self.window_monitor = window_monitor
+        self.scheduler = AdaptiveScheduler()
+        self.event_source_factory = event_source_factory or WinEventHookSource
+        self.display_watcher_factory = display_watcher_factory or DisplayChangeWatcher
+
+        # Called on the worker thread - receivers must marshal to their own thread
+        self.on_window_moved: Optional[Callable] = None
+        self.on_interval_changed: Optional[Callable[[int], None]] = None
+        # Called once with the time.perf_counter() value the first check ended at
+        self.on_first_check: Optional[Callable[[float], None]] = None
+        self.first_check_at: Optional[float] = None
+        self._first_check_event = threading.Event()
+
+        self._settings = settings
+        self._pending_settings: Optional[EngineSettings] = settings
+        self._event_source = None
+        self._event_source_mode: Optional[str] = None
+        self._display_watcher = None
+        self._topology_refreshed = 0.0
+        self._interval_ms = settings.check_interval_ms
+        self._next_tick = 0.0
+
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._wake_event = threading.Event()
+        self._settings_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._stats_snapshot = WindowMoveStats()
+
+    def start(self):
+        """Start the worker thread."""
+        if self._thread is not None:
+            return
+
+        self.window_monitor.on_window_moved = self._on_window_moved
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="EnforcementEngine", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 2.0):
+        """
+        Stop the worker thread.
+
+        Args:
+            timeout: Maximum time to wait for the thread to exit in seconds
+        """
+        if self._thread is None:
+            return
+
+        self._stop_event.set()
+        self._wake()
+        self._thread.join(timeout)
+        self._thread = None
+
+    def wait_for_first_check(self, timeout: float) -> bool:
+        """
+        Block until the first full check has run.
+
+        Lets startup protect the desktop before spending time on the UI.
+
+        Args:
+            timeout: Maximum time to wait in seconds
+
+        Returns:
+            True if the first check has run, False on timeout.
+        """
+        return self._first_check_event.wait(timeout)
+
+    def is_running(self) -> bool:
+        """Check if the worker thread is running."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def update_settings(self, settings: EngineSettings):
+        """
+        Hand new settings to the engine.
+
+        They are applied in one step before the next check; the engine keeps
+        running.
+
+        Args:
+            settings: New engine settings
+        """
+        with self._settings_lock:
+            self._pending_settings = settings
+        self._wake()
+
+    def get_settings(self) -> EngineSettings:
+        """Get the most recently requested settings."""
+        with self._settings_lock:
+            return self._pending_settings or self._settings
+
+    def get_stats(self) -> WindowMoveStats:
+        """
+        Get a copy of the move statistics, safe to read from any thread.
+
+        Returns:
+            WindowMoveStats object
+        """
+        with self._stats_lock:
+            stats = self._stats_snapshot
+            return dataclasses.replace(
+                stats, enforcement_latency=stats.enforcement_latency.copy()
+            )
+
+    def get_report(self) -> dict:
+        """
+        Get move, cache, scheduler and memory statistics for a profile export.
+
+        Returns:
+            Dict of JSON serializable entries, passed as the extra entries
+            of PhaseProfiler.export_json().
+        """
+        stats = self.get_stats()
+        return {
+            "moves": {
+                "total_moves": stats.total_moves,
+                "batches": stats.batches,
+                "batch_fallbacks": stats.batch_fallbacks,
+                "total_batch_ms": round(stats.total_batch_ms, 3),
+            },
+            "enforcement_latency": stats.enforcement_latency.summary(),
+            "process_cache": dataclasses.asdict(
+                self.window_monitor.get_process_cache_stats()
+            ),
+            "scheduler": self.scheduler.get_state(),
+            "check_interval_ms": self.get_interval_ms(),
+            "memory": get_memory_usage(),
+        }
+
+    def get_interval_ms(self) -> int:
+        """Get the current interval between checks in milliseconds."""
+        return self._interval_ms
+
+    def _wake(self):
+        """Interrupt the worker's wait."""
+        self._wake_event.set()
+        source = self._event_source or self._display_watcher
+        if source is not None:
+            source.wake()
+
+    def _on_window_moved(self, hwnd, process_name, title):
+        """Publish stats and forward a move notification (worker thread)."""
+        self._publish_stats()
+        if self.on_window_moved:
+            try:
+                self.on_window_moved(hwnd, process_name, title)
+            except Exception:
+                pass
+
+    def _publish_stats(self):
+        """Copy the monitor's stats for readers on other threads."""
+        stats = self.window_monitor.get_stats()
+        snapshot = dataclasses.replace(
+            stats, enforcement_latency=stats.enforcement_latency.copy()
+        )
+        with self._stats_lock:
+            self._stats_snapshot = snapshot
+
+    def _apply_pending_settings(self):
+        """Apply settings handed over by update_settings() (worker thread)."""
+        with self._settings_lock:
+            settings = self._pending_settings
+            if settings is None:
+                return
+            self._pending_settings = None
+            previous = self._settings
+            self._settings = settings
+
+        monitor = self.window_monitor
+        monitor.set_protected_devices(list(settings.protected_devices))
+        if settings.primary_device:
+            monitor.set_primary_device(settings.primary_device)
+        monitor.set_enabled(settings.enabled)
+
+        self.scheduler.configure(
+            settings.check_interval_ms,
+            settings.max_check_interval_ms,
+            settings.adaptive_interval,
+        )
+
+        if settings.engine_mode != self._event_source_mode:
+            self._stop_event_source()
+            self._start_event_source(settings.engine_mode)
+
+        if settings != previous or self._next_tick == 0.0:
+            # Run the next check right away with the new settings
+            self._next_tick = time.monotonic()
+
+    def _start_event_source(self, engine_mode: str):
+        """Create the event source for an engine mode (worker thread)."""
+        ranges = HOOKED_EVENT_RANGES if engine_mode == "event" else DRAG_EVENT_RANGES
+        source = self.event_source_factory(event_ranges=ranges)
+        # Not retried on failure until the mode changes
+        self._event_source_mode = engine_mode
+
+        # Hooks deliver events to the installing thread, i.e. this one
+        if source.start(self.window_monitor.handle_window_event):
+            self._event_source = source
+            self.window_monitor.set_drag_tracking(True)
+        else:
+            self.window_monitor.set_drag_tracking(False)
+
+    def _stop_event_source(self):
+        """Remove the event source (worker thread)."""
+        if self._event_source is not None:
+            self._event_source.stop()
+            self._event_source = None
+        self._event_source_mode = None
+        self.window_monitor.set_drag_tracking(False)
+
+    def _start_display_watcher(self):
+        """Start watching for display changes (worker thread)."""
+        watcher = self.display_watcher_factory(self._on_display_changed)
+        # Created on this thread, so its messages are pumped by _wait()
+        if watcher.start():
+            self._display_watcher = watcher
+
+    def _stop_display_watcher(self):
+        """Stop watching for display changes (worker thread)."""
+        if self._display_watcher is not None:
+            self._display_watcher.stop()
+            self._display_watcher = None
+
+    def _on_display_changed(self):
+        """Handle a display or device change notification (worker thread)."""
+        self.window_monitor.window_system.invalidate_monitors()
+        # Protect a newly connected output on the very next check
+        self._next_tick = time.monotonic()
+
+    def _is_event_driven(self) -> bool:
+        """Check if window events drive enforcement (event mode with hooks running)."""
+        return self._event_source is not None and self._event_source_mode == "event"
+
+    def _get_base_interval(self) -> int:
+        """Get the interval between checks, slowed to a safety sweep in event mode."""
+        settings = self._settings
+        if self._is_event_driven():
+            return max(settings.check_interval_ms, settings.safety_sweep_interval_ms)
+        return self.scheduler.current_interval_ms
+
+    def _tick(self):
+        """Run one full check (worker thread)."""
+        monitor = self.window_monitor
+
+        if self._display_watcher is None:
+            now = time.monotonic()
+            if now - self._topology_refreshed >= TOPOLOGY_FALLBACK_REFRESH_S:
+                self._topology_refreshed = now
+                monitor.window_system.invalidate_monitors()
+
+        monitor.check_and_enforce()
+
+        if self.first_check_at is None:
+            self.first_check_at = time.perf_counter()
+            self._first_check_event.set()
+            if self.on_first_check:
+                try:
+                    self.on_first_check(self.first_check_at)
+                except Exception:
+                    pass
+
+        if not self._is_event_driven() and self.scheduler.enabled:
+            self.scheduler.record_tick(monitor.last_tick_activity)
+
+        interval = self._get_base_interval()
+        if interval != self._interval_ms:
+            self._interval_ms = interval
+            if self.on_interval_changed:
+                try:
+                    self.on_interval_changed(interval)
+                except Exception:
+                    pass
+
+        self._next_tick = time.monotonic() + interval / 1000.0
+
+    def _wait(self, timeout: float):
+        """Wait for the next check, an event or a wake-up (worker thread)."""
+        source = self._event_source or self._display_watcher
+        if source is not None:
+            # Pumping messages delivers hook callbacks and display
+            # notifications on this thread
+            source.wait(timeout)
+        else:
+            self._wake_event.wait(timeout)
+        self._wake_event.clear()
+
+    def _run(self):
+        """Worker thread main loop."""
+        self._start_display_watcher()
+        try:
+            while not self._stop_event.is_set():
+                self._apply_pending_settings()
+
+                if time.monotonic() >= self._next_tick:
+                    try:
+                        self._tick()
+                    except Exception:
+                        self._next_tick = time.monotonic() + self._interval_ms / 1000.0
+                    self._publish_stats()
+
+                self._wait(max(0.0, self._next_tick - time.monotonic()))
+        finally:
+            self._stop_event_source()
+            self._stop_display_watcher()
@@ -0,0 +1,147 @@
+"""
+Expiring set module.
+
+This module provides a bounded set whose entries expire a fixed time after
+they were added. Entries are kept in a deque ordered by deadline, so adding,
+looking up and expiring entries are amortised O(1) no matter how long the
+application runs.
+"""
+
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Hashable, Iterator, Optional, Tuple
+
+
+class ExpiringSet:
+    """Set of keys that expire ttl seconds after they were last added."""
+
+    def __init__(
+        self,
+        ttl: float,
+        max_entries: int = 1024,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the set.
+
+        Args:
+            ttl: Seconds an entry stays in the set after it was added
+            max_entries: Hard size bound; the entries closest to expiry are
+                evicted first when it is exceeded
+            clock: Monotonic time source in seconds
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.clock = clock
+        self.evictions = 0
+
+        self._deadlines: Dict[Hashable, float] = {}
+        # (deadline, key) in ascending deadline order; re-added keys leave a
+        # stale entry behind that is skipped when it reaches the front
+        self._queue: Deque[Tuple[float, Hashable]] = deque()
+
+    def add(self, key: Hashable):
+        """
+        Add a key or restart its expiry time.
+
+        Args:
+            key: Key to add
+        """
+        deadline = self.clock() + self.ttl
+        if self._deadlines.get(key) == deadline:
+            return
+        self._deadlines[key] = deadline
+        self._queue.append((deadline, key))
+
+        while len(self._deadlines) > self.max_entries:
+            self._pop_front()
+            self.evictions += 1
+
+        # Keep stale entries from piling up when the same keys are re-added
+        if len(self._queue) > 2 * len(self._deadlines) + 16:
+            self._compact()
+
+    def discard(self, key: Hashable):
+        """
+        Remove a key if present.
+
+        Args:
+            key: Key to remove
+        """
+        self._deadlines.pop(key, None)
+
+    def __contains__(self, key: Hashable) -> bool:
+        deadline = self._deadlines.get(key)
+        return deadline is not None and deadline > self.clock()
+
+    def __len__(self) -> int:
+        return len(self._deadlines)
+
+    def __bool__(self) -> bool:
+        return bool(self._deadlines)
+
+    def __iter__(self) -> Iterator[Hashable]:
+        now = self.clock()
+        return iter([key for key, deadline in self._deadlines.items() if deadline > now])
+
+    def expire(self, now: Optional[float] = None) -> int:
+        """
+        Drop entries whose time is up.
+
+        Args:
+            now: Current clock value (read from the clock if None)
+
+        Returns:
+            Number of entries dropped.
+        """
+        if now is None:
+            now = self.clock()
+
+        dropped = 0
+        queue = self._queue
+        deadlines = self._deadlines
+        while queue and queue[0][0] <= now:
+            deadline, key = queue.popleft()
+            if deadlines.get(key) == deadline:
+                del deadlines[key]
+                dropped += 1
+        return dropped
+
+    def retain(self, predicate: Callable[[Hashable], bool]) -> int:
+        """
+        Drop entries for which a predicate is false (e.g., destroyed windows).
+
+        Args:
+            predicate: Called with each key, True to keep it
+
+        Returns:
+            Number of entries dropped.
+        """
+        gone = [key for key in self._deadlines if not predicate(key)]
+        for key in gone:
+            del self._deadlines[key]
+        if gone:
+            self._compact()
+        return len(gone)
+
+    def clear(self):
+        """Drop all entries."""
+        self._deadlines.clear()
+        self._queue.clear()
+
+    def _pop_front(self):
+        """Remove the live entry closest to expiry."""
+        queue = self._queue
+        deadlines = self._deadlines
+        while queue:
+            deadline, key = queue.popleft()
+            if deadlines.get(key) == deadline:
+                del deadlines[key]
+                return
+
+    def _compact(self):
+        """Drop stale queue entries left behind by re-added or removed keys."""
+        deadlines = self._deadlines
+        self._queue = deque(
+            (deadline, key) for deadline, key in self._queue if deadlines.get(key) == deadline
+        )
@@ -0,0 +1,120 @@
+"""
+Metrics module.
+
+This module provides a fixed-bucket latency histogram used to report how long
+a violating window stays on a protected monitor before it is moved.
+"""
+
+import bisect
+from typing import List, Optional, Sequence
+
+
+# Upper bounds of the histogram buckets in milliseconds
+LATENCY_BUCKETS_MS = (
+    1, 2, 5, 10, 20, 50, 100, 200, 300, 500, 750, 1000, 1500, 2000, 3000, 5000, 10000,
+)
+
+
+class LatencyHistogram:
+    """Fixed-bucket histogram of latencies in milliseconds."""
+
+    def __init__(self, bounds: Sequence[float] = LATENCY_BUCKETS_MS):
+        """
+        Initialize the histogram.
+
+        Args:
+            bounds: Ascending bucket upper bounds in milliseconds; larger values
+                go to an overflow bucket
+        """
+        self.bounds = tuple(bounds)
+        self.counts: List[int] = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, latency_ms: float):
+        """
+        Add a sample.
+
+        Args:
+            latency_ms: Latency in milliseconds
+        """
+        self.counts[bisect.bisect_left(self.bounds, latency_ms)] += 1
+        self.count += 1
+        self.total_ms += latency_ms
+        if latency_ms > self.max_ms:
+            self.max_ms = latency_ms
+
+    def percentile(self, percent: float) -> Optional[float]:
+        """
+        Get the upper bound of the bucket holding a percentile.
+
+        Args:
+            percent: Percentile between 0 and 100
+
+        Returns:
+            Latency in milliseconds (capped at the observed maximum), or None
+            if there are no samples.
+        """
+        if not self.count:
+            return None
+
+        rank = max(1, int(round(self.count * percent / 100.0)))
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                if index < len(self.bounds):
+                    return min(float(self.bounds[index]), self.max_ms)
+                return self.max_ms
+        return self.max_ms
+
+    @property
+    def mean_ms(self) -> float:
+        return self.total_ms / self.count if self.count else 0.0
+
+    def summary(self) -> dict:
+        """
+        Get the headline numbers.
+
+        Returns:
+            Dict with count, mean, p50, p95, p99 and max in milliseconds.
+        """
+        return {
+            "count": self.count,
+            "mean_ms": round(self.mean_ms, 3),
+            "p50_ms": self._rounded_percentile(50),
+            "p95_ms": self._rounded_percentile(95),
+            "p99_ms": self._rounded_percentile(99),
+            "max_ms": round(self.max_ms, 3),
+        }
+
+    def _rounded_percentile(self, percent: float) -> Optional[float]:
+        """Get a percentile rounded like the other summary values."""
+        value = self.percentile(percent)
+        return round(value, 3) if value is not None else None
+
+    def buckets(self) -> List[tuple]:
+        """
+        Get the raw bucket counts.
+
+        Returns:
+            List of (upper_bound_ms, count); the overflow bucket has bound None.
+        """
+        return list(zip(list(self.bounds) + [None], self.counts))
+
+    def copy(self) -> "LatencyHistogram":
+        """Get an independent copy of the histogram."""
+        other = LatencyHistogram(self.bounds)
+        other.counts = list(self.counts)
+        other.count = self.count
+        other.total_ms = self.total_ms
+        other.max_ms = self.max_ms
+        return other
+
+    def reset(self):
+        """Drop all samples."""
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
@@ -7,18 +7,19 @@ Provides device names (e.g., \\\\\\\\.\\\\DISPLAY1) for reliable monitor identif
 """
 
 import ctypes
+import threading
 from ctypes import (
     Structure,
     c_wchar,
     byref,
     POINTER,
-    windll,
     sizeof,
     create_unicode_buffer,
 )
 from ctypes.wintypes import (
     DWORD,
     BOOL,
+    HWND,
     HMONITOR,
     RECT,
     UINT,
@@ -27,27 +28,43 @@ from ctypes.wintypes import (
     HDC,
     WORD,
 )
-from typing import List, Tuple, Optional, Dict
+from typing import List, Tuple, Optional, Dict, FrozenSet
 from dataclasses import dataclass
 
+try:
+    from ctypes import windll
+except ImportError:
+    # Not on Windows - only MonitorInfo and the pure helpers are usable
+    windll = None
 
-user32 = windll.user32
+
+
+class _LazyUser32:
+    """Stands in for user32 until its first use, which binds the prototypes."""
+
+    def __getattr__(self, name):
+        return getattr(_bind_user32(), name)
+
+
+user32 = _LazyUser32() if windll is not None else None
 
 
 QDC_ONLY_ACTIVE_PATHS = 0x00000002
 QDC_DATABASE_CURRENT = 0x00000004
-DISPLAYCONFIG_DEVICE_INFO_GET_SOURCE_NAME = 2
-DISPLAYCONFIG_DEVICE_INFO_GET_TARGET_NAME = 3
+DISPLAYCONFIG_DEVICE_INFO_GET_SOURCE_NAME = 1
+DISPLAYCONFIG_DEVICE_INFO_GET_TARGET_NAME = 2
+ERROR_INSUFFICIENT_BUFFER = 122
 CDS_SET_PRIMARY = 0x00000010
 CDS_UPDATEREGISTRY = 0x00000001
 CDS_NORESET = 0x00000004
 DISPLAY_DEVICE_ATTACHED_TO_DESKTOP = 0x00000001
+MONITOR_DEFAULTTONULL = 0x00000000
 
 
 class LUID(Structure):
     _fields_ = [
         ("LowPart", DWORD),
-        ("HighPart", DWORD),
+        ("HighPart", ctypes.c_long),
     ]
 
 
@@ -94,6 +111,13 @@ class DISPLAYCONFIG_TARGET_DEVICE_NAME(Structure):
     ]
 
 
+class DISPLAYCONFIG_SOURCE_DEVICE_NAME(Structure):
+    _fields_ = [
+        ("header", DISPLAYCONFIG_DEVICE_INFO_HEADER),
+        ("viewGdiDeviceName", ctypes.c_wchar * 32),
+    ]
+
+
 @dataclass
 class MonitorGroup:
     """Group of physically connected monitors that form one logical display."""
@@ -147,14 +171,25 @@ class DISPLAYCONFIG_PATH_SOURCE_INFO(Structure):
     ]
 
 
+class DISPLAYCONFIG_RATIONAL(Structure):
+    _fields_ = [
+        ("Numerator", UINT),
+        ("Denominator", UINT),
+    ]
+
+
 class DISPLAYCONFIG_PATH_TARGET_INFO(Structure):
     _fields_ = [
         ("adapterId", LUID),
         ("id", DWORD),
         ("modeInfoIdx", UINT),
+        ("outputTechnology", DWORD),
+        ("rotation", DWORD),
+        ("scaling", DWORD),
+        ("refreshRate", DISPLAYCONFIG_RATIONAL),
+        ("scanLineOrdering", DWORD),
+        ("targetAvailable", BOOL),
         ("statusFlags", DWORD),
-        ("targetAvailable", DWORD),
-        ("nameChange", DWORD),
     ]
 
 
@@ -197,43 +232,6 @@ class DISPLAYCONFIG_MODE_INFO(Structure):
     ]
 
 
-user32.EnumDisplayDevicesW.argtypes = [
-    LPCWSTR,
-    DWORD,
-    POINTER(DISPLAY_DEVICEW),
-    DWORD,
-]
-user32.EnumDisplayDevicesW.restype = BOOL
-
-user32.GetMonitorInfoW.argtypes = [
-    HMONITOR,
-    POINTER(MONITORINFOEXW),
-]
-user32.GetMonitorInfoW.restype = BOOL
-
-user32.GetDisplayConfigBufferSizes.argtypes = [
-    UINT,
-    POINTER(UINT),
-    POINTER(UINT),
-]
-user32.GetDisplayConfigBufferSizes.restype = DWORD
-
-user32.QueryDisplayConfig.argtypes = [
-    UINT,
-    POINTER(UINT),
-    POINTER(DISPLAYCONFIG_PATH_INFO),
-    POINTER(UINT),
-    POINTER(DISPLAYCONFIG_MODE_INFO),
-    POINTER(UINT),
-]
-user32.QueryDisplayConfig.restype = DWORD
-
-user32.DisplayConfigGetDeviceInfo.argtypes = [
-    POINTER(DISPLAYCONFIG_TARGET_DEVICE_NAME),
-]
-user32.DisplayConfigGetDeviceInfo.restype = DWORD
-
-
 class RECT(ctypes.Structure):
     _fields_ = [
         ("left", ctypes.c_long),
@@ -257,9 +255,9 @@ MONITORENUMPROC = ctypes.CFUNCTYPE(
 )
 
 
-@dataclass
+@dataclass(frozen=True)
 class MonitorInfo:
-    """Information about a monitor."""
+    """Information about a monitor (shared by every reader, so immutable)."""
 
     handle: int
     index: int
@@ -274,9 +272,9 @@ class MonitorInfo:
 
     def __post_init__(self):
         if self.width == 0:
-            self.width = self.right - self.left
+            object.__setattr__(self, "width", self.right - self.left)
         if self.height == 0:
-            self.height = self.bottom - self.top
+            object.__setattr__(self, "height", self.bottom - self.top)
 
     @property
     def left(self) -> int:
@@ -311,189 +309,474 @@ class MonitorInfo:
         return f"Monitor {self.index}"
 
 
-EnumDisplayMonitors = user32.EnumDisplayMonitors
-EnumDisplayMonitors.argtypes = [
-    HDC,
-    ctypes.POINTER(RECT),
-    MONITORENUMPROC,
-    LPARAM,
-]
-EnumDisplayMonitors.restype = BOOL
-
+def _bind_user32():
+    """
+    Declare the prototypes of the user32 functions this module calls.
 
-EnumDisplayDevices = user32.EnumDisplayDevicesW
-EnumDisplayDevices.argtypes = [LPCWSTR, DWORD, POINTER(DISPLAY_DEVICEW), DWORD]
-EnumDisplayDevices.restype = BOOL
+    Runs on first use rather than at import, so importing the module (e.g.
+    for MonitorInfo) stays cheap at startup.
 
+    Returns:
+        The bound user32 library.
+    """
+    global user32
 
-GetMonitorInfo = user32.GetMonitorInfoW
-GetMonitorInfo.argtypes = [HMONITOR, POINTER(MONITORINFOEXW)]
-GetMonitorInfo.restype = BOOL
+    lib = windll.user32
 
+    lib.EnumDisplayMonitors.argtypes = [
+        HDC,
+        ctypes.POINTER(RECT),
+        MONITORENUMPROC,
+        LPARAM,
+    ]
+    lib.EnumDisplayMonitors.restype = BOOL
 
-_monitor_enum_state = {"monitors": []}
+    lib.EnumDisplayDevicesW.argtypes = [
+        LPCWSTR,
+        DWORD,
+        POINTER(DISPLAY_DEVICEW),
+        DWORD,
+    ]
+    lib.EnumDisplayDevicesW.restype = BOOL
 
+    lib.GetMonitorInfoW.argtypes = [
+        HMONITOR,
+        POINTER(MONITORINFOEXW),
+    ]
+    lib.GetMonitorInfoW.restype = BOOL
 
-def _monitor_enum_callback(hmonitor, hdc, rect, lparam):
-    """Callback function for EnumDisplayMonitors."""
-    global _monitor_enum_state
+    lib.GetDisplayConfigBufferSizes.argtypes = [
+        UINT,
+        POINTER(UINT),
+        POINTER(UINT),
+    ]
+    lib.GetDisplayConfigBufferSizes.restype = DWORD
+
+    lib.QueryDisplayConfig.argtypes = [
+        UINT,
+        POINTER(UINT),
+        POINTER(DISPLAYCONFIG_PATH_INFO),
+        POINTER(UINT),
+        POINTER(DISPLAYCONFIG_MODE_INFO),
+        POINTER(UINT),
+    ]
+    lib.QueryDisplayConfig.restype = DWORD
 
-    try:
-        monitor_info = MONITORINFOEXW()
-        monitor_info.cbSize = DWORD(sizeof(MONITORINFOEXW))
-
-        if user32.GetMonitorInfoW(hmonitor, byref(monitor_info)):
-            is_primary = bool(monitor_info.dwFlags & 0x00000001)
-
-            device_name = monitor_info.szDevice if monitor_info.szDevice else ""
-
-            monitor = MonitorInfo(
-                handle=hmonitor,
-                index=len(_monitor_enum_state["monitors"]),
-                is_primary=is_primary,
-                rc_monitor=(
-                    monitor_info.rcMonitor.left,
-                    monitor_info.rcMonitor.top,
-                    monitor_info.rcMonitor.right,
-                    monitor_info.rcMonitor.bottom,
-                ),
-                rc_work=(
-                    monitor_info.rcWork.left,
-                    monitor_info.rcWork.top,
-                    monitor_info.rcWork.right,
-                    monitor_info.rcWork.bottom,
-                ),
-                device_name=device_name,
-                width=monitor_info.rcMonitor.right - monitor_info.rcMonitor.left,
-                height=monitor_info.rcMonitor.bottom - monitor_info.rcMonitor.top,
-            )
+    # Called with the header of a DISPLAYCONFIG_*_DEVICE_NAME request
+    lib.DisplayConfigGetDeviceInfo.argtypes = [
+        POINTER(DISPLAYCONFIG_DEVICE_INFO_HEADER),
+    ]
+    lib.DisplayConfigGetDeviceInfo.restype = DWORD
 
-            _monitor_enum_state["monitors"].append(monitor)
-    except Exception as e:
-        pass
+    lib.MonitorFromWindow.argtypes = [HWND, DWORD]
+    lib.MonitorFromWindow.restype = HMONITOR
 
-    return True
+    # Later calls go straight to the library
+    user32 = lib
+    return lib
 
 
-_monitor_cache = {"monitors": None, "timestamp": 0}
-CACHE_DURATION = 5.0
+def _enumerate_monitors(display_config: "DisplayConfigSnapshot") -> List[MonitorInfo]:
+    """
+    Enumerate monitors via EnumDisplayMonitors and EnumDisplayDevicesW.
 
+    All state lives in locals, so several threads may enumerate at once.
 
-def get_monitors() -> List[MonitorInfo]:
-    """
-    Get all monitors connected to the system.
+    Args:
+        display_config: Display paths used to resolve friendly names
 
     Returns:
-        List of MonitorInfo objects for all monitors.
+        List of MonitorInfo objects.
     """
-    global _monitor_cache, _monitor_enum_state
-    import time
-
-    current_time = time.time()
-
-    if _monitor_cache["monitors"] is not None and (
-        current_time - _monitor_cache["timestamp"] < CACHE_DURATION
-    ):
-        return _monitor_cache["monitors"]
-
-    _monitor_enum_state = {"monitors": []}
+    monitors: List[MonitorInfo] = []
+
+    def callback(hmonitor, hdc, rect, lparam):
+        try:
+            monitor_info = MONITORINFOEXW()
+            monitor_info.cbSize = DWORD(sizeof(MONITORINFOEXW))
+
+            if user32.GetMonitorInfoW(hmonitor, byref(monitor_info)):
+                is_primary = bool(monitor_info.dwFlags & 0x00000001)
+
+                device_name = monitor_info.szDevice if monitor_info.szDevice else ""
+
+                monitors.append(MonitorInfo(
+                    handle=hmonitor,
+                    index=len(monitors),
+                    is_primary=is_primary,
+                    rc_monitor=(
+                        monitor_info.rcMonitor.left,
+                        monitor_info.rcMonitor.top,
+                        monitor_info.rcMonitor.right,
+                        monitor_info.rcMonitor.bottom,
+                    ),
+                    rc_work=(
+                        monitor_info.rcWork.left,
+                        monitor_info.rcWork.top,
+                        monitor_info.rcWork.right,
+                        monitor_info.rcWork.bottom,
+                    ),
+                    device_name=device_name,
+                    friendly_name=display_config.get_friendly_name(device_name) or "",
+                    width=monitor_info.rcMonitor.right - monitor_info.rcMonitor.left,
+                    height=monitor_info.rcMonitor.bottom - monitor_info.rcMonitor.top,
+                ))
+        except Exception as e:
+            pass
+
+        return True
 
     # First, enumerate monitors via EnumDisplayMonitors
     try:
-        user32.EnumDisplayMonitors(
-            None, None, MONITORENUMPROC(_monitor_enum_callback), 0
-        )
+        user32.EnumDisplayMonitors(None, None, MONITORENUMPROC(callback), 0)
     except Exception as e:
         pass
 
-    monitors = _monitor_enum_state["monitors"]
     device_names_from_enum = {m.device_name for m in monitors if m.device_name}
 
     # Then, enumerate all display devices to catch cloned/duplicate displays
     try:
         display_devices = get_all_display_devices()
+        # For cloned displays, copy coordinates from the primary (or last) monitor
+        ref_monitor = next((m for m in monitors if m.is_primary), None)
+        if ref_monitor is None and monitors:
+            ref_monitor = monitors[-1]
+
         for device_name, device in display_devices.items():
-            # device_name is now the proper DeviceName from DISPLAY_DEVICEW
+            # device_name is the DeviceName from DISPLAY_DEVICEW
             # e.g., "\\.\DISPLAY1" or "\\.\DISPLAY1\Monitor0"
 
             # Add any display devices that weren't found by EnumDisplayMonitors
-            if device_name not in device_names_from_enum:
-                # For cloned displays, find a monitor to copy coordinates from
-                primary_monitor = None
-                reference_monitor = None
-                for m in monitors:
-                    if m.is_primary:
-                        primary_monitor = m
-                    reference_monitor = m
-                    if primary_monitor:
-                        break
-
-                ref_monitor = primary_monitor or reference_monitor
-
-                if ref_monitor:
-                    monitor = MonitorInfo(
-                        handle=ref_monitor.handle,  # Same handle for cloned displays
-                        index=len(monitors),
-                        is_primary=False,  # Cloned displays aren't primary (by default)
-                        rc_monitor=ref_monitor.rc_monitor,
-                        rc_work=ref_monitor.rc_work,
-                        device_name=device_name,  # Use the actual device name directly
-                        width=ref_monitor.width,
-                        height=ref_monitor.height,
-                    )
-                    monitors.append(monitor)
+            if device_name not in device_names_from_enum and ref_monitor:
+                monitors.append(MonitorInfo(
+                    handle=ref_monitor.handle,  # Same handle for cloned displays
+                    index=len(monitors),
+                    is_primary=False,  # Cloned displays aren't primary (by default)
+                    rc_monitor=ref_monitor.rc_monitor,
+                    rc_work=ref_monitor.rc_work,
+                    device_name=device_name,  # Use the actual device name directly
+                    friendly_name=display_config.get_friendly_name(device_name) or "",
+                    width=ref_monitor.width,
+                    height=ref_monitor.height,
+                ))
     except Exception as e:
         pass
 
-    _monitor_cache["monitors"] = monitors
-    _monitor_cache["timestamp"] = current_time
-
     return monitors
 
 
-def get_friendly_name_for_device(device_name: str) -> Optional[str]:
-    """Get monitor friendly name via DisplayConfigGetDeviceInfo."""
+class MonitorTopology:
+    """
+    Immutable snapshot of the monitors, their clones and the primary.
+
+    A new snapshot is built when the displays change and published by
+    replacing a single module-level reference, so readers on any thread get a
+    consistent view without locking. The generation only changes when the
+    monitors did; caches keyed on it are invalidated by comparing one int.
+    """
+
+    __slots__ = (
+        "generation",
+        "monitors",
+        "primary",
+        "display_config",
+        "devices_by_handle",
+        "monitors_by_device",
+        "key",
+    )
+
+    def __init__(
+        self,
+        generation: int,
+        monitors: List[MonitorInfo],
+        display_config: "DisplayConfigSnapshot",
+    ):
+        """
+        Build a snapshot.
+
+        Args:
+            generation: Generation number of this snapshot
+            monitors: Enumerated monitors
+            display_config: Display paths read with the monitors
+        """
+        devices_by_handle: Dict[int, set] = {}
+        for m in monitors:
+            if m.device_name:
+                devices_by_handle.setdefault(m.handle, set()).add(m.device_name)
+
+        init = object.__setattr__
+        init(self, "generation", generation)
+        init(self, "monitors", tuple(monitors))
+        init(self, "primary", next((m for m in monitors if m.is_primary), None))
+        init(self, "display_config", display_config)
+        init(self, "devices_by_handle", {
+            handle: frozenset(names) for handle, names in devices_by_handle.items()
+        })
+        init(self, "monitors_by_device", {
+            m.device_name: m for m in reversed(monitors) if m.device_name
+        })
+        init(self, "key", tuple(
+            (m.handle, m.device_name, m.rc_monitor, m.rc_work, m.is_primary, m.friendly_name)
+            for m in monitors
+        ))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("MonitorTopology is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("MonitorTopology is immutable")
+
+    def with_generation(self, generation: int) -> "MonitorTopology":
+        """Get a copy of this snapshot with another generation number."""
+        return MonitorTopology(generation, list(self.monitors), self.display_config)
+
+    def get_device_names_for_handle(self, handle: Optional[int]) -> FrozenSet[str]:
+        """Get the device names shown by a monitor handle."""
+        return self.devices_by_handle.get(handle, frozenset())
+
+    def get_monitor_by_device_name(self, device_name: str) -> Optional[MonitorInfo]:
+        """Find monitor by device name."""
+        return self.monitors_by_device.get(device_name)
+
+
+# Current topology; replaced as a whole, never modified
+_topology: Optional[MonitorTopology] = None
+# Set by invalidate_monitors(); the next reader rebuilds the topology
+_topology_dirty = True
+_topology_rebuilds = 0
+# Only serializes rebuilds - readers never take it
+_rebuild_lock = threading.Lock()
+
+
+def invalidate_monitors():
+    """
+    Mark the enumerated monitors as stale.
+
+    Called on display and device change notifications. Only a flag is set, so
+    a burst of notifications (e.g. while a projector is plugged in) leads to
+    a single enumeration on the next get_monitors() call.
+    """
+    global _topology_dirty
+    _topology_dirty = True
+
+
+def get_monitor_rebuild_count() -> int:
+    """
+    Get how often the monitors were enumerated since startup.
+
+    Returns:
+        Number of enumerations.
+    """
+    return _topology_rebuilds
+
+
+def get_topology() -> MonitorTopology:
+    """
+    Get the current monitor topology, enumerating only if it is stale.
+
+    Safe to call from any thread.
+
+    Returns:
+        MonitorTopology snapshot
+    """
+    topology = _topology
+    if topology is not None and not _topology_dirty:
+        return topology
+    return _rebuild_topology()
+
+
+def _rebuild_topology() -> MonitorTopology:
+    """Enumerate the monitors and publish a new snapshot if they changed."""
+    global _topology, _topology_dirty, _topology_rebuilds
+
+    with _rebuild_lock:
+        # Another thread may have rebuilt while we waited
+        if _topology is not None and not _topology_dirty:
+            return _topology
+
+        # Cleared first, so a notification arriving during enumeration is not lost
+        _topology_dirty = False
+
+        # One display config query per rebuild resolves friendly names and clones
+        display_config = query_display_config()
+        monitors = _enumerate_monitors(display_config)
+        _topology_rebuilds += 1
+
+        previous = _topology
+        generation = previous.generation if previous is not None else 0
+        topology = MonitorTopology(generation + 1, monitors, display_config)
+        if previous is not None and topology.key == previous.key:
+            # Nothing a reader relies on changed: keep the generation
+            topology = topology.with_generation(generation)
+
+        _topology = topology
+        return topology
+
+
+def get_monitors() -> List[MonitorInfo]:
+    """
+    Get all monitors connected to the system.
+
+    The result is cached until invalidate_monitors() is called.
+
+    Returns:
+        List of MonitorInfo objects for all monitors.
+    """
+    return list(get_topology().monitors)
+
+
+@dataclass(frozen=True)
+class DisplayPath:
+    """One active source -> target path reported by QueryDisplayConfig."""
+
+    # (adapter LUID low, adapter LUID high, source id); equal for cloned targets
+    source_key: Tuple[int, int, int]
+    target_id: int
+    device_name: str
+    friendly_name: str
+
+
+class DisplayConfigSnapshot:
+    """Display paths, friendly names and clone groups from one query."""
+
+    def __init__(self, paths: List[DisplayPath]):
+        """
+        Index the paths of one QueryDisplayConfig call.
+
+        Args:
+            paths: Active display paths
+        """
+        self.paths = paths
+        # Targets showing the same source are clones of each other
+        self.clone_groups: Dict[Tuple[int, int, int], List[DisplayPath]] = {}
+        self.paths_by_device: Dict[str, List[DisplayPath]] = {}
+        for path in paths:
+            self.clone_groups.setdefault(path.source_key, []).append(path)
+            if path.device_name:
+                self.paths_by_device.setdefault(path.device_name, []).append(path)
+
+    def get_friendly_name(self, device_name: str) -> Optional[str]:
+        """Get the friendly name of the first monitor showing a device."""
+        for path in self.paths_by_device.get(device_name, ()):
+            if path.friendly_name:
+                return path.friendly_name
+        return None
+
+    def get_clone_info(self, device_name: str) -> Tuple[bool, Optional[str]]:
+        """
+        Check if a device is shown on more than one monitor.
+
+        Args:
+            device_name: Device name (e.g., "\\\\.\\DISPLAY2")
+
+        Returns:
+            Tuple of (is_clone, friendly name of the first monitor showing
+            the device).
+        """
+        paths = self.paths_by_device.get(device_name)
+        if not paths or len(self.clone_groups[paths[0].source_key]) < 2:
+            return False, None
+        return True, self.clone_groups[paths[0].source_key][0].friendly_name or None
+
+
+def _get_device_info(request: Structure, info_type: int, adapter_id: LUID, item_id: int) -> bool:
+    """Fill a DISPLAYCONFIG_*_DEVICE_NAME request via DisplayConfigGetDeviceInfo."""
+    request.header.type = info_type
+    request.header.size = sizeof(request)
+    request.header.adapterId = adapter_id
+    request.header.id = item_id
+    return user32.DisplayConfigGetDeviceInfo(byref(request.header)) == 0
+
+
+def query_display_config() -> DisplayConfigSnapshot:
+    """
+    Read all active display paths with a single QueryDisplayConfig call.
+
+    Source device names and monitor friendly names are resolved once per
+    source and target.
+
+    Returns:
+        DisplayConfigSnapshot (empty if the query failed).
+    """
+    if user32 is None:
+        return DisplayConfigSnapshot([])
+
     try:
         path_count = UINT()
         mode_count = UINT()
+        for _ in range(3):
+            result = user32.GetDisplayConfigBufferSizes(
+                UINT(QDC_ONLY_ACTIVE_PATHS), byref(path_count), byref(mode_count)
+            )
+            if result != 0 or path_count.value == 0:
+                return DisplayConfigSnapshot([])
+
+            path_array = (DISPLAYCONFIG_PATH_INFO * path_count.value)()
+            mode_array = (DISPLAYCONFIG_MODE_INFO * max(1, mode_count.value))()
+
+            # The topology id must be NULL with QDC_ONLY_ACTIVE_PATHS
+            result = user32.QueryDisplayConfig(
+                UINT(QDC_ONLY_ACTIVE_PATHS),
+                byref(path_count),
+                path_array,
+                byref(mode_count),
+                mode_array,
+                None,
+            )
+            # Paths were added between the two calls: ask for the sizes again
+            if result != ERROR_INSUFFICIENT_BUFFER:
+                break
 
-        result = user32.GetDisplayConfigBufferSizes(
-            UINT(QDC_ONLY_ACTIVE_PATHS),
-            ctypes.byref(path_count),
-            ctypes.byref(mode_count),
-        )
-        if result != 0:
-            return None
-
-        path_array = (DISPLAYCONFIG_PATH_INFO * path_count.value)()
-        mode_array = (DISPLAYCONFIG_MODE_INFO * mode_count.value)()
-
-        result = user32.QueryDisplayConfig(
-            UINT(QDC_ONLY_ACTIVE_PATHS),
-            ctypes.byref(path_count),
-            path_array,
-            ctypes.byref(mode_count),
-            mode_array,
-            None,
-        )
         if result != 0:
-            return None
+            return DisplayConfigSnapshot([])
 
+        source_names: Dict[Tuple[int, int, int], str] = {}
+        paths = []
         for i in range(path_count.value):
             path = path_array[i]
+            source = path.sourceInfo
+            target = path.targetInfo
+            source_key = (source.adapterId.LowPart, source.adapterId.HighPart, source.id)
+
+            device_name = source_names.get(source_key)
+            if device_name is None:
+                source_name = DISPLAYCONFIG_SOURCE_DEVICE_NAME()
+                device_name = ""
+                if _get_device_info(
+                    source_name, DISPLAYCONFIG_DEVICE_INFO_GET_SOURCE_NAME,
+                    source.adapterId, source.id,
+                ):
+                    device_name = source_name.viewGdiDeviceName
+                source_names[source_key] = device_name
+
             target_name = DISPLAYCONFIG_TARGET_DEVICE_NAME()
-            target_name.header.type = DWORD(DISPLAYCONFIG_DEVICE_INFO_GET_TARGET_NAME)
-            target_name.header.size = DWORD(sizeof(DISPLAYCONFIG_TARGET_DEVICE_NAME))
-            target_name.header.adapterId = path.targetInfo.adapterId.LowPart
-            target_name.header.id = path.targetInfo.id
+            friendly_name = ""
+            if _get_device_info(
+                target_name, DISPLAYCONFIG_DEVICE_INFO_GET_TARGET_NAME,
+                target.adapterId, target.id,
+            ):
+                friendly_name = target_name.monitorFriendlyDeviceName
 
-            result = user32.DisplayConfigGetDeviceInfo(ctypes.byref(target_name))
-            if result == 0 and target_name.monitorFriendlyDeviceName:
-                return target_name.monitorFriendlyDeviceName
+            paths.append(DisplayPath(source_key, target.id, device_name, friendly_name))
 
-        return None
+        return DisplayConfigSnapshot(paths)
     except Exception as e:
-        return None
+        return DisplayConfigSnapshot([])
+
+
+def get_display_config() -> DisplayConfigSnapshot:
+    """
+    Get the display paths read with the current monitor list.
+
+    Returns:
+        DisplayConfigSnapshot, refreshed together with get_monitors().
+    """
+    return get_topology().display_config
+
+
+def get_friendly_name_for_device(device_name: str) -> Optional[str]:
+    """Get monitor friendly name via DisplayConfigGetDeviceInfo."""
+    return get_display_config().get_friendly_name(device_name)
 
 
 def get_all_display_devices() -> Dict[str, DISPLAY_DEVICEW]:
@@ -533,11 +816,50 @@ def get_device_name_for_hmonitor(hmonitor: int) -> Optional[str]:
 
 def get_monitor_by_device_name(device_name: str) -> Optional[MonitorInfo]:
     """Find monitor by device name."""
-    monitors = get_monitors()
-    for monitor in monitors:
-        if monitor.device_name == device_name:
-            return monitor
-    return None
+    return get_topology().get_monitor_by_device_name(device_name)
+
+
+def get_topology_generation() -> int:
+    """
+    Get a counter that changes whenever the monitor topology changes.
+
+    Returns:
+        Topology generation number.
+    """
+    return get_topology().generation
+
+
+def get_device_names_for_handle(handle: Optional[int]) -> FrozenSet[str]:
+    """
+    Get the device names shown by a monitor handle.
+
+    Cloned displays share a handle, so more than one name may be returned.
+
+    Args:
+        handle: HMONITOR handle
+
+    Returns:
+        Frozen set of device names (empty if the handle is unknown).
+    """
+    return get_topology().get_device_names_for_handle(handle)
+
+
+def get_monitor_handle_for_window(hwnd: int) -> Optional[int]:
+    """
+    Get the monitor a window is on using MonitorFromWindow.
+
+    The monitor with the largest intersection with the window wins.
+
+    Args:
+        hwnd: Window handle
+
+    Returns:
+        HMONITOR handle or None if the window is not on any monitor.
+    """
+    try:
+        return user32.MonitorFromWindow(hwnd, MONITOR_DEFAULTTONULL) or None
+    except Exception:
+        return None
 
 
 def get_monitor_by_handle(handle: int) -> Optional[MonitorInfo]:
@@ -556,11 +878,7 @@ def get_primary_monitor() -> MonitorInfo:
     Returns:
         MonitorInfo object for the primary monitor, or None if not found.
     """
-    monitors = get_monitors()
-    for monitor in monitors:
-        if monitor.is_primary:
-            return monitor
-    return None
+    return get_topology().primary
 
 
 def get_projector_monitors() -> List[MonitorInfo]:
@@ -610,25 +928,17 @@ def is_window_on_monitor(hwnd: int, monitor: MonitorInfo) -> bool:
     """
     Check if a window is primarily on a specific monitor.
 
-    Uses the center point of the window to determine which monitor it's on.
+    Uses MonitorFromWindow to determine which monitor it's on.
 
     Args:
         hwnd: Window handle
         monitor: MonitorInfo object to check against
 
     Returns:
-        True if window center is on the monitor, False otherwise.
+        True if the window is mostly on the monitor, False otherwise.
     """
-    import win32gui
-
-    try:
-        rect = win32gui.GetWindowRect(hwnd)
-        center_x = (rect[0] + rect[2]) // 2
-        center_y = (rect[1] + rect[3]) // 2
-
-        return is_point_in_rect(center_x, center_y, monitor.rc_monitor)
-    except Exception:
-        return False
+    handle = get_monitor_handle_for_window(hwnd)
+    return handle is not None and handle == monitor.handle
 
 
 def is_window_on_projector(hwnd: int) -> bool:
@@ -718,13 +1028,16 @@ def get_monitor_groups() -> List[MonitorGroup]:
         List of MonitorGroup objects grouped by topology
     """
     groups = []
-    monitors = get_monitors()
+    # One snapshot, so monitors, clones and the primary are consistent
+    topology = get_topology()
+    display_config = topology.display_config
+    primary_device_name = topology.primary.device_name if topology.primary else None
 
-    for monitor in monitors:
-        is_p = monitor.device_name == get_primary_device_name()
+    for monitor in topology.monitors:
+        is_p = monitor.device_name == primary_device_name
         display_num = monitor.device_name.split("\\")[-1] if monitor.device_name else f"Monitor{monitor.index + 1}"
 
-        is_clone, clone_source = is_device_clone(monitor.device_name)
+        is_clone, clone_source = display_config.get_clone_info(monitor.device_name)
 
         group = MonitorGroup(
             id=f"monitor_{monitor.index}",
@@ -749,11 +1062,8 @@ def get_primary_device_name() -> Optional[str]:
     Returns:
         Device name (e.g., "\\\\.\\DISPLAY1") or None
     """
-    monitors = get_monitors()
-    for m in monitors:
-        if m.is_primary:
-            return m.device_name
-    return None
+    primary = get_topology().primary
+    return primary.device_name if primary is not None else None
 
 
 def set_primary_monitor(device_name: str) -> bool:
@@ -833,6 +1143,7 @@ def set_primary_monitor(device_name: str) -> bool:
 
         # Apply all changes
         user32.ChangeDisplaySettingsExW(None, None, None, 0, None)
+        invalidate_monitors()
 
         return result == 0  # DISP_CHANGE_SUCCESSFUL
 
@@ -848,55 +1159,6 @@ def is_device_clone(device_name: str) -> Tuple[bool, Optional[str]]:
         device_name: Device name to check (e.g., "\\\\.\\DISPLAY2")
 
     Returns:
-        Tuple of (is_clone, original_device_name) or (True, None)
+        Tuple of (is_clone, friendly name of the original monitor or None)
     """
-    try:
-        flags = QDC_ONLY_ACTIVE_PATHS
-        path_count = UINT()
-        mode_count = UINT()
-
-        result = user32.GetDisplayConfigBufferSizes(
-            UINT(flags), ctypes.byref(path_count), ctypes.byref(mode_count)
-        )
-
-        if result != 0:
-            return False, None
-
-        # Safety check for zero counts
-        if path_count.value == 0 or mode_count.value == 0:
-            return False, None
-
-        path_array = (DISPLAYCONFIG_PATH_INFO * path_count.value)()
-        mode_array = (DISPLAYCONFIG_MODE_INFO * mode_count.value)()
-
-        # Use a proper null pointer for the last parameter
-        topology_id = UINT()
-        result = user32.QueryDisplayConfig(
-            UINT(flags),
-            ctypes.byref(path_count),
-            path_array,
-            ctypes.byref(mode_count),
-            mode_array,
-            ctypes.byref(topology_id),
-        )
-
-        if result != 0:
-            return False, None
-
-        for i in range(path_count.value):
-            path = path_array[i]
-            for j in range(path_count.value):
-                if i != j:
-                    other_path = path_array[j]
-                    if (
-                        path.sourceInfo.adapterId.LowPart
-                        == other_path.sourceInfo.adapterId.LowPart
-                        and path.sourceInfo.id == other_path.sourceInfo.id
-                    ):
-                        # Same source, different targets - this indicates cloning
-                        return True, None
-
-        return False, None
-
-    except Exception:
-        return False, None
+    return get_display_config().get_clone_info(device_name)
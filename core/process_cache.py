@@ -0,0 +1,208 @@
+"""
+Process identity cache module.
+
+This module caches process names by PID so that window enforcement does not
+open a process handle for every window on every check. Entries are keyed by
+(pid, create time) so a reused PID is never reported with the name of the
+process that previously owned it.
+"""
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+
+@dataclass(frozen=True)
+class ProcessIdentity:
+    """Identity of a running process."""
+
+    pid: int
+    create_time: float
+    name: str
+    # Full executable path, only read while resolve_exe is on ("" if denied)
+    exe: Optional[str] = None
+
+
+@dataclass
+class ProcessCacheStats:
+    """Statistics about process cache usage."""
+
+    # Lookups answered without opening the process
+    hits: int = 0
+    misses: int = 0
+    # Lookups that opened the process to check its create time and found
+    # the cached identity still valid
+    revalidations: int = 0
+    pid_reuses: int = 0
+    evictions: int = 0
+    size: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses + self.revalidations
+        return self.hits / total if total else 0.0
+
+
+def _open_psutil_process(pid: int):
+    """Open a process with psutil, imported on first use."""
+    import psutil
+
+    return psutil.Process(pid)
+
+
+class ProcessCache:
+    """Bounded LRU cache of process identities keyed by PID."""
+
+    def __init__(
+        self,
+        max_entries: int = 512,
+        revalidate_interval: float = 2.0,
+        open_process: Optional[Callable] = None,
+    ):
+        """
+        Initialize the process cache.
+
+        Args:
+            max_entries: Maximum number of cached processes
+            revalidate_interval: Seconds an entry is trusted before its create
+                time is checked again (0 checks on every lookup)
+            open_process: Returns an object with create_time() and name() for
+                a PID (defaults to psutil.Process)
+        """
+        self.open_process = open_process or _open_psutil_process
+        self.resolve_exe = False
+        self.max_entries = max_entries
+        self.revalidate_interval = revalidate_interval
+        self.stats = ProcessCacheStats()
+
+        # pid -> (identity, last validation time)
+        self._entries: "OrderedDict[int, tuple[ProcessIdentity, float]]" = OrderedDict()
+
+    def get(self, pid: int, revalidate: bool = False) -> Optional[ProcessIdentity]:
+        """
+        Get the identity of a process.
+
+        Within revalidate_interval a cached entry is returned unchecked, which
+        is only safe for a caller that already saw this process alive (e.g.
+        an existing window of it). Pass revalidate=True on the first lookup
+        for a new window, so a PID that was reused in the meantime is caught.
+
+        Args:
+            pid: Process ID
+            revalidate: Check the create time even if the entry is still trusted
+
+        Returns:
+            ProcessIdentity or None if the process does not exist or is not accessible.
+        """
+        if not pid:
+            return None
+
+        now = time.monotonic()
+        entry = self._entries.get(pid)
+
+        if entry is not None and not revalidate:
+            identity, checked_at = entry
+            if now - checked_at < self.revalidate_interval:
+                self._entries.move_to_end(pid)
+                self.stats.hits += 1
+                return identity
+
+        try:
+            process = self.open_process(pid)
+            create_time = process.create_time()
+
+            if entry is not None:
+                identity = entry[0]
+                if identity.create_time == create_time:
+                    self._entries[pid] = (identity, now)
+                    self._entries.move_to_end(pid)
+                    self.stats.revalidations += 1
+                    return identity
+                # Same PID, different process - the PID was reused
+                self.stats.pid_reuses += 1
+
+            identity = ProcessIdentity(
+                pid, create_time, process.name().upper(), self._read_exe(process)
+            )
+        except Exception:  # psutil.NoSuchProcess, psutil.AccessDenied, ...
+            self._entries.pop(pid, None)
+            self.stats.size = len(self._entries)
+            self.stats.misses += 1
+            return None
+
+        self.stats.misses += 1
+        self._entries[pid] = (identity, now)
+        self._entries.move_to_end(pid)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+        self.stats.size = len(self._entries)
+        return identity
+
+    def _read_exe(self, process) -> Optional[str]:
+        """Read the executable path of a process if paths are resolved."""
+        if not self.resolve_exe:
+            return None
+        try:
+            return process.exe()
+        except Exception:
+            return ""
+
+    def set_resolve_exe(self, enabled: bool):
+        """
+        Choose whether identities include the executable path.
+
+        Reading the path costs an extra query per process, so it is only done
+        while a whitelist rule needs it.
+
+        Args:
+            enabled: True to read executable paths
+        """
+        if enabled and not self.resolve_exe:
+            # Cached identities have no path yet
+            self.clear()
+        self.resolve_exe = enabled
+
+    def get_name(self, pid: int) -> Optional[str]:
+        """
+        Get the process name (uppercase) for a PID.
+
+        Args:
+            pid: Process ID
+
+        Returns:
+            Process name or None if not found.
+        """
+        identity = self.get(pid)
+        return identity.name if identity else None
+
+    def invalidate(self, pid: int):
+        """
+        Drop a cached process.
+
+        Args:
+            pid: Process ID
+        """
+        self._entries.pop(pid, None)
+        self.stats.size = len(self._entries)
+
+    def clear(self):
+        """Drop all cached processes."""
+        self._entries.clear()
+        self.stats.size = 0
+
+    def get_stats(self) -> ProcessCacheStats:
+        """
+        Get cache statistics.
+
+        Returns:
+            ProcessCacheStats object
+        """
+        return self.stats
+
+    def reset_stats(self):
+        """Reset hit/miss counters."""
+        self.stats = ProcessCacheStats(size=len(self._entries))
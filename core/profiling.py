@@ -0,0 +1,248 @@
+"""
+Profiling module.
+
+This module keeps rolling per-phase timings of the enforcement check so that
+high CPU usage can be attributed to a specific part of the loop. Profiling
+is switched on and off at runtime; while off the engine does not touch it.
+It also provides a one-shot breakdown of application startup.
+"""
+
+import json
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+
+PHASE_CLEANUP = "cleanup"
+PHASE_DRAG_DETECTION = "drag_detection"
+PHASE_DEFERRED_FLUSH = "deferred_flush"
+PHASE_ENUMERATION = "enumeration"
+PHASE_VALIDITY = "validity"
+PHASE_PROCESS_LOOKUP = "process_lookup"
+PHASE_WHITELIST = "whitelist"
+PHASE_GEOMETRY = "geometry"
+PHASE_MOVE = "move"
+PHASE_TOTAL = "total"
+
+PHASES = (
+    PHASE_CLEANUP,
+    PHASE_DRAG_DETECTION,
+    PHASE_DEFERRED_FLUSH,
+    PHASE_ENUMERATION,
+    PHASE_VALIDITY,
+    PHASE_PROCESS_LOOKUP,
+    PHASE_WHITELIST,
+    PHASE_GEOMETRY,
+    PHASE_MOVE,
+    PHASE_TOTAL,
+)
+
+
+class PhaseStats:
+    """Aggregated per-tick time of one phase."""
+
+    __slots__ = ("ticks", "total_ms", "max_ms", "recent")
+
+    def __init__(self, window: int):
+        self.ticks = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.recent: Deque[float] = deque(maxlen=window)
+
+    def add(self, ms: float):
+        self.ticks += 1
+        self.total_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+        self.recent.append(ms)
+
+    def to_dict(self) -> dict:
+        recent = list(self.recent)
+        return {
+            "ticks": self.ticks,
+            "total_ms": round(self.total_ms, 3),
+            "mean_ms": round(self.total_ms / self.ticks, 4) if self.ticks else 0.0,
+            "max_ms": round(self.max_ms, 3),
+            "recent_mean_ms": round(sum(recent) / len(recent), 4) if recent else 0.0,
+        }
+
+
+class PhaseProfiler:
+    """Collects per-phase timings for each enforcement check."""
+
+    def __init__(self, window: int = 200):
+        """
+        Initialize the profiler.
+
+        Args:
+            window: Number of recent ticks kept per phase for the rolling mean
+        """
+        self.enabled = False
+        self.window = window
+        self._lock = threading.Lock()
+        self._phases: Dict[str, PhaseStats] = {}
+        self._current: Dict[str, float] = {}
+
+    def set_enabled(self, enabled: bool):
+        """
+        Switch profiling on or off.
+
+        Args:
+            enabled: True to collect timings
+        """
+        self.enabled = enabled
+
+    def begin_tick(self):
+        """Start collecting a new tick."""
+        self._current = {}
+
+    def add(self, phase: str, seconds: float):
+        """
+        Add time to a phase of the current tick.
+
+        Args:
+            phase: Phase name (one of PHASES)
+            seconds: Elapsed time in seconds
+        """
+        current = self._current
+        current[phase] = current.get(phase, 0.0) + seconds
+
+    def elapsed(self, phase: str) -> float:
+        """Get the time collected for a phase in the current tick (seconds)."""
+        return self._current.get(phase, 0.0)
+
+    def end_tick(self):
+        """Fold the current tick into the rolling aggregates."""
+        current = self._current
+        self._current = {}
+        with self._lock:
+            for phase, seconds in current.items():
+                stats = self._phases.get(phase)
+                if stats is None:
+                    stats = self._phases[phase] = PhaseStats(self.window)
+                stats.add(seconds * 1000.0)
+
+    def get_summary(self) -> dict:
+        """
+        Get aggregates for all phases.
+
+        Returns:
+            Dict of phase name -> dict with ticks, total/mean/max and recent mean (ms).
+        """
+        with self._lock:
+            return {
+                phase: self._phases[phase].to_dict()
+                for phase in PHASES
+                if phase in self._phases
+            }
+
+    def reset(self):
+        """Drop all collected timings."""
+        with self._lock:
+            self._phases = {}
+
+    def export_json(self, path: str, extra: Optional[dict] = None):
+        """
+        Write the phase summary to a JSON file.
+
+        Args:
+            path: Output file path
+            extra: Additional top-level entries to include
+        """
+        data = {"enabled": self.enabled, "phases": self.get_summary()}
+        if extra:
+            data.update(extra)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=4)
+
+
+def get_memory_usage() -> dict:
+    """
+    Get the memory footprint of the current process.
+
+    Returns:
+        Dict with the resident set size and, where the platform reports it,
+        its peak (MB), plus whether Qt was loaded. Empty values if psutil is
+        not available.
+    """
+    import sys
+
+    usage = {"rss_mb": None, "peak_rss_mb": None, "qt_loaded": "PySide6" in sys.modules}
+    try:
+        import psutil
+
+        info = psutil.Process().memory_info()
+    except Exception:
+        return usage
+
+    usage["rss_mb"] = round(info.rss / (1024 * 1024), 1)
+    # Peak working set; only reported on Windows
+    peak = getattr(info, "peak_wset", None)
+    if peak is not None:
+        usage["peak_rss_mb"] = round(peak / (1024 * 1024), 1)
+    return usage
+
+
+class StartupProfile:
+    """Wall-clock breakdown of application startup into phases."""
+
+    def __init__(self, enabled: bool = False, start: Optional[float] = None):
+        """
+        Initialize the startup profile.
+
+        Args:
+            enabled: True to record phases
+            start: time.perf_counter() value startup is measured from
+                (defaults to now)
+        """
+        self.enabled = enabled
+        self.start = start if start is not None else time.perf_counter()
+        self._last = self.start
+        # (phase, milliseconds) in the order the phases ended
+        self.phases: List[Tuple[str, float]] = []
+        # (event, milliseconds since start) for things that finish on other threads
+        self.events: List[Tuple[str, float]] = []
+
+    def mark(self, phase: str):
+        """
+        End a phase that started when the previous one ended.
+
+        Args:
+            phase: Phase name
+        """
+        now = time.perf_counter()
+        if self.enabled:
+            self.phases.append((phase, (now - self._last) * 1000.0))
+        self._last = now
+
+    def event(self, name: str, timestamp: Optional[float] = None):
+        """
+        Record when something happened, relative to the start.
+
+        Args:
+            name: Event name
+            timestamp: time.perf_counter() value (defaults to now)
+        """
+        if self.enabled:
+            if timestamp is None:
+                timestamp = time.perf_counter()
+            self.events.append((name, (timestamp - self.start) * 1000.0))
+
+    def format_report(self) -> str:
+        """
+        Format the phases and events as a text table.
+
+        Returns:
+            Report text.
+        """
+        width = max([len(name) for name, _ in self.phases + self.events] + [5])
+        lines = ["Startup profile (ms)"]
+        total = 0.0
+        for name, ms in self.phases:
+            total += ms
+            lines.append(f"  {name:<{width}} {ms:>9.1f}")
+        lines.append(f"  {'total':<{width}} {total:>9.1f}")
+        for name, ms in self.events:
+            lines.append(f"  {name:<{width}} {ms:>9.1f}  (since start)")
+        return "\n".join(lines)
@@ -0,0 +1,124 @@
+"""
+Adaptive check scheduling module.
+
+This module decides how long to wait between enforcement checks. While
+nothing changes the interval backs off toward a maximum; any activity
+(a window moved, a new window, a foreground change or user input) drops it
+straight back to the minimum.
+"""
+
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, List
+
+
+@dataclass
+class SchedulerSample:
+    """One scheduling decision."""
+
+    timestamp: float
+    interval_ms: int
+    activity: bool
+
+
+class AdaptiveScheduler:
+    """Computes the next check interval from recent activity."""
+
+    def __init__(
+        self,
+        min_interval_ms: int = 500,
+        max_interval_ms: int = 2000,
+        backoff_factor: float = 1.5,
+        idle_ticks_before_backoff: int = 2,
+        enabled: bool = True,
+        history_size: int = 120,
+    ):
+        """
+        Initialize the scheduler.
+
+        Args:
+            min_interval_ms: Interval used while there is activity
+            max_interval_ms: Upper bound for the backed-off interval
+            backoff_factor: Multiplier applied per idle tick once backing off
+            idle_ticks_before_backoff: Consecutive idle ticks before backing off
+            enabled: If False, the interval stays at min_interval_ms
+            history_size: Number of scheduling decisions to keep
+        """
+        self.min_interval_ms = min_interval_ms
+        self.max_interval_ms = max(min_interval_ms, max_interval_ms)
+        self.backoff_factor = backoff_factor
+        self.idle_ticks_before_backoff = idle_ticks_before_backoff
+        self.enabled = enabled
+
+        self.current_interval_ms = min_interval_ms
+        self._idle_ticks = 0
+        self._history: Deque[SchedulerSample] = deque(maxlen=history_size)
+
+    def configure(self, min_interval_ms: int, max_interval_ms: int, enabled: bool):
+        """
+        Update the interval bounds.
+
+        Args:
+            min_interval_ms: Interval used while there is activity
+            max_interval_ms: Upper bound for the backed-off interval
+            enabled: If False, the interval stays at min_interval_ms
+        """
+        self.min_interval_ms = min_interval_ms
+        self.max_interval_ms = max(min_interval_ms, max_interval_ms)
+        self.enabled = enabled
+        self.reset()
+
+    def reset(self):
+        """Drop back to the minimum interval."""
+        self._idle_ticks = 0
+        self.current_interval_ms = self.min_interval_ms
+
+    def record_tick(self, activity: bool) -> int:
+        """
+        Record the outcome of a check and compute the next interval.
+
+        Args:
+            activity: True if the check saw any change
+
+        Returns:
+            Next interval in milliseconds.
+        """
+        if activity or not self.enabled:
+            self.reset()
+        else:
+            self._idle_ticks += 1
+            if self._idle_ticks >= self.idle_ticks_before_backoff:
+                self.current_interval_ms = min(
+                    self.max_interval_ms,
+                    int(self.current_interval_ms * self.backoff_factor),
+                )
+
+        self._history.append(
+            SchedulerSample(time.time(), self.current_interval_ms, activity)
+        )
+        return self.current_interval_ms
+
+    def get_history(self) -> List[SchedulerSample]:
+        """
+        Get recent scheduling decisions, oldest first.
+
+        Returns:
+            List of SchedulerSample objects.
+        """
+        return list(self._history)
+
+    def get_state(self) -> dict:
+        """
+        Get the scheduler state for display or export.
+
+        Returns:
+            Dict with the current interval, bounds and idle tick count.
+        """
+        return {
+            "enabled": self.enabled,
+            "current_interval_ms": self.current_interval_ms,
+            "min_interval_ms": self.min_interval_ms,
+            "max_interval_ms": self.max_interval_ms,
+            "idle_ticks": self._idle_ticks,
+        }
@@ -2,27 +2,16 @@
 Whitelist management module.
 
 This module handles loading, saving, and checking the whitelist of allowed applications.
+Entries can be names, globs, regular expressions, folders and window
+class/title qualified rules (see whitelist_rules).
 """
 
-import sys
-import json
-import os
-from typing import List, Set
-from pathlib import Path
+import threading
+from contextlib import contextmanager
+from typing import Iterable, Iterator, List, Optional, Set
 
-
-def get_config_path() -> Path:
-    """Get config file path, using AppData for PyInstaller builds."""
-    if getattr(sys, 'frozen', False):
-        # Running as exe - use AppData directory
-        config_dir = Path(os.environ.get('APPDATA', os.path.expanduser('~')))
-        config_dir = config_dir / "NoMore2ndScreen"
-    else:
-        # Running as Python script - use same directory as script
-        config_dir = Path(__file__).parent.parent
-
-    config_dir.mkdir(parents=True, exist_ok=True)
-    return config_dir / "config.json"
+from .config_store import ConfigStore, get_config_store
+from .whitelist_rules import WhitelistMatcher, normalize_rule
 
 
 # Default whitelist entries
@@ -31,76 +20,163 @@ DEFAULT_WHITELIST = [
     "OBS32.EXE"
 ]
 
+# Config keys read by Whitelist.load()
+CONFIG_KEYS = frozenset({"whitelist", "custom_whitelist"})
+
 
 class Whitelist:
     """Manages the application whitelist."""
 
-    def __init__(self, config_path: str = None):
+    def __init__(self, config_path: str = None, store: Optional[ConfigStore] = None):
         """
         Initialize the whitelist manager.
 
         Args:
-            config_path: Path to the config.json file. If None, uses default location.
+            config_path: Path to the config.json file. If None, uses the
+                global config store.
+            store: Config store to use instead of config_path
         """
-        if config_path is None:
-            self.config_path = get_config_path()
-        else:
-            self.config_path = Path(config_path)
-
+        if store is None:
+            store = get_config_store() if config_path is None else ConfigStore(config_path)
+        self.store = store
+        self.config_path = store.path
+
+        # Guards the entry sets and the generation: they are changed on the
+        # UI thread while the engine thread compiles the matcher
+        self._lock = threading.RLock()
         self._whitelist: Set[str] = set()
         self._custom_whitelist: Set[str] = set()
+        # Incremented on every change, so callers can tell cached decisions are stale
+        self.generation = 0
+        self._matcher: Optional[WhitelistMatcher] = None
+        self._matcher_generation = -1
+        # Changes inside batch() are saved once when the outermost batch ends
+        self._batch_depth = 0
+        self._batch_dirty = False
         self.load()
 
     def load(self):
-        """Load whitelist from config file."""
-        if not self.config_path.exists():
-            # Create default config if it doesn't exist
-            self._whitelist = set(DEFAULT_WHITELIST)
-            self._custom_whitelist = set()
+        """
+        Load whitelist from the config store.
+
+        The generation (and with it every cached decision) only changes if
+        the entries did.
+        """
+        config = self.store.ensure_loaded()
+
+        if 'whitelist' not in config:
+            # First run: write the default entries
+            self._set_entries(set(DEFAULT_WHITELIST), set())
             self.save()
             return
 
         try:
-            with open(self.config_path, 'r', encoding='utf-8') as f:
-                config = json.load(f)
-
-            self._whitelist = set(config.get('whitelist', DEFAULT_WHITELIST))
-            self._custom_whitelist = set(config.get('custom_whitelist', []))
+            whitelist = set(
+                normalize_rule(entry) for entry in config.get('whitelist', DEFAULT_WHITELIST)
+            )
+            custom_whitelist = set(
+                normalize_rule(entry) for entry in config.get('custom_whitelist', [])
+            )
 
             # Ensure default entries are present
             for entry in DEFAULT_WHITELIST:
-                self._whitelist.add(entry)
+                whitelist.add(entry)
 
         except Exception as e:
-            self._whitelist = set(DEFAULT_WHITELIST)
-            self._custom_whitelist = set()
+            whitelist = set(DEFAULT_WHITELIST)
+            custom_whitelist = set()
+
+        self._set_entries(whitelist, custom_whitelist)
+
+    def _set_entries(self, whitelist: Set[str], custom_whitelist: Set[str]):
+        """Replace all entries, bumping the generation if they differ."""
+        with self._lock:
+            if whitelist == self._whitelist and custom_whitelist == self._custom_whitelist:
+                return
+            self._whitelist = whitelist
+            self._custom_whitelist = custom_whitelist
+            self.generation += 1
 
     def save(self):
-        """Save whitelist to config file."""
-        try:
-            # Read existing config to preserve other settings
-            config = {}
-            if self.config_path.exists():
-                with open(self.config_path, 'r', encoding='utf-8') as f:
-                    config = json.load(f)
+        """Store the whitelist in the config store, which writes it shortly after."""
+        with self._lock:
+            values = {
+                'whitelist': sorted(self._whitelist),
+                'custom_whitelist': sorted(self._custom_whitelist),
+            }
+        self.store.update(values)
+
+    def _changed(self):
+        """Record a change and save it, unless a batch is open (call with the lock held)."""
+        self.generation += 1
+        if self._batch_depth:
+            self._batch_dirty = True
+        else:
+            self.save()
 
-            # Update whitelist entries
-            config['whitelist'] = list(self._whitelist)
-            config['custom_whitelist'] = list(self._custom_whitelist)
+    @contextmanager
+    def batch(self) -> Iterator["Whitelist"]:
+        """
+        Group changes so that the config file is written only once.
 
-            # Write back to file
-            with open(self.config_path, 'w', encoding='utf-8') as f:
-                json.dump(config, f, indent=4)
+        Example:
+            with whitelist.batch():
+                whitelist.add("A.EXE")
+                whitelist.remove("B.EXE")
 
-        except Exception as e:
-            pass
+        Yields:
+            This whitelist.
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self._batch_dirty:
+                self._batch_dirty = False
+                self.save()
+
+    def get_matcher(self) -> WhitelistMatcher:
+        """
+        Get the compiled whitelist, recompiled only after a change.
 
-    def is_whitelisted(self, process_name: str) -> bool:
+        Returns:
+            WhitelistMatcher object
+        """
+        with self._lock:
+            matcher = self._matcher
+            if matcher is not None and self._matcher_generation == self.generation:
+                return matcher
+            # Generation and entries are read together, so a change made while
+            # compiling leaves the matcher stale (recompiled next call), never
+            # cached under a newer generation
+            generation = self.generation
+            entries = frozenset(self._whitelist)
+
+        # Compiled outside the lock so the UI thread is not held up
+        matcher = WhitelistMatcher(entries)
+
+        with self._lock:
+            if generation >= self._matcher_generation:
+                self._matcher = matcher
+                self._matcher_generation = generation
+        return matcher
+
+    def is_whitelisted(
+        self,
+        process_name: str,
+        exe: Optional[str] = None,
+        class_name: str = "",
+        title: str = "",
+    ) -> bool:
         """
         Check if a process is whitelisted.
 
         Args:
             process_name: Name of the process (e.g., "POWERPNT.EXE")
+            exe: Full executable path, needed for folder rules
+            class_name: Window class, needed for class= rules
+            title: Window title, needed for title= rules
 
         Returns:
             True if the process is whitelisted, False otherwise.
@@ -111,38 +187,95 @@ class Whitelist:
         # Convert to uppercase for case-insensitive comparison
         process_name_upper = process_name.upper().strip()
 
-        return process_name_upper in self._whitelist
+        return self.get_matcher().matches(process_name_upper, exe, class_name, title)
 
     def add(self, process_name: str, custom: bool = True):
         """
         Add a process to the whitelist.
 
         Args:
-            process_name: Name of the process to add
+            process_name: Name of the process or rule to add
             custom: If True, also add to custom whitelist for UI display
         """
-        process_name_upper = process_name.upper().strip()
-        self._whitelist.add(process_name_upper)
+        process_name_upper = normalize_rule(process_name)
+        with self._lock:
+            self._whitelist.add(process_name_upper)
 
-        if custom:
-            self._custom_whitelist.add(process_name_upper)
+            if custom:
+                self._custom_whitelist.add(process_name_upper)
 
-        self.save()
+            self._changed()
+
+    def add_many(self, process_names: Iterable[str], custom: bool = True) -> int:
+        """
+        Add several processes or rules and save once.
+
+        Args:
+            process_names: Names or rules to add (blank entries are skipped)
+            custom: If True, also add to custom whitelist for UI display
+
+        Returns:
+            Number of entries that were not in the whitelist before.
+        """
+        added = 0
+        with self.batch():
+            for process_name in process_names:
+                if not process_name or not process_name.strip():
+                    continue
+                if normalize_rule(process_name) not in self._whitelist:
+                    added += 1
+                self.add(process_name, custom)
+        return added
 
     def remove(self, process_name: str):
         """
         Remove a process from the whitelist.
 
         Args:
-            process_name: Name of the process to remove
+            process_name: Name of the process or rule to remove
         """
-        process_name_upper = process_name.upper().strip()
+        process_name_upper = normalize_rule(process_name)
 
         # Remove from both sets
-        self._whitelist.discard(process_name_upper)
-        self._custom_whitelist.discard(process_name_upper)
+        with self._lock:
+            self._whitelist.discard(process_name_upper)
+            self._custom_whitelist.discard(process_name_upper)
+
+            self._changed()
+
+    def remove_many(self, process_names: Iterable[str]) -> int:
+        """
+        Remove several processes or rules and save once.
 
-        self.save()
+        Args:
+            process_names: Names or rules to remove
+
+        Returns:
+            Number of entries that were in the whitelist.
+        """
+        removed = 0
+        with self.batch():
+            for process_name in process_names:
+                if normalize_rule(process_name) in self._whitelist:
+                    removed += 1
+                self.remove(process_name)
+        return removed
+
+    def import_file(self, path: str) -> int:
+        """
+        Add the entries of a text file (one per line) as custom entries.
+
+        Blank lines and lines starting with '#' are ignored.
+
+        Args:
+            path: Path to the text file
+
+        Returns:
+            Number of new entries.
+        """
+        with open(path, 'r', encoding='utf-8-sig') as f:
+            lines = [line.strip() for line in f]
+        return self.add_many(line for line in lines if line and not line.startswith('#'))
 
     def get_all(self) -> List[str]:
         """
@@ -151,7 +284,8 @@ class Whitelist:
         Returns:
             List of whitelisted process names.
         """
-        return sorted(list(self._whitelist))
+        with self._lock:
+            return sorted(self._whitelist)
 
     def get_custom(self) -> List[str]:
         """
@@ -160,7 +294,8 @@ class Whitelist:
         Returns:
             List of custom whitelisted process names.
         """
-        return sorted(list(self._custom_whitelist))
+        with self._lock:
+            return sorted(self._custom_whitelist)
 
     def get_default(self) -> List[str]:
         """
@@ -173,10 +308,11 @@ class Whitelist:
 
     def clear_custom(self):
         """Clear all custom whitelist entries."""
-        for entry in self._custom_whitelist:
-            self._whitelist.discard(entry)
-        self._custom_whitelist.clear()
-        self.save()
+        with self._lock:
+            for entry in self._custom_whitelist:
+                self._whitelist.discard(entry)
+            self._custom_whitelist.clear()
+            self._changed()
 
     def is_default(self, process_name: str) -> bool:
         """
@@ -188,7 +324,7 @@ class Whitelist:
         Returns:
             True if the process is a default entry, False otherwise.
         """
-        return process_name.upper().strip() in DEFAULT_WHITELIST
+        return normalize_rule(process_name) in DEFAULT_WHITELIST
 
 
 # Global whitelist instance
@@ -218,4 +354,5 @@ def reload_whitelist():
     global _whitelist_instance
 
     if _whitelist_instance is not None:
+        _whitelist_instance.store.load()
         _whitelist_instance.load()
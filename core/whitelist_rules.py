@@ -0,0 +1,350 @@
+"""
+Whitelist rule matching module.
+
+This module compiles whitelist entries into a matcher. Exact names and
+folders are looked up in a set and a path trie, so their cost does not depend
+on the number of rules. Globs and regular expressions are tried as one
+combined pattern, and qualified glob, regex and folder rules one by one, so
+the first lookup of a name grows linearly with the number of those rules;
+the outcome is cached per name, so repeated lookups stay cheap. Supported
+entries:
+
+- ``NOTEPAD.EXE``: exact executable name
+- ``*VIEWER*.EXE``: glob on the executable name (``*``, ``?`` and ``[...]``)
+- ``re:^TEAMS(_\\d+)?\\.EXE$``: regular expression on the executable name
+- ``C:\\Program Files\\obs-studio\\``: any executable under a folder, or one
+  full executable path
+- ``CHROME.EXE | class=Chrome_WidgetWin_1 | title=*Slides*``: any of the
+  above, restricted by window class and/or title (glob)
+
+All matching is case-insensitive.
+"""
+
+import fnmatch
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Pattern, Set, Tuple
+
+
+REGEX_PREFIX = "re:"
+QUALIFIER_SEPARATOR = "|"
+QUALIFIER_KEYS = ("class", "title")
+
+# Distinct executable names are remembered per matcher; a desktop has a few
+# hundred at most
+NAME_CACHE_LIMIT = 4096
+
+
+# "|" only starts a qualifier when followed by a known key, so regular
+# expressions can still use alternation
+_QUALIFIER_SPLIT = re.compile(
+    r"\s*\|\s*(?=(?:%s)\s*=)" % "|".join(QUALIFIER_KEYS), re.IGNORECASE
+)
+
+
+# Constructs whose meaning depends on the group numbering or position of the
+# pattern, so a regex using them cannot be joined with others: numbered and
+# named backreferences, conditionals, named groups and global inline flags
+_CONTEXT_DEPENDENT = re.compile(
+    r"\\[1-9]|\(\?P[<=]|\(\?<[^=!]|\(\?\(|\(\?[aiLmsux]+\)"
+)
+
+
+def _split_rule(entry: str) -> List[str]:
+    """Split an entry into its base and qualifiers."""
+    return [part.strip() for part in _QUALIFIER_SPLIT.split(entry.strip())]
+
+
+def is_pattern(text: str) -> bool:
+    """Check if an entry is a glob rather than a plain name."""
+    return any(char in text for char in "*?[")
+
+
+def is_path(text: str) -> bool:
+    """Check if an entry names a folder or a full executable path."""
+    return "\\" in text or "/" in text
+
+
+def normalize_rule(entry: str) -> str:
+    """
+    Bring a whitelist entry into its stored form.
+
+    Names, globs and paths are uppercased; regular expressions and qualifier
+    values are kept as typed (they are matched case-insensitively).
+
+    Args:
+        entry: Entry as typed by the user
+
+    Returns:
+        Normalized entry.
+    """
+    parts = _split_rule(entry)
+    base = parts[0]
+    if base[: len(REGEX_PREFIX)].lower() == REGEX_PREFIX:
+        base = REGEX_PREFIX + base[len(REGEX_PREFIX):].strip()
+    else:
+        base = base.upper()
+
+    qualifiers = []
+    for part in parts[1:]:
+        key, sep, value = part.partition("=")
+        if not sep:
+            continue
+        qualifiers.append(f"{key.strip().lower()}={value.strip()}")
+
+    return f" {QUALIFIER_SEPARATOR} ".join([base] + qualifiers)
+
+
+def _split_path(path: str) -> List[str]:
+    """Split an uppercase path into its components."""
+    return [part for part in path.replace("/", "\\").upper().split("\\") if part]
+
+
+def _is_context_dependent(regex: str) -> bool:
+    """Check if a regex must be compiled on its own rather than combined."""
+    return _CONTEXT_DEPENDENT.search(regex) is not None
+
+
+def _base_regex(base: str) -> str:
+    """Get the regular expression for a glob or re: base."""
+    if base.startswith(REGEX_PREFIX):
+        return base[len(REGEX_PREFIX):]
+    return fnmatch.translate(base)
+
+
+class _AnyPattern:
+    """Stands in for a combined pattern that could not be compiled as one."""
+
+    def __init__(self, patterns: List[Pattern]):
+        self.patterns = patterns
+
+    def match(self, text: str):
+        for pattern in self.patterns:
+            found = pattern.match(text)
+            if found is not None:
+                return found
+        return None
+
+
+def _combine_patterns(regexes: List[str]):
+    """
+    Compile regexes into one pattern matching if any of them does.
+
+    Regexes that refer to their own groups by number or name (or set global
+    flags) keep their meaning only when compiled alone; the rest are joined
+    into a single alternation.
+    """
+    combined = [regex for regex in regexes if not _is_context_dependent(regex)]
+    separate = [
+        re.compile(regex, re.IGNORECASE)
+        for regex in regexes
+        if _is_context_dependent(regex)
+    ]
+
+    if combined:
+        joined = "|".join(f"(?:{regex})" for regex in combined)
+        try:
+            separate.insert(0, re.compile(joined, re.IGNORECASE))
+        except re.error:
+            separate[:0] = [re.compile(regex, re.IGNORECASE) for regex in combined]
+
+    if len(separate) == 1:
+        return separate[0]
+    return _AnyPattern(separate)
+
+
+@dataclass
+class QualifiedRule:
+    """A rule restricted to certain window classes and/or titles."""
+
+    base: str
+    class_name: Optional[str] = None
+    title: Optional[Pattern] = None
+    base_regex: Optional[Pattern] = None
+    base_path: Optional[Tuple[str, ...]] = None
+
+    def matches_window(self, class_name: str, title: str) -> bool:
+        """Check the window part of the rule."""
+        if self.class_name is not None and class_name.upper() != self.class_name:
+            return False
+        if self.title is not None and not self.title.match(title or ""):
+            return False
+        return True
+
+    def matches_process(self, name: str, exe: Optional[str]) -> bool:
+        """Check the process part of the rule."""
+        if self.base_regex is not None:
+            return self.base_regex.match(name) is not None
+        if self.base_path is not None:
+            if not exe:
+                return False
+            components = _split_path(exe)
+            return tuple(components[: len(self.base_path)]) == self.base_path
+        return name == self.base
+
+
+class WhitelistMatcher:
+    """Whitelist entries compiled for fast matching."""
+
+    def __init__(self, entries: Iterable[str] = ()):
+        """
+        Compile whitelist entries.
+
+        Invalid regular expressions are skipped.
+
+        Args:
+            entries: Whitelist entries (see normalize_rule)
+        """
+        self.exact_names: Set[str] = set()
+        # Nested dicts of path components; None marks the end of a rule
+        self.path_trie: Dict[str, dict] = {}
+        self.pattern: Optional[Pattern] = None
+
+        # Qualified rules with a plain name base, by name
+        self.qualified_by_name: Dict[str, List[QualifiedRule]] = {}
+        # Qualified rules with a glob, regex or path base
+        self.qualified_other: List[QualifiedRule] = []
+
+        self.rule_count = 0
+        self.invalid_rules: List[str] = []
+
+        # name -> (unqualified match, qualified rules that apply to the name)
+        self._name_cache: Dict[str, Tuple[bool, Tuple[QualifiedRule, ...]]] = {}
+
+        regexes = []
+        for entry in entries:
+            entry = normalize_rule(entry)
+            try:
+                self._add(entry, regexes)
+            except re.error:
+                self.invalid_rules.append(entry)
+                continue
+            self.rule_count += 1
+
+        if regexes:
+            self.pattern = _combine_patterns(regexes)
+
+    @property
+    def needs_title(self) -> bool:
+        """Check if any rule depends on the window title."""
+        return any(
+            rule.title is not None
+            for rules in [self.qualified_other] + list(self.qualified_by_name.values())
+            for rule in rules
+        )
+
+    @property
+    def needs_path(self) -> bool:
+        """Check if any rule needs the executable path."""
+        return bool(self.path_trie) or any(
+            rule.base_path is not None for rule in self.qualified_other
+        )
+
+    def _add(self, entry: str, regexes: List[str]):
+        """Add one normalized entry."""
+        parts = _split_rule(entry)
+        base = parts[0]
+        if not base:
+            return
+
+        qualifiers = {}
+        for part in parts[1:]:
+            key, _, value = part.partition("=")
+            if key in QUALIFIER_KEYS and value:
+                qualifiers[key] = value
+
+        is_regex = base.startswith(REGEX_PREFIX)
+
+        if not qualifiers:
+            if is_regex or is_pattern(base):
+                regex = _base_regex(base)
+                re.compile(regex)  # Reject invalid rules on their own
+                regexes.append(regex)
+            elif is_path(base):
+                node = self.path_trie
+                for component in _split_path(base):
+                    node = node.setdefault(component, {})
+                node[None] = {}
+            else:
+                self.exact_names.add(base)
+            return
+
+        rule = QualifiedRule(base)
+        if "class" in qualifiers:
+            rule.class_name = qualifiers["class"].upper()
+        if "title" in qualifiers:
+            rule.title = re.compile(fnmatch.translate(qualifiers["title"]), re.IGNORECASE)
+
+        if is_regex or is_pattern(base):
+            rule.base_regex = re.compile(_base_regex(base), re.IGNORECASE)
+            self.qualified_other.append(rule)
+        elif is_path(base):
+            rule.base_path = tuple(_split_path(base))
+            self.qualified_other.append(rule)
+        else:
+            self.qualified_by_name.setdefault(base, []).append(rule)
+
+    def _match_path(self, exe: str) -> bool:
+        """Check the executable path against the folder/path rules."""
+        node = self.path_trie
+        for component in _split_path(exe):
+            node = node.get(component)
+            if node is None:
+                return False
+            if None in node:
+                return True
+        return False
+
+    def _lookup_name(self, name: str) -> Tuple[bool, Tuple[QualifiedRule, ...]]:
+        """Get the name-only part of the decision, cached per name."""
+        cached = self._name_cache.get(name)
+        if cached is not None:
+            return cached
+
+        matched = name in self.exact_names or (
+            self.pattern is not None and self.pattern.match(name) is not None
+        )
+        rules = list(self.qualified_by_name.get(name, ()))
+        rules.extend(
+            rule for rule in self.qualified_other
+            if rule.base_path is not None or rule.matches_process(name, None)
+        )
+
+        if len(self._name_cache) >= NAME_CACHE_LIMIT:
+            self._name_cache.clear()
+        cached = self._name_cache[name] = (matched, tuple(rules))
+        return cached
+
+    def matches(
+        self,
+        name: str,
+        exe: Optional[str] = None,
+        class_name: str = "",
+        title: str = "",
+    ) -> bool:
+        """
+        Check if a window's process is whitelisted.
+
+        Args:
+            name: Executable name (uppercase)
+            exe: Full executable path, if known
+            class_name: Window class
+            title: Window title
+
+        Returns:
+            True if any rule matches, False otherwise.
+        """
+        matched, rules = self._lookup_name(name)
+        if matched:
+            return True
+
+        if exe and self.path_trie and self._match_path(exe):
+            return True
+
+        for rule in rules:
+            if rule.base_path is not None and not rule.matches_process(name, exe):
+                continue
+            if rule.matches_window(class_name, title):
+                return True
+
+        return False
@@ -0,0 +1,413 @@
+"""
+Window event source module.
+
+This module delivers window show, move and resize notifications to the
+enforcement engine. On Windows the events come from WinEvent hooks; a
+scripted in-memory source produces the same events so that dispatch latency
+and CPU cost can be measured on any platform.
+"""
+
+import time
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Deque, Iterable, List, Optional, Tuple
+
+
+EVENT_SYSTEM_FOREGROUND = 0x0003
+EVENT_SYSTEM_MOVESIZESTART = 0x000A
+EVENT_SYSTEM_MOVESIZEEND = 0x000B
+EVENT_OBJECT_SHOW = 0x8002
+EVENT_OBJECT_LOCATIONCHANGE = 0x800B
+
+OBJID_WINDOW = 0
+CHILDID_SELF = 0
+GA_ROOT = 2
+
+WINEVENT_OUTOFCONTEXT = 0x0000
+WINEVENT_SKIPOWNPROCESS = 0x0002
+
+QS_ALLINPUT = 0x04FF
+PM_REMOVE = 0x0001
+WAIT_TIMEOUT = 0x00000102
+WM_NULL = 0x0000
+
+# (eventMin, eventMax) ranges subscribed by WinEventHookSource in event mode
+HOOKED_EVENT_RANGES = [
+    (EVENT_SYSTEM_FOREGROUND, EVENT_SYSTEM_FOREGROUND),
+    (EVENT_SYSTEM_MOVESIZESTART, EVENT_SYSTEM_MOVESIZEEND),
+    (EVENT_OBJECT_SHOW, EVENT_OBJECT_SHOW),
+    (EVENT_OBJECT_LOCATIONCHANGE, EVENT_OBJECT_LOCATIONCHANGE),
+]
+
+# Ranges needed only to track which window is being dragged (poll mode)
+DRAG_EVENT_RANGES = [
+    (EVENT_SYSTEM_MOVESIZESTART, EVENT_SYSTEM_MOVESIZEEND),
+]
+
+
+@dataclass
+class WindowEvent:
+    """A single window notification."""
+
+    event: int
+    hwnd: int
+    timestamp: float  # time.perf_counter() when the event was raised
+
+
+EventCallback = Callable[[WindowEvent], None]
+
+
+class ScriptedEventSource:
+    """
+    In-memory event source.
+
+    Events are queued with emit() or play() and handed to the callback from
+    wait(), mirroring how WinEventHookSource delivers events while pumping
+    messages.
+    """
+
+    def __init__(self, event_ranges: Optional[List[Tuple[int, int]]] = None):
+        """
+        Initialize the scripted event source.
+
+        Args:
+            event_ranges: (eventMin, eventMax) ranges to deliver, all events
+                if None
+        """
+        self.event_ranges = event_ranges
+        self._callback: Optional[EventCallback] = None
+        self._pending: Deque[WindowEvent] = deque()
+        self._cond = threading.Condition()
+        self._player: Optional[threading.Thread] = None
+        self._stopped = False
+        self._woken = False
+
+    def start(self, callback: EventCallback) -> bool:
+        """
+        Start delivering events.
+
+        Args:
+            callback: Called with each WindowEvent
+
+        Returns:
+            True (the scripted source cannot fail to start).
+        """
+        self._callback = callback
+        self._stopped = False
+        return True
+
+    def stop(self):
+        """Stop delivering events and wake any waiter."""
+        with self._cond:
+            self._stopped = True
+            self._pending.clear()
+            self._cond.notify_all()
+
+    def wake(self):
+        """Make a pending or the next wait() return immediately."""
+        with self._cond:
+            self._woken = True
+            self._cond.notify_all()
+
+    def emit(self, event: int, hwnd: int, timestamp: Optional[float] = None):
+        """
+        Queue an event.
+
+        Args:
+            event: WinEvent constant (e.g., EVENT_OBJECT_SHOW)
+            hwnd: Window handle the event refers to
+            timestamp: perf_counter() timestamp, defaults to now
+        """
+        if self.event_ranges is not None and not any(
+            low <= event <= high for low, high in self.event_ranges
+        ):
+            return
+        if timestamp is None:
+            timestamp = time.perf_counter()
+        with self._cond:
+            self._pending.append(WindowEvent(event, hwnd, timestamp))
+            self._cond.notify_all()
+
+    def play(self, script: Iterable[Tuple[float, int, int]]):
+        """
+        Emit events from a background thread at scripted offsets.
+
+        Args:
+            script: Iterable of (offset_seconds, event, hwnd), offsets
+                relative to the call and in ascending order
+        """
+        script = list(script)
+
+        def run():
+            start = time.perf_counter()
+            for offset, event, hwnd in script:
+                delay = start + offset - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                if self._stopped:
+                    return
+                self.emit(event, hwnd)
+
+        self._player = threading.Thread(target=run, daemon=True)
+        self._player.start()
+
+    def is_playing(self) -> bool:
+        """Check if a play() script is still emitting events."""
+        return self._player is not None and self._player.is_alive()
+
+    def wait(self, timeout: float) -> int:
+        """
+        Wait for events and dispatch them to the callback.
+
+        Args:
+            timeout: Maximum time to wait in seconds
+
+        Returns:
+            Number of events dispatched.
+        """
+        with self._cond:
+            if not self._pending and not self._stopped and not self._woken:
+                self._cond.wait(timeout)
+            self._woken = False
+            events = list(self._pending)
+            self._pending.clear()
+
+        if self._callback:
+            for event in events:
+                self._callback(event)
+
+        return len(events)
+
+
+class WinEventHookSource:
+    """
+    Event source backed by SetWinEventHook.
+
+    Hooks are installed out-of-context, so callbacks are delivered on the
+    installing thread while it pumps messages - either through the Qt event
+    loop or through wait().
+    """
+
+    def __init__(self, event_ranges: Optional[List[Tuple[int, int]]] = None):
+        """
+        Initialize the WinEvent hook source.
+
+        Args:
+            event_ranges: (eventMin, eventMax) ranges to hook (defaults to
+                HOOKED_EVENT_RANGES)
+        """
+        self.event_ranges = event_ranges if event_ranges is not None else HOOKED_EVENT_RANGES
+        self._callback: Optional[EventCallback] = None
+        self._hooks: List[int] = []
+        self._proc = None
+        self._user32 = None
+        self._thread_id = 0
+
+    def start(self, callback: EventCallback) -> bool:
+        """
+        Install the WinEvent hooks.
+
+        Args:
+            callback: Called with each WindowEvent for top-level windows
+
+        Returns:
+            True if all hooks were installed, False otherwise.
+        """
+        import ctypes
+        from ctypes import wintypes
+
+        try:
+            user32 = ctypes.windll.user32
+        except Exception:
+            return False
+
+        WINEVENTPROC = ctypes.WINFUNCTYPE(
+            None,
+            wintypes.HANDLE,
+            wintypes.DWORD,
+            wintypes.HWND,
+            wintypes.LONG,
+            wintypes.LONG,
+            wintypes.DWORD,
+            wintypes.DWORD,
+        )
+        user32.SetWinEventHook.argtypes = [
+            wintypes.DWORD,
+            wintypes.DWORD,
+            wintypes.HMODULE,
+            WINEVENTPROC,
+            wintypes.DWORD,
+            wintypes.DWORD,
+            wintypes.DWORD,
+        ]
+        user32.SetWinEventHook.restype = wintypes.HANDLE
+        user32.UnhookWinEvent.argtypes = [wintypes.HANDLE]
+        user32.UnhookWinEvent.restype = wintypes.BOOL
+        user32.GetAncestor.argtypes = [wintypes.HWND, wintypes.UINT]
+        user32.GetAncestor.restype = wintypes.HWND
+
+        self._user32 = user32
+        self._callback = callback
+        self._thread_id = ctypes.windll.kernel32.GetCurrentThreadId()
+
+        def win_event_proc(hook, event, hwnd, id_object, id_child, thread_id, event_time):
+            if not hwnd or id_object != OBJID_WINDOW or id_child != CHILDID_SELF:
+                return
+            try:
+                # Only top-level windows are enforced
+                if user32.GetAncestor(hwnd, GA_ROOT) != hwnd:
+                    return
+                self._callback(WindowEvent(event, hwnd, time.perf_counter()))
+            except Exception:
+                pass
+
+        # Keep a reference so the callback is not garbage collected
+        self._proc = WINEVENTPROC(win_event_proc)
+
+        for event_min, event_max in self.event_ranges:
+            hook = user32.SetWinEventHook(
+                event_min,
+                event_max,
+                None,
+                self._proc,
+                0,
+                0,
+                WINEVENT_OUTOFCONTEXT | WINEVENT_SKIPOWNPROCESS,
+            )
+            if not hook:
+                self.stop()
+                return False
+            self._hooks.append(hook)
+
+        return True
+
+    def stop(self):
+        """Remove all installed hooks."""
+        if self._user32 is not None:
+            for hook in self._hooks:
+                try:
+                    self._user32.UnhookWinEvent(hook)
+                except Exception:
+                    pass
+        self._hooks = []
+
+    def wake(self):
+        """Make a pending or the next wait() return immediately (any thread)."""
+        if self._user32 is not None and self._thread_id:
+            try:
+                self._user32.PostThreadMessageW(self._thread_id, WM_NULL, 0, 0)
+            except Exception:
+                pass
+
+    def wait(self, timeout: float) -> int:
+        """
+        Pump the thread's message queue so hook callbacks are delivered.
+
+        Only needed when the installing thread has no other message loop.
+
+        Args:
+            timeout: Maximum time to wait in seconds
+
+        Returns:
+            Number of messages dispatched.
+        """
+        return pump_messages(self._user32, timeout)
+
+
+def pump_messages(user32, timeout: float) -> int:
+    """
+    Wait for and dispatch the calling thread's window messages.
+
+    Args:
+        user32: ctypes user32 library, or None to just sleep
+        timeout: Maximum time to wait in seconds
+
+    Returns:
+        Number of messages dispatched.
+    """
+    import ctypes
+    from ctypes import wintypes
+
+    if user32 is None:
+        time.sleep(timeout)
+        return 0
+
+    result = user32.MsgWaitForMultipleObjects(
+        0, None, False, int(timeout * 1000), QS_ALLINPUT
+    )
+    if result == WAIT_TIMEOUT:
+        return 0
+
+    msg = wintypes.MSG()
+    count = 0
+    while user32.PeekMessageW(ctypes.byref(msg), None, 0, 0, PM_REMOVE):
+        user32.TranslateMessage(ctypes.byref(msg))
+        user32.DispatchMessageW(ctypes.byref(msg))
+        count += 1
+    return count
+
+
+@dataclass
+class EventRunStats:
+    """Dispatch measurements from a scripted event run."""
+
+    events: int = 0
+    wall_ms: float = 0.0
+    cpu_ms: float = 0.0
+    latencies_ms: List[float] = field(default_factory=list)
+
+    @property
+    def mean_latency_ms(self) -> float:
+        if not self.latencies_ms:
+            return 0.0
+        return sum(self.latencies_ms) / len(self.latencies_ms)
+
+    @property
+    def max_latency_ms(self) -> float:
+        return max(self.latencies_ms) if self.latencies_ms else 0.0
+
+
+def measure_scripted_run(
+    script: Iterable[Tuple[float, int, int]],
+    handler: EventCallback,
+    poll_timeout: float = 0.5,
+) -> EventRunStats:
+    """
+    Replay a script through a ScriptedEventSource and measure the handler.
+
+    Latency is measured from the moment an event is emitted until the
+    handler returns for it.
+
+    Args:
+        script: Iterable of (offset_seconds, event, hwnd)
+        handler: Event handler under test (e.g., WindowMonitor.handle_window_event)
+        poll_timeout: Maximum wait per loop iteration in seconds
+
+    Returns:
+        EventRunStats for the run.
+    """
+    stats = EventRunStats()
+
+    def timed_handler(window_event: WindowEvent):
+        handler(window_event)
+        stats.latencies_ms.append(
+            (time.perf_counter() - window_event.timestamp) * 1000.0
+        )
+
+    source = ScriptedEventSource()
+    source.start(timed_handler)
+
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+
+    source.play(script)
+    while source.is_playing():
+        stats.events += source.wait(poll_timeout)
+    stats.events += source.wait(0)
+
+    stats.cpu_ms = (time.process_time() - cpu_start) * 1000.0
+    stats.wall_ms = (time.perf_counter() - wall_start) * 1000.0
+    source.stop()
+
+    return stats
@@ -5,30 +5,124 @@ This module monitors all windows and enforces projector restrictions
 by moving non-whitelisted windows back to the primary monitor.
 """
 
-import win32gui
-import win32con
-import win32process
-import win32api
-import psutil
 import time
-from typing import Optional, Callable, Dict, Set, List
-from dataclasses import dataclass
-
-from .monitor_info import (
-    get_primary_monitor,
-    get_monitor_by_device_name,
-    get_device_name_for_hmonitor,
-    has_projectors,
-    is_window_on_monitor,
-)
+from typing import Optional, Callable, Dict, Set, List, Tuple, FrozenSet
+from dataclasses import dataclass, field
+
 from .whitelist import get_whitelist
+from .expiry import ExpiringSet
+from .process_cache import ProcessCache, ProcessCacheStats, ProcessIdentity
+from .metrics import LatencyHistogram
+from .profiling import (
+    PhaseProfiler,
+    PHASE_CLEANUP,
+    PHASE_DRAG_DETECTION,
+    PHASE_DEFERRED_FLUSH,
+    PHASE_ENUMERATION,
+    PHASE_VALIDITY,
+    PHASE_PROCESS_LOOKUP,
+    PHASE_WHITELIST,
+    PHASE_GEOMETRY,
+    PHASE_MOVE,
+    PHASE_TOTAL,
+)
+from .window_events import (
+    WindowEvent,
+    EVENT_SYSTEM_MOVESIZESTART,
+    EVENT_SYSTEM_MOVESIZEEND,
+)
+
+# Window policies returned by WindowMonitor._get_policy()
+POLICY_ALLOWED = 0  # allowed on every monitor
+POLICY_RESTRICTED = 1  # kept off protected monitors unless on the primary device
+POLICY_RESTRICTED_STRICT = 2  # kept off protected monitors
+
+# Desktop and taskbar windows are never enforced
+IGNORED_WINDOW_CLASSES = frozenset(["Shell_TrayWnd", "Progman", "WorkerW"])
+
+
+@dataclass
+class WindowSnapshot:
+    """Window state read once per check."""
+
+    hwnd: int
+    visible: bool = False
+    title: str = ""
+    class_name: str = ""
+    rect: Optional[Tuple[int, int, int, int]] = None
+    pid: int = 0
+    hmonitor: Optional[int] = None
+
+
+def take_window_snapshot(hwnd: int, window_system) -> WindowSnapshot:
+    """
+    Read the state needed for enforcement from a window.
+
+    Invisible windows are not read any further.
+
+    Args:
+        hwnd: Window handle
+        window_system: Window system to read from (e.g., Win32WindowSystem)
+
+    Returns:
+        WindowSnapshot (not visible if the window could not be read).
+    """
+    snapshot = WindowSnapshot(hwnd)
+
+    try:
+        if not window_system.is_window_visible(hwnd):
+            return snapshot
+
+        snapshot.title = window_system.get_window_text(hwnd)
+        snapshot.class_name = window_system.get_class_name(hwnd)
+    except Exception:
+        return snapshot
+
+    snapshot.visible = True
+
+    try:
+        snapshot.rect = window_system.get_window_rect(hwnd)
+    except Exception:
+        pass
 
-VK_LBUTTON = 0x01
+    try:
+        snapshot.pid = window_system.get_window_pid(hwnd)
+    except Exception:
+        pass
 
+    snapshot.hmonitor = window_system.monitor_from_window(hwnd)
 
-def _is_dragging() -> bool:
-    """Check if user is actively dragging (left mouse button pressed)."""
-    return (win32api.GetAsyncKeyState(VK_LBUTTON) & 0x8000) != 0
+    return snapshot
+
+
+@dataclass
+class WindowRecord:
+    """Last observed state of a window and the verdict reached for it."""
+
+    visible: bool
+    title: str
+    class_name: str
+    rect: Optional[Tuple[int, int, int, int]]
+    pid: int
+    hmonitor: Optional[int]
+    # Inputs the verdict was decided with (see WindowMonitor._decision_key)
+    decision_key: tuple
+    # False if the window is not monitored at all (see is_valid_window)
+    valid: bool
+    # Check counter of the last time the window was enumerated
+    seen_tick: int = 0
+
+    def matches(self, snapshot: WindowSnapshot, decision_key: tuple) -> bool:
+        """Check if a snapshot shows the same window state under the same inputs."""
+        return (
+            self.rect == snapshot.rect
+            and self.hmonitor == snapshot.hmonitor
+            and self.visible == snapshot.visible
+            and self.pid == snapshot.pid
+            and self.class_name == snapshot.class_name
+            and self.title == snapshot.title
+            and self.decision_key == decision_key
+        )
 
 
 @dataclass
@@ -38,6 +132,20 @@ class WindowMoveStats:
     total_moves: int = 0
     last_moved_process: str = ""
     last_moved_title: str = ""
+    batches: int = 0
+    batch_fallbacks: int = 0
+    last_batch_size: int = 0
+    last_batch_ms: float = 0.0
+    total_batch_ms: float = 0.0
+    # Windows decided from scratch vs. skipped because nothing changed
+    verdicts_computed: int = 0
+    verdicts_reused: int = 0
+    # Policy lookups answered from / missing the verdict cache
+    policy_cache_hits: int = 0
+    policy_cache_misses: int = 0
+    # Time from a violating window first being seen (or its event arriving)
+    # until it has been moved
+    enforcement_latency: LatencyHistogram = field(default_factory=LatencyHistogram)
 
 
 class WindowMonitor:
@@ -45,29 +153,79 @@ class WindowMonitor:
     Monitors windows and enforces projector restrictions.
     """
 
-    def __init__(self, protected_device_names=None, whitelist=None):
+    def __init__(self, protected_device_names=None, whitelist=None, window_system=None):
         """
         Initialize the window monitor.
 
         Args:
             protected_device_names: List of device names to protect (e.g., ["\\\\.\\DISPLAY2", "\\\\.\\DISPLAY3"])
             whitelist: Whitelist instance (uses default if None)
+            window_system: Window system to enforce on (uses Win32WindowSystem if None)
         """
+        if window_system is None:
+            from .window_system import Win32WindowSystem
+
+            window_system = Win32WindowSystem()
+
         if protected_device_names is None:
             protected_device_names = ["\\\\.\\DISPLAY2", "\\\\.\\DISPLAY3"]
 
         self.protected_device_names = protected_device_names
         self.primary_device = None  # NEW: Always allowed monitor
         self.whitelist = whitelist or get_whitelist()
+        self.window_system = window_system
         self.enabled = True
         self.stats = WindowMoveStats()
+        self.process_cache = ProcessCache(open_process=window_system.open_process)
+        self.profiler = PhaseProfiler()
 
         self.on_window_moved: Optional[Callable] = None
 
-        self._recently_moved: dict[int, float] = {}
         self._move_debounce_ms = 500
-        self._was_dragging = False
-        self._deferred_hwnds: Set[int] = set()
+        # Windows moved within the debounce period
+        self._recently_moved = ExpiringSet(self._move_debounce_ms / 1000.0, max_entries=4096)
+        # Violating windows waiting for their drag to end; a drag cannot keep
+        # a window deferred forever, it is re-deferred on the next check
+        self._deferred_hwnds = ExpiringSet(30.0, max_entries=256)
+        # Window in a move/size loop, reported by MOVESIZESTART/END events
+        # while hook-based drag tracking is on
+        self._drag_hwnd: Optional[int] = None
+        self._hook_drag_tracking = False
+        self._protected_handles: FrozenSet[int] = frozenset()
+        self._primary_handles: FrozenSet[int] = frozenset()
+        self._handles_key = None
+
+        # Set to self.profiler for the duration of a profiled check, else None
+        self._tick_profiler: Optional[PhaseProfiler] = None
+
+        # hwnd -> perf_counter() when the window was first seen violating
+        self._violation_first_seen: Dict[int, float] = {}
+
+        # hwnd -> PID the window's process identity was checked for, so only
+        # the first lookup of a window pays for the PID reuse check
+        self._verified_pids: Dict[int, int] = {}
+
+        # hwnd -> last observed state of windows that were not violating, so
+        # unchanged windows are not decided again on every check
+        self._window_records: Dict[int, WindowRecord] = {}
+        self._decision_key: tuple = ()
+        self._check_count = 0
+        self._records_seen = 0
+
+        # (pid, create time, class, title or None) -> (policy stamp, policy).
+        # Entries from an older stamp are stale and recomputed on access, so
+        # a whitelist change invalidates the whole cache without walking it.
+        self._policy_cache: Dict[tuple, Tuple[tuple, int]] = {}
+        self._policy_cache_limit = 4096
+        self._policy_stamp: tuple = ()
+        self._policy_uses_title = False
+
+        # Activity tracking for the adaptive scheduler
+        self.last_tick_activity = True
+        self._seen_hwnds: Set[int] = set()
+        self._last_seen_hwnds: FrozenSet[int] = frozenset()
+        self._last_foreground = 0
+        self._last_input_tick = 0
 
     def is_enabled(self) -> bool:
         """Check if monitoring is enabled."""
@@ -91,23 +249,53 @@ class WindowMonitor:
         """
         self.protected_device_names = device_names
 
+    def set_drag_tracking(self, hooked: bool):
+        """
+        Choose how the window being dragged is detected.
+
+        Args:
+            hooked: True if MOVESIZESTART/END events are delivered to
+                handle_window_event(); False to fall back to polling the
+                mouse button and the foreground window
+        """
+        self._hook_drag_tracking = hooked
+        if not hooked:
+            self._drag_hwnd = None
+
+    def _get_dragged_window(self) -> Optional[int]:
+        """
+        Get the window the user is currently moving or resizing.
+
+        Returns:
+            Window handle, or None if no window is being dragged.
+        """
+        if self._hook_drag_tracking:
+            if self._drag_hwnd and not self.window_system.is_window_visible(self._drag_hwnd):
+                # The window went away without a MOVESIZEEND
+                self._drag_hwnd = None
+            return self._drag_hwnd
+
+        # Without hooks: a held button can only be dragging the foreground window
+        if not self.window_system.is_left_button_down():
+            return None
+        try:
+            return self.window_system.get_foreground_window() or None
+        except Exception:
+            return None
+
     def _is_recently_moved(self, hwnd: int) -> bool:
         """Check if window was moved within the debounce period."""
-        if hwnd in self._recently_moved:
-            elapsed = time.time() - self._recently_moved[hwnd]
-            if elapsed < self._move_debounce_ms / 1000.0:
-                return True
-        return False
+        return hwnd in self._recently_moved
 
     def _cleanup_old_entries(self):
-        """Remove stale entries from recently_moved dict."""
-        current_time = time.time()
-        stale_threshold = current_time - (self._move_debounce_ms / 1000.0)
-        self._recently_moved = {
-            hwnd: ts
-            for hwnd, ts in self._recently_moved.items()
-            if ts >= stale_threshold
-        }
+        """Remove expired debounce and deferral entries."""
+        self._recently_moved.expire()
+
+        deferred = self._deferred_hwnds
+        if deferred:
+            deferred.expire()
+            # Windows destroyed while they were dragged
+            deferred.retain(self.window_system.is_window)
 
     def set_primary_device(self, device_name: Optional[str]):
         """
@@ -129,84 +317,133 @@ class WindowMonitor:
             Process name (uppercase) or None if not found.
         """
         try:
-            _, pid = win32process.GetWindowThreadProcessId(hwnd)
+            pid = self.window_system.get_window_pid(hwnd)
             if pid:
-                process = psutil.Process(pid)
-                return process.name().upper()
-        except (psutil.NoSuchProcess, psutil.AccessDenied, Exception):
+                return self.process_cache.get_name(pid)
+        except Exception:
             pass
 
         return None
 
-    def is_valid_window(self, hwnd: int) -> bool:
+    def is_valid_window(self, hwnd: int, snapshot: Optional[WindowSnapshot] = None) -> bool:
         """
         Check if a window should be monitored.
 
         Args:
             hwnd: Window handle
+            snapshot: Window state for this check (read from the window if None)
 
         Returns:
             True if the window should be monitored, False otherwise.
         """
-        if not win32gui.IsWindowVisible(hwnd):
+        if snapshot is None:
+            snapshot = take_window_snapshot(hwnd, self.window_system)
+
+        if not snapshot.visible:
             return False
 
-        try:
-            title = win32gui.GetWindowText(hwnd)
-            if not title:
-                return False
-        except Exception:
+        if not snapshot.title:
             return False
 
-        try:
-            class_name = win32gui.GetClassName(hwnd)
-            if class_name in ["Shell_TrayWnd", "Progman", "WorkerW"]:
-                return False
-        except Exception:
+        if snapshot.class_name in IGNORED_WINDOW_CLASSES:
             return False
 
         return True
 
-    def is_window_on_device(self, hwnd: int, device_name: str) -> bool:
+    def _refresh_device_handles(self):
+        """
+        Resolve protected and primary devices to monitor handles.
+
+        The lookup sets are only rebuilt when the monitor topology or the
+        device configuration changed. Also stamps the inputs verdicts of this
+        check are decided with, so a whitelist edit or topology change makes
+        every window be decided again.
+        """
+        key = (
+            self.window_system.get_topology_generation(),
+            tuple(self.protected_device_names),
+            self.primary_device,
+        )
+        # Everything a verdict depends on besides the window itself
+        policy_stamp = (id(self.whitelist), self.whitelist.generation)
+        decision_key = (key, policy_stamp)
+        if decision_key != self._decision_key:
+            matcher = self.whitelist.get_matcher()
+            # Folder rules need executable paths, title rules the title
+            self.process_cache.set_resolve_exe(matcher.needs_path)
+            self._policy_uses_title = matcher.needs_title
+            # Only stamped once the matcher is in place, so a failure above is
+            # retried on the next check
+            self._decision_key = decision_key
+            self._policy_stamp = policy_stamp
+        if key == self._handles_key:
+            return
+
+        protected = set(self.protected_device_names)
+        protected_handles = set()
+        primary_handles = set()
+        for monitor in self.window_system.get_monitors():
+            if monitor.device_name in protected:
+                protected_handles.add(monitor.handle)
+            if self.primary_device and monitor.device_name == self.primary_device:
+                primary_handles.add(monitor.handle)
+
+        self._protected_handles = frozenset(protected_handles)
+        self._primary_handles = frozenset(primary_handles)
+        self._handles_key = key
+
+    def is_window_on_device(
+        self, hwnd: int, device_name: str, snapshot: Optional[WindowSnapshot] = None
+    ) -> bool:
         """
         Check if a window is on a specific device.
 
         Args:
             hwnd: Window handle
             device_name: Device name (e.g., "\\\\.\\DISPLAY2")
+            snapshot: Window state for this check (read from the window if None)
 
         Returns:
-            True if window center is on the device, False otherwise.
+            True if the window is mostly on the device, False otherwise.
         """
-        monitor = get_monitor_by_device_name(device_name)
-        if monitor:
-            return is_window_on_monitor(hwnd, monitor)
-        return False
+        if snapshot is None:
+            snapshot = take_window_snapshot(hwnd, self.window_system)
+
+        return device_name in self.window_system.get_device_names_for_handle(
+            snapshot.hmonitor
+        )
 
-    def _is_powerpoint_in_slideshow(self, hwnd: int, process_name: str) -> bool:
+    def _is_on_protected_device(self, snapshot: WindowSnapshot) -> bool:
+        """Check if a window is on any protected device."""
+        return snapshot.hmonitor in self._protected_handles
+
+    def _is_powerpoint_in_slideshow(self, snapshot: WindowSnapshot, process_name: str) -> bool:
         """Check if PowerPoint window is in slideshow/presentation mode."""
         if process_name != "POWERPNT.EXE":
             return False
 
-        try:
-            class_name = win32gui.GetClassName(hwnd)
-            window_title = win32gui.GetWindowText(hwnd)
+        # PowerPoint slideshow window class names:
+        # - "PPTFrameClass" (main window - NOT slideshow)
+        # - "screenClass" (slideshow window - this is what we want to allow)
+        # Window is slideshow if class is "screenClass"
 
-            # PowerPoint slideshow window class names:
-            # - "PPTFrameClass" (main window - NOT slideshow)
-            # - "screenClass" (slideshow window - this is what we want to allow)
-            # Window is slideshow if class is "screenClass"
+        return snapshot.class_name == "screenClass"
 
-            return class_name == "screenClass"
-        except Exception:
-            return False
-
-    def should_move_window(self, hwnd: int) -> tuple[bool, Optional[str]]:
+    def should_move_window(
+        self,
+        hwnd: int,
+        snapshot: Optional[WindowSnapshot] = None,
+        new_window: bool = True,
+    ) -> tuple[bool, Optional[str]]:
         """
         Check if a window should be moved back to primary monitor.
 
         Args:
             hwnd: Window handle
+            snapshot: Window state for this check (read from the window if None)
+            new_window: False if the window was already seen with this PID, so
+                its cached process identity can be trusted without checking
+                for PID reuse
 
         Returns:
             Tuple of (should_move, process_name)
@@ -214,87 +451,514 @@ class WindowMonitor:
         if not self.enabled:
             return False, None
 
-        process_name = self.get_process_name(hwnd)
+        if snapshot is None:
+            snapshot = take_window_snapshot(hwnd, self.window_system)
+            self._refresh_device_handles()
+
+        prof = self._tick_profiler
+        if prof is not None:
+            t0 = time.perf_counter()
+
+        identity = self.process_cache.get(snapshot.pid, revalidate=new_window)
 
-        if not process_name:
+        if prof is not None:
+            t1 = time.perf_counter()
+            prof.add(PHASE_PROCESS_LOOKUP, t1 - t0)
+
+        if identity is None:
             return True, None
 
+        process_name = identity.name
+        policy = self._get_cached_policy(snapshot, identity)
+
+        if prof is not None:
+            t2 = time.perf_counter()
+            prof.add(PHASE_WHITELIST, t2 - t1)
+
+        should_move = self._violates_placement(snapshot, policy)
+
+        if prof is not None:
+            prof.add(PHASE_GEOMETRY, time.perf_counter() - t2)
+
+        return should_move, process_name
+
+    def _get_cached_policy(self, snapshot: WindowSnapshot, identity: ProcessIdentity) -> int:
+        """
+        Get the policy of a window, reusing the verdict for the same process
+        and window class while the whitelist is unchanged.
+
+        Args:
+            snapshot: Window state for this check
+            identity: Identity of the window's process
+
+        Returns:
+            POLICY_ALLOWED, POLICY_RESTRICTED or POLICY_RESTRICTED_STRICT
+        """
+        key = (
+            identity.pid,
+            identity.create_time,
+            snapshot.class_name,
+            snapshot.title if self._policy_uses_title else None,
+        )
+        stamp = self._policy_stamp
+
+        cached = self._policy_cache.get(key)
+        if cached is not None and cached[0] == stamp:
+            self.stats.policy_cache_hits += 1
+            return cached[1]
+
+        self.stats.policy_cache_misses += 1
+        policy = self._get_policy(snapshot, identity.name, identity.exe)
+
+        cache = self._policy_cache
+        if cached is None and len(cache) >= self._policy_cache_limit:
+            # Drop the oldest entry (dicts keep insertion order)
+            del cache[next(iter(cache))]
+        cache[key] = (stamp, policy)
+        return policy
+
+    def _get_policy(
+        self, snapshot: WindowSnapshot, process_name: str, exe: Optional[str] = None
+    ) -> int:
+        """
+        Decide what a window is allowed to do, independent of where it is.
+
+        Args:
+            snapshot: Window state for this check
+            process_name: Process name (uppercase)
+            exe: Full executable path (only read while a folder rule exists)
+
+        Returns:
+            POLICY_ALLOWED, POLICY_RESTRICTED or POLICY_RESTRICTED_STRICT
+        """
         # Special handling for PowerPoint - only allow when in slideshow mode
         if process_name == "POWERPNT.EXE":
-            if self._is_powerpoint_in_slideshow(hwnd, process_name):
-                return False, process_name  # Allow PowerPoint in slideshow mode
+            if self._is_powerpoint_in_slideshow(snapshot, process_name):
+                return POLICY_ALLOWED  # Allow PowerPoint in slideshow mode
             # PowerPoint NOT in slideshow mode - should be moved
-            for device_name in self.protected_device_names:
-                if self.is_window_on_device(hwnd, device_name):
-                    return True, process_name
-            return False, process_name
+            return POLICY_RESTRICTED_STRICT
+
+        if self.whitelist.is_whitelisted(
+            process_name, exe, snapshot.class_name, snapshot.title
+        ):
+            return POLICY_ALLOWED
 
-        if self.whitelist.is_whitelisted(process_name):
-            return False, process_name
+        return POLICY_RESTRICTED
+
+    def _violates_placement(self, snapshot: WindowSnapshot, policy: int) -> bool:
+        """
+        Check if a window's position violates its policy.
+
+        Args:
+            snapshot: Window state for this check
+            policy: Result of _get_policy()
+
+        Returns:
+            True if the window must be moved, False otherwise.
+        """
+        if policy == POLICY_ALLOWED:
+            return False
 
         # Skip if window is on the primary (always allowed) monitor
-        if self.primary_device and self.is_window_on_device(hwnd, self.primary_device):
-            return False, process_name
+        if policy == POLICY_RESTRICTED and snapshot.hmonitor in self._primary_handles:
+            return False
 
-        for device_name in self.protected_device_names:
-            if self.is_window_on_device(hwnd, device_name):
-                return True, process_name
+        return self._is_on_protected_device(snapshot)
 
-        return False, process_name
+    def _get_target_position(
+        self, hwnd: int, snapshot: Optional[WindowSnapshot], primary_monitor
+    ) -> Tuple[int, int, int, int]:
+        """
+        Compute where a window goes on the primary monitor.
 
-    def move_to_primary_monitor(self, hwnd: int) -> bool:
+        Args:
+            hwnd: Window handle
+            snapshot: Window state for this check (read from the window if None)
+            primary_monitor: MonitorInfo of the primary monitor
+
+        Returns:
+            Tuple of (x, y, width, height)
+        """
+        # Get current window position and size
+        if snapshot is not None and snapshot.rect is not None:
+            rect = snapshot.rect
+        else:
+            rect = self.window_system.get_window_rect(hwnd)
+        width = rect[2] - rect[0]
+        height = rect[3] - rect[1]
+
+        # Calculate new position on primary monitor
+        # Center the window or place at top-left corner
+        work_rect = primary_monitor.rc_work
+
+        # Ensure window fits on the primary monitor
+        if width > work_rect[2] - work_rect[0]:
+            width = work_rect[2] - work_rect[0]
+        if height > work_rect[3] - work_rect[1]:
+            height = work_rect[3] - work_rect[1]
+
+        # Position at top-left of work area with some padding
+        new_x = work_rect[0] + 20
+        new_y = work_rect[1] + 20
+
+        return new_x, new_y, width, height
+
+    def move_to_primary_monitor(
+        self, hwnd: int, snapshot: Optional[WindowSnapshot] = None
+    ) -> bool:
         """
         Move a window to the primary monitor.
 
         Args:
             hwnd: Window handle
+            snapshot: Window state for this check (read from the window if None)
 
         Returns:
             True if moved successfully, False otherwise.
         """
-        primary_monitor = get_primary_monitor()
+        primary_monitor = self.window_system.get_primary_monitor()
         if primary_monitor is None:
             return False
 
         try:
-            # Get current window position and size
-            rect = win32gui.GetWindowRect(hwnd)
-            width = rect[2] - rect[0]
-            height = rect[3] - rect[1]
-
-            # Calculate new position on primary monitor
-            # Center the window or place at top-left corner
-            work_rect = primary_monitor.rc_work
-
-            # Ensure window fits on the primary monitor
-            if width > work_rect[2] - work_rect[0]:
-                width = work_rect[2] - work_rect[0]
-            if height > work_rect[3] - work_rect[1]:
-                height = work_rect[3] - work_rect[1]
-
-            # Position at top-left of work area with some padding
-            new_x = work_rect[0] + 20
-            new_y = work_rect[1] + 20
+            new_x, new_y, width, height = self._get_target_position(
+                hwnd, snapshot, primary_monitor
+            )
 
             # Move the window
-            win32gui.SetWindowPos(
-                hwnd,
-                win32con.HWND_TOP,
-                new_x,
-                new_y,
-                width,
-                height,
-                win32con.SWP_SHOWWINDOW | win32con.SWP_NOACTIVATE,
-            )
+            self.window_system.set_window_pos(hwnd, new_x, new_y, width, height)
 
             # Track when this window was last moved (debounce)
-            self._recently_moved[hwnd] = time.time()
+            self._recently_moved.add(hwnd)
 
             return True
 
         except Exception as e:
             return False
 
+    def move_windows_to_primary_monitor(
+        self, snapshots: List[WindowSnapshot]
+    ) -> List[WindowSnapshot]:
+        """
+        Move several windows to the primary monitor in one transaction.
+
+        Uses BeginDeferWindowPos/DeferWindowPos/EndDeferWindowPos so the
+        desktop repaints once for the whole batch. If the batch fails, each
+        window is moved individually.
+
+        Args:
+            snapshots: Windows to move
+
+        Returns:
+            List of snapshots for the windows that were moved.
+        """
+        if not snapshots:
+            return []
+
+        start = time.perf_counter()
+        moved: List[WindowSnapshot] = []
+
+        if len(snapshots) == 1:
+            # A single window needs no transaction; still a batch of one
+            snapshot = snapshots[0]
+            if self.move_to_primary_monitor(snapshot.hwnd, snapshot):
+                moved.append(snapshot)
+            self._record_batch(1, start)
+            return moved
+
+        primary_monitor = self.window_system.get_primary_monitor()
+        if primary_monitor is None:
+            return []
+
+        try:
+            placements = []
+            for snapshot in snapshots:
+                placements.append(
+                    (snapshot.hwnd,)
+                    + self._get_target_position(snapshot.hwnd, snapshot, primary_monitor)
+                )
+            self.window_system.set_window_pos_batch(placements)
+
+            for snapshot in snapshots:
+                self._recently_moved.add(snapshot.hwnd)
+            moved = list(snapshots)
+
+        except Exception:
+            self.stats.batch_fallbacks += 1
+            for snapshot in snapshots:
+                if self.move_to_primary_monitor(snapshot.hwnd, snapshot):
+                    moved.append(snapshot)
+
+        self._record_batch(len(snapshots), start)
+        return moved
+
+    def _record_batch(self, size: int, start: float):
+        """Update batch statistics for a batch that started at start (perf_counter)."""
+        elapsed_ms = (time.perf_counter() - start) * 1000.0
+        self.stats.batches += 1
+        self.stats.last_batch_size = size
+        self.stats.last_batch_ms = elapsed_ms
+        self.stats.total_batch_ms += elapsed_ms
+
+    def _record_move(self, snapshot: WindowSnapshot, process_name: Optional[str]):
+        """Update statistics and notify the callback after a window was moved."""
+        first_seen = self._violation_first_seen.pop(snapshot.hwnd, None)
+        if first_seen is not None:
+            self.stats.enforcement_latency.record(
+                (time.perf_counter() - first_seen) * 1000.0
+            )
+
+        self.stats.total_moves += 1
+        self.stats.last_moved_title = snapshot.title
+        self.stats.last_moved_process = process_name or "Unknown"
+
+        # Call callback if set
+        try:
+            if self.on_window_moved:
+                self.on_window_moved(snapshot.hwnd, process_name, snapshot.title)
+        except Exception:
+            pass
+
+    def _apply_moves(self, violations: List[Tuple[WindowSnapshot, Optional[str]]]) -> int:
+        """
+        Move violating windows as one batch and record the moves.
+
+        Args:
+            violations: List of (snapshot, process_name) to move
+
+        Returns:
+            Number of windows moved.
+        """
+        if not violations:
+            return 0
+
+        process_names = {snapshot.hwnd: name for snapshot, name in violations}
+        moved = self.move_windows_to_primary_monitor(
+            [snapshot for snapshot, _ in violations]
+        )
+        for snapshot in moved:
+            self._record_move(snapshot, process_names.get(snapshot.hwnd))
+        return len(moved)
+
+    def _collect_deferred(
+        self, dragged_hwnd: Optional[int] = None
+    ) -> List[Tuple[WindowSnapshot, Optional[str]]]:
+        """
+        Re-check windows that were deferred while the user was dragging them.
+
+        Args:
+            dragged_hwnd: Window still being dragged, stays deferred
+
+        Returns:
+            List of (snapshot, process_name) that still need to be moved.
+        """
+        deferred = [hwnd for hwnd in self._deferred_hwnds if hwnd != dragged_hwnd]
+        for hwnd in deferred:
+            self._deferred_hwnds.discard(hwnd)
+
+        violations = []
+        for hwnd in deferred:
+            violation = self._evaluate_window(hwnd, False)
+            if violation is not None:
+                violations.append(violation)
+        return violations
+
+    def _flush_deferred(self, dragged_hwnd: Optional[int] = None) -> int:
+        """
+        Enforce windows that were deferred while the user was dragging them.
+
+        Args:
+            dragged_hwnd: Window still being dragged, stays deferred
+
+        Returns:
+            Number of windows moved.
+        """
+        return self._apply_moves(self._collect_deferred(dragged_hwnd))
+
+    def _evaluate_window(
+        self,
+        hwnd: int,
+        is_currently_dragging: bool,
+        seen_at: Optional[float] = None,
+    ) -> Optional[Tuple[WindowSnapshot, Optional[str]]]:
+        """
+        Check a single window against the restrictions.
+
+        Device handles must have been resolved for this check with
+        _refresh_device_handles().
+
+        Args:
+            hwnd: Window handle
+            is_currently_dragging: The user is dragging this window - defer it
+                instead of reporting it
+            seen_at: perf_counter() time the window's state was reported
+                (event timestamp), defaults to now
+
+        Returns:
+            Tuple of (snapshot, process_name) if the window must be moved now,
+            otherwise None.
+        """
+        prof = self._tick_profiler
+        if prof is not None:
+            t0 = time.perf_counter()
+
+        snapshot = take_window_snapshot(hwnd, self.window_system)
+
+        # Unchanged windows keep the verdict of the previous check
+        record = self._window_records.get(hwnd)
+        if record is not None and record.matches(snapshot, self._decision_key):
+            record.seen_tick = self._check_count
+            self._records_seen += 1
+            self.stats.verdicts_reused += 1
+            if record.valid:
+                self._seen_hwnds.add(hwnd)
+            if prof is not None:
+                prof.add(PHASE_VALIDITY, time.perf_counter() - t0)
+            return None
+
+        is_valid = self.is_valid_window(hwnd, snapshot)
+
+        if prof is not None:
+            prof.add(PHASE_VALIDITY, time.perf_counter() - t0)
+
+        if not is_valid:
+            self._remember_window(snapshot, False)
+            return None
+
+        self._seen_hwnds.add(hwnd)
+
+        # Skip recently moved windows (debounce)
+        if self._is_recently_moved(hwnd):
+            return None
+
+        self.stats.verdicts_computed += 1
+        # Based on the window having been looked up before rather than on its
+        # record: violating windows have none, and may stay put for a while
+        should_move, process_name = self.should_move_window(
+            hwnd, snapshot, new_window=self._verified_pids.get(hwnd) != snapshot.pid
+        )
+        self._verified_pids[hwnd] = snapshot.pid
+
+        if not should_move:
+            self._violation_first_seen.pop(hwnd, None)
+            self._remember_window(snapshot, True)
+            return None
+
+        # Violations are never remembered - they are decided again until moved
+        self._window_records.pop(hwnd, None)
+
+        if hwnd not in self._violation_first_seen:
+            self._violation_first_seen[hwnd] = (
+                seen_at if seen_at is not None else time.perf_counter()
+            )
+
+        if is_currently_dragging:
+            # Defer enforcement until drag ends
+            self._deferred_hwnds.add(hwnd)
+            return None
+
+        return snapshot, process_name
+
+    def _remember_window(self, snapshot: WindowSnapshot, valid: bool):
+        """
+        Remember a window that does not need to be moved.
+
+        Args:
+            snapshot: Window state the verdict was reached for
+            valid: False if the window is not monitored at all
+        """
+        self._window_records[snapshot.hwnd] = WindowRecord(
+            visible=snapshot.visible,
+            title=snapshot.title,
+            class_name=snapshot.class_name,
+            rect=snapshot.rect,
+            pid=snapshot.pid,
+            hmonitor=snapshot.hmonitor,
+            decision_key=self._decision_key,
+            valid=valid,
+            seen_tick=self._check_count,
+        )
+        self._records_seen += 1
+
+    def _prune_window_records(self):
+        """Forget windows that were not enumerated in the current check."""
+        current = self._check_count
+        records = self._window_records
+        for hwnd in [h for h, record in records.items() if record.seen_tick != current]:
+            del records[hwnd]
+
+    def enforce_window(
+        self,
+        hwnd: int,
+        is_currently_dragging: bool = False,
+        seen_at: Optional[float] = None,
+    ) -> bool:
+        """
+        Check a single window and move it if it violates the restrictions.
+
+        Args:
+            hwnd: Window handle
+            is_currently_dragging: The user is dragging this window - defer the
+                move instead of applying it
+            seen_at: perf_counter() time the window's state was reported
+                (event timestamp), defaults to now
+
+        Returns:
+            True if the window was moved, False otherwise.
+        """
+        violation = self._evaluate_window(hwnd, is_currently_dragging, seen_at)
+        if violation is None:
+            return False
+
+        return self._apply_moves([violation]) > 0
+
+    def handle_window_event(self, window_event: WindowEvent) -> bool:
+        """
+        Enforce restrictions for the window a WinEvent refers to.
+
+        Used in event-driven mode so that only the affected window is checked
+        instead of enumerating every top-level window. MOVESIZESTART/END
+        events track the window being dragged: only that window is deferred,
+        and it is enforced as soon as the move/size loop ends.
+
+        Args:
+            window_event: Event delivered by a window event source
+
+        Returns:
+            True if a window was moved, False otherwise.
+        """
+        event = window_event.event
+        hwnd = window_event.hwnd
+
+        # Drag tracking continues while protection is off, so re-enabling it
+        # mid-drag does not leave a stale dragged window behind
+        if event == EVENT_SYSTEM_MOVESIZESTART:
+            self._drag_hwnd = hwnd
+            return False
+
+        if event == EVENT_SYSTEM_MOVESIZEEND and hwnd == self._drag_hwnd:
+            self._drag_hwnd = None
+
+        if not self.enabled:
+            return False
+
+        if not self.window_system.has_projectors():
+            return False
+
+        self._refresh_device_handles()
+        dragged_hwnd = self._get_dragged_window()
+
+        moved = False
+        if self._deferred_hwnds:
+            # Windows whose move/size loop has ended are enforced right away
+            # instead of waiting for the next sweep
+            moved = self._flush_deferred(dragged_hwnd) > 0
+
+        return (
+            self.enforce_window(hwnd, hwnd == dragged_hwnd, window_event.timestamp)
+            or moved
+        )
+
     def check_and_enforce(self) -> int:
         """
         Check all windows and enforce projector restrictions.
@@ -306,97 +970,185 @@ class WindowMonitor:
             return 0
 
         # Check if we have projectors to protect
-        if not has_projectors():
+        if not self.window_system.has_projectors():
             return 0
 
+        prof = self.profiler if self.profiler.enabled else None
+        if prof is None:
+            return self._run_check()
+
+        prof.begin_tick()
+        self._tick_profiler = prof
+        start = time.perf_counter()
+        try:
+            return self._run_check()
+        finally:
+            self._tick_profiler = None
+            prof.add(PHASE_TOTAL, time.perf_counter() - start)
+            prof.end_tick()
+
+    def _run_check(self) -> int:
+        """
+        Run one full check of all windows (see check_and_enforce).
+
+        Returns:
+            Number of windows moved.
+        """
+        prof = self._tick_profiler
+        if prof is not None:
+            t0 = time.perf_counter()
+
+        self._check_count += 1
+        self._records_seen = 0
+
         # Clean up stale entries
         self._cleanup_old_entries()
 
-        # Detect if user is currently dragging
-        is_currently_dragging = _is_dragging()
-
-        # Initialize moved counter
-        moved_count = 0
-
-        # Detect drag end - apply deferred enforcement
-        if self._was_dragging and not is_currently_dragging:
-            # Drag just ended - process deferred windows
-            deferred = self._deferred_hwnds.copy()
-            self._deferred_hwnds.clear()
-            for hwnd in deferred:
-                if self.is_valid_window(hwnd) and not self._is_recently_moved(hwnd):
-                    if self.move_to_primary_monitor(hwnd):
-                        moved_count += 1
-                        self.stats.total_moves += 1
-                        try:
-                            title = win32gui.GetWindowText(hwnd)
-                            self.stats.last_moved_title = title
-                            self.stats.last_moved_process = (
-                                self.get_process_name(hwnd) or "Unknown"
-                            )
-                            if self.on_window_moved:
-                                self.on_window_moved(
-                                    hwnd, self.get_process_name(hwnd), title
-                                )
-                        except Exception:
-                            pass
-
-        self._was_dragging = is_currently_dragging
+        # Resolve monitor handles once for every window checked in this tick
+        self._refresh_device_handles()
 
-        def enum_callback(hwnd, _):
-            nonlocal moved_count
+        if prof is not None:
+            t1 = time.perf_counter()
+            prof.add(PHASE_CLEANUP, t1 - t0)
 
-            if not self.is_valid_window(hwnd):
-                return True
+        # Only the window being dragged is deferred, everything else is enforced
+        dragged_hwnd = self._get_dragged_window()
 
-            # Skip recently moved windows (debounce)
-            if self._is_recently_moved(hwnd):
+        if prof is not None:
+            t2 = time.perf_counter()
+            prof.add(PHASE_DRAG_DETECTION, t2 - t1)
+
+        # Windows to move in this tick, applied as one batch
+        violations = []
+        self._seen_hwnds = set()
+
+        # Windows that are no longer being dragged get their deferred enforcement
+        if self._deferred_hwnds:
+            violations.extend(self._collect_deferred(dragged_hwnd))
+
+        if prof is not None:
+            t3 = time.perf_counter()
+            prof.add(PHASE_DEFERRED_FLUSH, t3 - t2)
+            # Per-window time of the flush is not part of the enumeration
+            inner_before = self._get_per_window_time(prof)
+
+        queued = {snapshot.hwnd for snapshot, _ in violations}
+
+        def enum_callback(hwnd, _):
+            if hwnd in queued:
                 return True
 
-            should_move, process_name = self.should_move_window(hwnd)
-
-            if should_move:
-                if is_currently_dragging:
-                    # Defer enforcement until drag ends
-                    self._deferred_hwnds.add(hwnd)
-                else:
-                    if self.move_to_primary_monitor(hwnd):
-                        moved_count += 1
-                        self.stats.total_moves += 1
-
-                        # Try to get window info for stats
-                        try:
-                            title = win32gui.GetWindowText(hwnd)
-                            self.stats.last_moved_title = title
-                            self.stats.last_moved_process = process_name or "Unknown"
-
-                            # Call callback if set
-                            if self.on_window_moved:
-                                self.on_window_moved(hwnd, process_name, title)
-                        except Exception:
-                            pass
+            violation = self._evaluate_window(hwnd, hwnd == dragged_hwnd)
+            if violation is not None:
+                violations.append(violation)
 
             return True
 
         try:
-            win32gui.EnumWindows(enum_callback, None)
+            self.window_system.enum_windows(enum_callback, None)
         except Exception as e:
             pass
 
+        if prof is not None:
+            t4 = time.perf_counter()
+            # Enumeration is the walk itself, without the per-window checks
+            inner = self._get_per_window_time(prof) - inner_before
+            prof.add(PHASE_ENUMERATION, max(0.0, (t4 - t3) - inner))
+
+        moved_count = self._apply_moves(violations)
+
+        if prof is not None:
+            prof.add(PHASE_MOVE, time.perf_counter() - t4)
+
+        # Forget windows that are gone
+        if len(self._window_records) > self._records_seen:
+            self._prune_window_records()
+
+        for hwnd in [h for h in self._violation_first_seen if h not in self._seen_hwnds]:
+            del self._violation_first_seen[hwnd]
+
+        if len(self._verified_pids) > len(self._seen_hwnds):
+            for hwnd in [h for h in self._verified_pids if h not in self._seen_hwnds]:
+                del self._verified_pids[hwnd]
+
+        self.last_tick_activity = self._detect_activity(moved_count)
+
         return moved_count
 
+    @staticmethod
+    def _get_per_window_time(prof: PhaseProfiler) -> float:
+        """Get the time spent in per-window phases so far in this tick (seconds)."""
+        return (
+            prof.elapsed(PHASE_VALIDITY)
+            + prof.elapsed(PHASE_PROCESS_LOOKUP)
+            + prof.elapsed(PHASE_WHITELIST)
+            + prof.elapsed(PHASE_GEOMETRY)
+        )
+
+    def _detect_activity(self, moved_count: int) -> bool:
+        """
+        Check whether anything changed since the previous check.
+
+        Activity is a moved window, a new window, a foreground change or
+        user input.
+
+        Args:
+            moved_count: Number of windows moved in this check
+
+        Returns:
+            True if there was activity, False otherwise.
+        """
+        new_windows = not self._seen_hwnds.issubset(self._last_seen_hwnds)
+        # A copy: hook events add to self._seen_hwnds until the next check
+        self._last_seen_hwnds = frozenset(self._seen_hwnds)
+
+        try:
+            foreground = self.window_system.get_foreground_window()
+        except Exception:
+            foreground = 0
+
+        try:
+            last_input_tick = self.window_system.get_last_input_tick()
+        except Exception:
+            last_input_tick = 0
+
+        activity = (
+            moved_count > 0
+            or new_windows
+            or foreground != self._last_foreground
+            or last_input_tick != self._last_input_tick
+        )
+
+        self._last_foreground = foreground
+        self._last_input_tick = last_input_tick
+
+        return activity
+
     def get_stats(self) -> WindowMoveStats:
         """
         Get statistics about moved windows.
 
+        enforcement_latency holds the time from window-on-projector to moved
+        (p50/p95/p99/max via its summary()).
+
         Returns:
             WindowMoveStats object
         """
         return self.stats
 
+    def get_process_cache_stats(self) -> ProcessCacheStats:
+        """
+        Get process name cache hit/miss statistics.
+
+        Returns:
+            ProcessCacheStats object
+        """
+        return self.process_cache.get_stats()
+
     def reset_stats(self):
         """Reset the move statistics."""
         self.stats = WindowMoveStats()
+        self.process_cache.reset_stats()
 
 
 # Global monitor instance
@@ -0,0 +1,149 @@
+"""
+Window system access module.
+
+This module collects every window, input, monitor and process call the
+enforcement engine makes into one object. WindowMonitor talks only to this
+object, so the engine can be driven by an in-memory window system (see
+benchmarks/fake_window_system.py) on machines without the Win32 API.
+"""
+
+import ctypes
+from typing import Callable, FrozenSet, List, Optional, Sequence, Tuple
+
+from . import monitor_info
+from .monitor_info import MonitorInfo
+
+
+VK_LBUTTON = 0x01
+HWND_TOP = 0
+SWP_NOACTIVATE = 0x0010
+SWP_SHOWWINDOW = 0x0040
+MOVE_FLAGS = SWP_SHOWWINDOW | SWP_NOACTIVATE
+
+# (hwnd, x, y, width, height)
+WindowPlacement = Tuple[int, int, int, int, int]
+
+
+class Win32WindowSystem:
+    """Window system backed by pywin32 and user32."""
+
+    def __init__(self):
+        """Bind the Win32 functions used by the engine."""
+        import win32gui
+        import win32process
+        import win32api
+        import psutil
+        from ctypes import wintypes
+
+        self._win32process = win32process
+        self._win32api = win32api
+        self._open_process = psutil.Process
+
+        # Hot-path calls are bound directly to avoid a wrapper per call
+        self.enum_windows: Callable = win32gui.EnumWindows
+        self.is_window: Callable[[int], bool] = win32gui.IsWindow
+        self.is_window_visible: Callable[[int], bool] = win32gui.IsWindowVisible
+        self.get_window_text: Callable[[int], str] = win32gui.GetWindowText
+        self.get_class_name: Callable[[int], str] = win32gui.GetClassName
+        self.get_window_rect: Callable = win32gui.GetWindowRect
+        self.get_foreground_window: Callable[[], int] = win32gui.GetForegroundWindow
+        self._set_window_pos = win32gui.SetWindowPos
+
+        user32 = ctypes.windll.user32
+        user32.BeginDeferWindowPos.argtypes = [ctypes.c_int]
+        user32.BeginDeferWindowPos.restype = wintypes.HANDLE
+        user32.DeferWindowPos.argtypes = [
+            wintypes.HANDLE,
+            wintypes.HWND,
+            wintypes.HWND,
+            ctypes.c_int,
+            ctypes.c_int,
+            ctypes.c_int,
+            ctypes.c_int,
+            wintypes.UINT,
+        ]
+        user32.DeferWindowPos.restype = wintypes.HANDLE
+        user32.EndDeferWindowPos.argtypes = [wintypes.HANDLE]
+        user32.EndDeferWindowPos.restype = wintypes.BOOL
+        self._user32 = user32
+
+    # Windows
+
+    def get_window_pid(self, hwnd: int) -> int:
+        """Get the ID of the process that owns a window."""
+        _, pid = self._win32process.GetWindowThreadProcessId(hwnd)
+        return pid
+
+    def set_window_pos(self, hwnd: int, x: int, y: int, width: int, height: int):
+        """Move and resize a window without activating it."""
+        self._set_window_pos(hwnd, HWND_TOP, x, y, width, height, MOVE_FLAGS)
+
+    def set_window_pos_batch(self, placements: Sequence[WindowPlacement]):
+        """
+        Move several windows in one DeferWindowPos transaction.
+
+        Args:
+            placements: List of (hwnd, x, y, width, height)
+
+        Raises:
+            OSError: If any step of the transaction fails.
+        """
+        user32 = self._user32
+
+        hdwp = user32.BeginDeferWindowPos(len(placements))
+        if not hdwp:
+            raise OSError("BeginDeferWindowPos failed")
+
+        for hwnd, x, y, width, height in placements:
+            hdwp = user32.DeferWindowPos(
+                hdwp, hwnd, HWND_TOP, x, y, width, height, MOVE_FLAGS
+            )
+            if not hdwp:
+                # DeferWindowPos frees the structure when it fails
+                raise OSError("DeferWindowPos failed")
+
+        if not user32.EndDeferWindowPos(hdwp):
+            raise OSError("EndDeferWindowPos failed")
+
+    # Input
+
+    def is_left_button_down(self) -> bool:
+        """Check if the left mouse button is pressed."""
+        return (self._win32api.GetAsyncKeyState(VK_LBUTTON) & 0x8000) != 0
+
+    def get_last_input_tick(self) -> int:
+        """Get the tick count of the last keyboard or mouse input."""
+        return self._win32api.GetLastInputInfo()
+
+    # Monitors
+
+    def get_monitors(self) -> List[MonitorInfo]:
+        return monitor_info.get_monitors()
+
+    def get_primary_monitor(self) -> Optional[MonitorInfo]:
+        return monitor_info.get_primary_monitor()
+
+    def get_monitor_by_device_name(self, device_name: str) -> Optional[MonitorInfo]:
+        return monitor_info.get_monitor_by_device_name(device_name)
+
+    def has_projectors(self) -> bool:
+        return monitor_info.has_projectors()
+
+    def get_topology_generation(self) -> int:
+        return monitor_info.get_topology_generation()
+
+    def invalidate_monitors(self):
+        """Re-enumerate monitors on the next monitor query."""
+        monitor_info.invalidate_monitors()
+
+    def get_device_names_for_handle(self, handle: Optional[int]) -> FrozenSet[str]:
+        return monitor_info.get_device_names_for_handle(handle)
+
+    def monitor_from_window(self, hwnd: int) -> Optional[int]:
+        return monitor_info.get_monitor_handle_for_window(hwnd)
+
+    # Processes
+
+    def open_process(self, pid: int) -> "psutil.Process":
+        """Open a process for create_time()/name() queries."""
+        return self._open_process(pid)
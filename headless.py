@@ -0,0 +1,205 @@
+"""
+No More 2nd Screen - Headless Entry Point
+
+Runs window enforcement without the tray icon or the settings UI, for kiosk
+and signage PCs. The enforcement engine drives the WindowMonitor on its own
+thread exactly as in the tray build; this module only loads the config,
+follows changes to config.json and optionally reports memory and tick timing.
+PySide6 is never imported.
+
+Usage:
+    python headless.py
+    python headless.py --report headless_profile.json --report-interval 60
+"""
+
+import time
+
+# Start of the process, for the time to first protection
+_STARTUP_START = time.perf_counter()
+
+import argparse
+import signal
+import sys
+import threading
+
+from core.monitor_info import get_monitors
+from core.config_store import get_config_store, migrate_protected_monitors
+from core.whitelist import get_whitelist, CONFIG_KEYS as WHITELIST_CONFIG_KEYS
+from core.window_monitor import get_window_monitor
+from core.engine import EnforcementEngine, EngineSettings, CONFIG_KEYS as ENGINE_CONFIG_KEYS
+
+
+# Longest time startup waits for the first protective sweep
+FIRST_PROTECTION_TIMEOUT_S = 2.0
+
+
+class HeadlessApplication:
+    """Enforcement engine plus config watching, without any UI."""
+
+    def __init__(self, report_path=None, report_interval=0.0):
+        """
+        Initialize the headless application.
+
+        Args:
+            report_path: JSON file the profile report is written to, or None
+            report_interval: Seconds between reports (0: only on exit)
+        """
+        self.report_path = report_path
+        self.report_interval = report_interval
+        self.config_store = get_config_store()
+        self.config = {}
+        self.whitelist = None
+        self.window_monitor = None
+        self.engine = None
+        self.time_to_first_protection_ms = None
+        self._stop_event = threading.Event()
+
+    def start(self):
+        """Load the config and start enforcing."""
+        self.config = self.config_store.load()
+        self._migrate_config_if_needed()
+        self.whitelist = get_whitelist()
+
+        protected_devices = self.config.get("protected_monitors", ["\\\\.\\DISPLAY2", "\\\\.\\DISPLAY3"])
+        self.window_monitor = get_window_monitor(protected_devices)
+        # Tick timing is only collected when it is reported
+        self.window_monitor.profiler.set_enabled(self.report_path is not None)
+
+        self.engine = EnforcementEngine(
+            self.window_monitor, EngineSettings.from_config(self.config)
+        )
+        self.engine.start()
+
+        if self.engine.wait_for_first_check(FIRST_PROTECTION_TIMEOUT_S):
+            self.time_to_first_protection_ms = (
+                self.engine.first_check_at - _STARTUP_START
+            ) * 1000.0
+
+    def _migrate_config_if_needed(self):
+        """Migrate config from numeric indices to device names if needed."""
+        with self.config_store.lock:
+            if migrate_protected_monitors(self.config, get_monitors()):
+                self.config_store.save()
+
+    def check_config_file(self):
+        """Apply changes made to config.json by other programs."""
+        changed = self.config_store.check_for_changes()
+        if not changed:
+            return
+
+        if "protected_monitors" in changed:
+            self._migrate_config_if_needed()
+
+        if changed & WHITELIST_CONFIG_KEYS:
+            self.whitelist.load()
+
+        if changed & ENGINE_CONFIG_KEYS:
+            self.engine.update_settings(EngineSettings.from_config(self.config))
+
+    def write_report(self):
+        """Write the profile report and print a one-line summary."""
+        if self.report_path is None or self.engine is None:
+            return
+
+        extra = self.engine.get_report()
+        extra["build"] = "headless"
+        extra["time_to_first_protection_ms"] = (
+            round(self.time_to_first_protection_ms, 1)
+            if self.time_to_first_protection_ms is not None else None
+        )
+
+        try:
+            self.window_monitor.profiler.export_json(self.report_path, extra)
+        except Exception as e:
+            print(f"Report failed: {e}", file=sys.stderr, flush=True)
+            return
+
+        total = self.window_monitor.profiler.get_summary().get("total", {})
+        memory = extra["memory"]
+        print(
+            f"rss {memory['rss_mb']} MB, "
+            f"{total.get('ticks', 0)} ticks, "
+            f"mean tick {total.get('mean_ms', 0.0)} ms, "
+            f"max tick {total.get('max_ms', 0.0)} ms",
+            flush=True,
+        )
+
+    def run(self):
+        """Watch the config file and report until stop() is called."""
+        now = time.monotonic()
+        next_reload = now
+        next_report = now + self.report_interval if self.report_interval > 0 else None
+
+        while not self._stop_event.is_set():
+            now = time.monotonic()
+
+            if now >= next_reload:
+                try:
+                    self.check_config_file()
+                except Exception:
+                    pass
+                reload_interval = self.config.get("config_reload_interval_ms", 2000)
+                # 0 disables reloading; check again in a while in case that changes
+                next_reload = now + (reload_interval if reload_interval > 0 else 60000) / 1000.0
+
+            if next_report is not None and now >= next_report:
+                self.write_report()
+                next_report = now + self.report_interval
+
+            deadline = next_reload if next_report is None else min(next_reload, next_report)
+            # Short waits, so signal handlers run promptly on Windows too
+            self._stop_event.wait(min(1.0, max(0.0, deadline - time.monotonic())))
+
+    def stop(self):
+        """Make run() return (any thread)."""
+        self._stop_event.set()
+
+    def shutdown(self):
+        """Stop enforcing and write pending changes."""
+        if self.engine:
+            self.engine.stop()
+        self.write_report()
+        self.config_store.flush()
+
+
+def main(argv=None) -> int:
+    """
+    Headless entry point.
+
+    Returns:
+        Process exit code.
+    """
+    parser = argparse.ArgumentParser(description="Run No More 2nd Screen without a UI")
+    parser.add_argument(
+        "--report", metavar="PATH",
+        help="write tick timing and memory usage to this JSON file",
+    )
+    parser.add_argument(
+        "--report-interval", type=float, default=0.0, metavar="SECONDS",
+        help="also write the report this often, not only on exit (default: 0)",
+    )
+    args = parser.parse_args(argv)
+
+    app = HeadlessApplication(args.report, args.report_interval)
+
+    # Ctrl+C, Ctrl+Break and service/kill requests all end the loop
+    for name in ("SIGINT", "SIGTERM", "SIGBREAK"):
+        if hasattr(signal, name):
+            signal.signal(getattr(signal, name), lambda signum, frame: app.stop())
+
+    try:
+        app.start()
+        app.run()
+    except Exception:
+        import traceback
+
+        traceback.print_exc()
+        return 1
+    finally:
+        app.shutdown()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
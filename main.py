@@ -9,84 +9,108 @@ displayed on them. All other windows are automatically moved back to the
 primary monitor (1).
 """
 
+import time
+
+# Start of the "imports" phase of --profile-startup
+_STARTUP_START = time.perf_counter()
+
 import sys
-import os
-import json
-from pathlib import Path
-from typing import List
 
 from PySide6.QtWidgets import QApplication
-from PySide6.QtCore import Qt, QTimer, QObject, Signal
-
-from core.monitor_info import (
-    get_monitor_count,
-    has_projectors,
-    get_monitors,
-    get_monitor_groups,
-    set_primary_monitor,
-)
-from core.whitelist import get_whitelist
-from core.window_monitor import get_window_monitor
-from ui.tray_icon import TrayIconManager
-from ui.settings_dialog import SettingsDialog
+from PySide6.QtCore import Qt, QObject, QTimer, Signal
 
+from core.monitor_info import get_monitor_count, has_projectors, get_monitors
+from core.config_store import get_config_store, migrate_protected_monitors
+from core.whitelist import get_whitelist, CONFIG_KEYS as WHITELIST_CONFIG_KEYS
+from core.window_monitor import get_window_monitor
+from core.engine import EnforcementEngine, EngineSettings, CONFIG_KEYS as ENGINE_CONFIG_KEYS
+from core.profiling import StartupProfile
 
-def get_config_path() -> Path:
-    """Get config file path, using AppData for PyInstaller builds."""
-    if getattr(sys, 'frozen', False):
-        # Running as exe - use AppData directory
-        config_dir = Path(os.environ.get('APPDATA', os.path.expanduser('~')))
-        config_dir = config_dir / "NoMore2ndScreen"
-    else:
-        # Running as Python script - use same directory as script
-        config_dir = Path(__file__).parent
+# Longest time startup waits for the first protective sweep before building
+# the tray anyway
+FIRST_PROTECTION_TIMEOUT_S = 2.0
 
-    config_dir.mkdir(parents=True, exist_ok=True)
-    return config_dir / "config.json"
+# ui.settings_dialog (and the pywin32/psutil modules it needs) is imported
+# when Settings is first opened
 
 
 class Application(QObject):
     """Main application controller."""
 
-    def __init__(self, app):
-        """Initialize the application."""
+    # Emitted from the engine thread, delivered on the GUI thread
+    window_moved = Signal(object, str, str)
+    check_interval_changed = Signal(int)
+    first_check_done = Signal(float)
+
+    def __init__(self, app, startup_profile=None):
+        """
+        Initialize the application.
+
+        Args:
+            app: QApplication instance
+            startup_profile: StartupProfile that startup phases are recorded in
+        """
         super().__init__()
 
         self.app = app
+        self.startup_profile = startup_profile or StartupProfile()
+        self.config_store = get_config_store()
         self.config = {}
         self.check_interval = 500
 
         self.load_config()
+        self.startup_profile.mark("config_load")
+
+        # Enumerated once here; the engine and the tray reuse the topology
+        get_monitor_count()
+        self.startup_profile.mark("monitor_enumeration")
 
         self.whitelist = get_whitelist()
+        self.startup_profile.mark("whitelist_load")
 
         self.window_monitor = None
-        self.tray_manager = TrayIconManager(self)
+        self.engine = None
+        self.tray_manager = None
+        # Milliseconds from process start until the first sweep finished
+        self.time_to_first_protection_ms = None
+
+        self.window_moved.connect(self.on_window_moved)
+        self.first_check_done.connect(self.on_first_check_done)
+
+        # Protect the desktop first (students may already be dragging windows
+        # at logon); the tray and the rest of the UI come after
+        self.initialize_monitoring()
+        self.startup_profile.mark("engine_start")
+        if self.engine.wait_for_first_check(FIRST_PROTECTION_TIMEOUT_S):
+            self._record_first_protection(self.engine.first_check_at)
+        self.startup_profile.mark("first_protection")
+
+        # Imported only now, so it does not delay the first sweep
+        from ui.tray_icon import TrayIconManager
 
-        self.monitor_timer = QTimer(self)
-        self.monitor_timer.timeout.connect(self.check_and_enforce)
+        self.tray_manager = TrayIconManager(self)
+        self.check_interval_changed.connect(self.tray_manager.set_check_interval)
 
         self.tray_manager.toggle_protection.connect(self.toggle_protection)
         self.tray_manager.show_settings.connect(self.show_settings)
         self.tray_manager.exit_app.connect(self.exit_application)
-
-        self.initialize_monitoring()
+        self.tray_manager.profiling_toggled.connect(self.set_profiling_enabled)
+        self.tray_manager.export_profile.connect(self.export_profile)
 
         self.initialize_tray()
+        self.startup_profile.mark("tray_creation")
+
+        # Pick up config.json changes made by other programs (0 disables)
+        self.config_watch_timer = QTimer(self)
+        self.config_watch_timer.timeout.connect(self.check_config_file)
+        reload_interval = self.config.get("config_reload_interval_ms", 2000)
+        if reload_interval > 0:
+            self.config_watch_timer.start(reload_interval)
 
     def load_config(self):
         """Load configuration from config.json."""
-        config_path = get_config_path()
-
-        if config_path.exists():
-            try:
-                with open(config_path, "r", encoding="utf-8") as f:
-                    self.config = json.load(f)
-            except Exception as e:
-                self.config = self._get_default_config()
-        else:
-            self.config = self._get_default_config()
-            self.save_config()
+        # Shared with the whitelist and the settings dialog
+        self.config = self.config_store.load()
 
         self.check_interval = self.config.get("check_interval_ms", 500)
 
@@ -94,55 +118,31 @@ class Application(QObject):
 
     def _migrate_config_if_needed(self):
         """Migrate config from numeric indices to device names if needed."""
-        protected = self.config.get("protected_monitors", [])
-
-        if isinstance(protected, list) and protected:
-            if isinstance(protected[0], int):
-                monitors = get_monitors()
-                device_names = []
-                for idx in protected:
-                    if 0 < idx <= len(monitors):
-                        device_names.append(monitors[idx - 1].device_name)
-
-                if device_names:
-                    self.config["protected_monitors"] = device_names
-                    self.save_config()
-
-    def _get_default_config(self):
-        """Get default configuration."""
-        return {
-            "autostart": False,
-            "protection_enabled": True,
-            "check_interval_ms": 500,
-            "protected_monitors": [2, 3],
-            "whitelist": ["OBS64.EXE", "OBS32.EXE"],
-            "custom_whitelist": [],
-        }
+        with self.config_store.lock:
+            if migrate_protected_monitors(self.config, get_monitors()):
+                self.save_config()
 
     def save_config(self):
-        """Save configuration to config.json."""
-        config_path = get_config_path()
-
-        try:
-            with open(config_path, "w", encoding="utf-8") as f:
-                json.dump(self.config, f, indent=4)
-        except Exception as e:
-            pass
+        """Save configuration to config.json (written shortly after)."""
+        self.config_store.save()
 
     def initialize_monitoring(self):
-        """Initialize the window monitor."""
+        """Initialize the window monitor and start the enforcement engine."""
         protected_devices = self.config.get("protected_monitors", ["\\\\.\\DISPLAY2", "\\\\.\\DISPLAY3"])
-        primary_device = self.config.get("primary_monitor", None)
 
         self.window_monitor = get_window_monitor(protected_devices)
-        if primary_device:
-            self.window_monitor.set_primary_device(primary_device)
-
-        self.window_monitor.set_enabled(self.config.get("protection_enabled", True))
 
-        self.window_monitor.on_window_moved = self.on_window_moved
+        self.engine = EnforcementEngine(
+            self.window_monitor, EngineSettings.from_config(self.config)
+        )
+        self.engine.on_window_moved = self._emit_window_moved
+        self.engine.on_interval_changed = self.check_interval_changed.emit
+        self.engine.on_first_check = self.first_check_done.emit
+        self.engine.start()
 
-        self.monitor_timer.start(self.check_interval)
+    def _emit_window_moved(self, hwnd, process_name, title):
+        """Forward a move notification from the engine thread."""
+        self.window_moved.emit(hwnd, process_name or "", title or "")
 
     def initialize_tray(self):
         """Initialize the system tray icon."""
@@ -153,6 +153,7 @@ class Application(QObject):
 
         protection_enabled = self.config.get("protection_enabled", True)
         self.tray_manager.update_icon(protection_enabled)
+        self.tray_manager.set_check_interval(self.engine.get_interval_ms())
 
         monitor_count = get_monitor_count()
         if has_projectors():
@@ -164,9 +165,27 @@ class Application(QObject):
         if success:
             self.tray_manager.show_message("No More 2nd Screen", f"Running - {message}")
 
+    def _record_first_protection(self, timestamp):
+        """Record the time to first protection (once)."""
+        if self.time_to_first_protection_ms is None:
+            self.time_to_first_protection_ms = (timestamp - self.startup_profile.start) * 1000.0
+
+    def on_first_check_done(self, timestamp):
+        """Print the startup breakdown once the engine finished its first check."""
+        # Only needed here if startup stopped waiting for the first sweep
+        self._record_first_protection(timestamp)
+
+        profile = self.startup_profile
+        if not profile.enabled:
+            return
+        profile.event("first_tick", timestamp)
+        print(profile.format_report(), flush=True)
+
     def show_settings(self):
         """Show the settings dialog."""
         try:
+            from ui.settings_dialog import SettingsDialog
+
             dialog = SettingsDialog(self.config, self.whitelist)
 
             dialog.settings_changed.connect(self.on_settings_changed)
@@ -178,10 +197,36 @@ class Application(QObject):
 
             traceback.print_exc()
 
-    def check_and_enforce(self):
-        """Check windows and enforce projector restrictions."""
+    def set_profiling_enabled(self, enabled):
+        """Switch per-phase timing of the enforcement check on or off."""
         if self.window_monitor:
-            moved = self.window_monitor.check_and_enforce()
+            self.window_monitor.profiler.set_enabled(enabled)
+
+    def export_profile(self):
+        """Export phase timings and engine statistics as JSON."""
+        if not self.window_monitor or not self.engine:
+            return
+
+        from PySide6.QtWidgets import QFileDialog
+
+        path, _ = QFileDialog.getSaveFileName(
+            None, "Export Profile", "nomore2ndscreen_profile.json", "JSON (*.json)"
+        )
+        if not path:
+            return
+
+        extra = self.engine.get_report()
+        extra["build"] = "tray"
+        extra["time_to_first_protection_ms"] = (
+            round(self.time_to_first_protection_ms, 1)
+            if self.time_to_first_protection_ms is not None else None
+        )
+
+        try:
+            self.window_monitor.profiler.export_json(path, extra)
+        except Exception as e:
+            if self.tray_manager:
+                self.tray_manager.show_message("Export Failed", str(e))
 
     def on_window_moved(self, hwnd, process_name, title):
         """Called when a window is moved back to primary monitor."""
@@ -189,34 +234,47 @@ class Application(QObject):
 
     def on_settings_changed(self):
         """Handle settings changes."""
-        if self.window_monitor:
-            protected_devices = self.config.get("protected_monitors", [])
-
-            primary_device = self.config.get("primary_monitor", None)
-
-            self.window_monitor.set_protected_devices(protected_devices)
-            if primary_device:
-                self.window_monitor.set_primary_device(primary_device)
-
-            self.window_monitor.set_enabled(self.config.get("protection_enabled", True))
+        self.check_interval = self.config.get("check_interval_ms", 500)
 
-            new_interval = self.config.get("check_interval_ms", 500)
-            if new_interval != self.check_interval:
-                self.check_interval = new_interval
-                self.monitor_timer.setInterval(self.check_interval)
+        if self.engine:
+            # Applied atomically by the engine thread before its next check
+            self.engine.update_settings(EngineSettings.from_config(self.config))
 
         if self.tray_manager:
             protection_enabled = self.config.get("protection_enabled", True)
             self.tray_manager.update_icon(protection_enabled)
 
+    def check_config_file(self):
+        """Apply changes made to config.json by other programs."""
+        changed = self.config_store.check_for_changes()
+        if not changed:
+            return
+
+        if "protected_monitors" in changed:
+            self._migrate_config_if_needed()
+
+        # Only the parts the change touches are reloaded, so unrelated caches
+        # (compiled whitelist, window verdicts) stay valid
+        if changed & WHITELIST_CONFIG_KEYS:
+            self.whitelist.load()
+
+        if changed & ENGINE_CONFIG_KEYS:
+            self.on_settings_changed()
+
+        if "config_reload_interval_ms" in changed:
+            reload_interval = self.config.get("config_reload_interval_ms", 2000)
+            if reload_interval > 0:
+                self.config_watch_timer.start(reload_interval)
+            else:
+                self.config_watch_timer.stop()
+
     def toggle_protection(self):
         """Toggle protection on/off."""
-        if self.window_monitor:
-            current = self.window_monitor.is_enabled()
+        if self.engine:
+            current = self.engine.get_settings().enabled
             new_state = not current
-            self.window_monitor.set_enabled(new_state)
-            self.config["protection_enabled"] = new_state
-            self.save_config()
+            self.config_store.set("protection_enabled", new_state)
+            self.engine.update_settings(EngineSettings.from_config(self.config))
             status = "enabled" if new_state else "disabled"
             if self.tray_manager:
                 self.tray_manager.show_message(
@@ -225,21 +283,35 @@ class Application(QObject):
 
     def exit_application(self):
         """Exit the application."""
-        # Stop timer
-        self.monitor_timer.stop()
+        # Stop the engine thread (removes WinEvent hooks)
+        if self.engine:
+            self.engine.stop()
 
         # Hide tray icon
         if self.tray_manager:
             self.tray_manager.hide()
 
+        # Write changes still waiting for the write-behind timer
+        self.config_watch_timer.stop()
+        self.config_store.flush()
+
         # Quit application
         self.app.quit()
 
 
 def main():
-    """Main entry point."""
+    """
+    Main entry point.
+
+    Pass --profile-startup to print how long each startup phase took, and
+    --exit-after-startup to quit as soon as startup finished (used by
+    benchmarks.bench_build to time launches).
+    """
     import sys
 
+    profile = StartupProfile("--profile-startup" in sys.argv, start=_STARTUP_START)
+    profile.mark("imports")
+
     QApplication.setHighDpiScaleFactorRoundingPolicy(
         Qt.HighDpiScaleFactorRoundingPolicy.PassThrough
     )
@@ -247,15 +319,20 @@ def main():
     app = QApplication(sys.argv)
 
     app.setQuitOnLastWindowClosed(False)
+    profile.mark("qt_application")
 
     try:
-        controller = Application(app)
+        controller = Application(app, profile)
     except Exception as e:
         import traceback
 
         traceback.print_exc()
         sys.exit(1)
 
+    if "--exit-after-startup" in sys.argv:
+        # Runs once the event loop has started, i.e. the tray is up
+        QTimer.singleShot(0, controller.exit_application)
+
     try:
         sys.exit(app.exec())
     except Exception as e:
@@ -0,0 +1,102 @@
+"""Tests for the write-behind of the config store."""
+
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import core.config_store as config_store
+from core.config_store import ConfigStore
+
+
+def test_failed_write_is_retried(monkeypatch):
+    monkeypatch.setattr(config_store, "WRITE_RETRY_DELAY", 0.05)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "config.json")
+        store = ConfigStore(path, write_delay=0)
+        store.load()
+
+        write = store._write
+        failures = [OSError("file is locked")]
+
+        def flaky_write(text):
+            if failures:
+                raise failures.pop()
+            write(text)
+
+        store._write = flaky_write
+        store.set("check_interval_ms", 750)
+
+        assert store.dirty
+        assert isinstance(store.last_error, OSError)
+
+        deadline = time.monotonic() + 2.0
+        while store.dirty and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        assert not store.dirty
+        with open(path, encoding="utf-8") as f:
+            assert json.load(f)["check_interval_ms"] == 750
+
+
+def _write_externally(path, data):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    # Make sure the change is visible even on coarse mtime file systems
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10_000_000))
+
+
+def test_external_change_keeps_pending_in_app_edit():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "config.json")
+        store = ConfigStore(path, write_delay=60)
+        store.load()
+        store.flush()
+
+        # Edited in the app, still waiting for the write-behind timer
+        store.set("check_interval_ms", 750)
+
+        on_disk = dict(store.data, check_interval_ms=500, engine_mode="event")
+        _write_externally(path, on_disk)
+
+        changed = store.check_for_changes()
+
+        assert changed == {"engine_mode"}
+        assert store.get("check_interval_ms") == 750
+        assert store.get("engine_mode") == "event"
+        assert store.dirty
+
+        assert store.flush()
+        with open(path, encoding="utf-8") as f:
+            written = json.load(f)
+        assert written["check_interval_ms"] == 750
+        assert written["engine_mode"] == "event"
+
+
+def test_unparsable_file_is_backed_up_before_it_is_replaced():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "config.json")
+        store = ConfigStore(path, write_delay=60)
+        store.load()
+        store.flush()
+
+        broken = '{"check_interval_ms": 750,'
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(broken)
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10_000_000))
+
+        assert store.check_for_changes() == set()
+
+        store.set("adaptive_interval", True)
+        assert store.flush()
+
+        with open(path + ".bak", encoding="utf-8") as f:
+            assert f.read() == broken
+        with open(path, encoding="utf-8") as f:
+            assert json.load(f)["adaptive_interval"] is True
@@ -0,0 +1,24 @@
+"""Tests for the enforcement latency histogram."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.metrics import LatencyHistogram
+
+
+def test_summary_without_samples():
+    summary = LatencyHistogram().summary()
+    assert summary["count"] == 0
+    assert summary["p50_ms"] is None
+    assert summary["p99_ms"] is None
+
+
+def test_summary_values_are_rounded():
+    histogram = LatencyHistogram()
+    histogram.record(1.23456)
+    summary = histogram.summary()
+    assert summary["p50_ms"] == 1.235
+    assert summary["p95_ms"] == 1.235
+    assert summary["max_ms"] == 1.235
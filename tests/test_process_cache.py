@@ -0,0 +1,108 @@
+"""Tests for PID reuse detection in the process identity cache."""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fake_window_system import FakeWindowSystem
+from core.config_store import ConfigStore
+from core.expiry import ExpiringSet
+from core.process_cache import ProcessCache
+from core.whitelist import Whitelist
+from core.window_monitor import WindowMonitor
+
+
+def test_pid_reused_within_trust_interval_is_detected():
+    fake = FakeWindowSystem()
+    fake.add_process(1234, "OBS64.EXE", create_time=1.0)
+    cache = ProcessCache(revalidate_interval=60.0, open_process=fake.open_process)
+
+    assert cache.get(1234).name == "OBS64.EXE"
+
+    # The process exits and its PID is handed to another one at once
+    fake.add_process(1234, "NOTEPAD.EXE", create_time=2.0)
+
+    # Trusted lookups (existing windows of the process) skip the check ...
+    assert cache.get(1234).name == "OBS64.EXE"
+    # ... the first lookup for a new window does not
+    identity = cache.get(1234, revalidate=True)
+    assert identity.name == "NOTEPAD.EXE"
+    assert identity.create_time == 2.0
+    assert cache.get_stats().pid_reuses == 1
+
+
+def test_new_window_of_reused_pid_does_not_inherit_whitelist_verdict():
+    fake = FakeWindowSystem(monitor_count=2)
+    fake.add_process(1234, "OBS64.EXE", create_time=1.0)
+    fake.add_window(0x100, 1234, (0, 0, 800, 600), title="OBS")
+    fake.place_window(0x100, 1)
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = ConfigStore(os.path.join(directory, "config.json"), write_delay=0)
+        monitor = WindowMonitor(
+            [fake.monitors[1].device_name],
+            whitelist=Whitelist(store=store),
+            window_system=fake,
+        )
+        monitor.process_cache.revalidate_interval = 60.0
+
+        monitor.check_and_enforce()
+        assert fake.windows[0x100].hmonitor == fake.monitors[1].handle
+
+        # OBS exits; a non-whitelisted process gets its PID and opens a
+        # window on the projector within the trust interval
+        del fake.windows[0x100]
+        fake.add_process(1234, "NOTEPAD.EXE", create_time=2.0)
+        fake.add_window(0x200, 1234, (0, 0, 800, 600), title="Notes")
+        fake.place_window(0x200, 1)
+
+        monitor.check_and_enforce()
+        assert fake.windows[0x200].hmonitor == fake.monitors[0].handle
+
+
+def test_revalidations_are_not_counted_as_hits():
+    fake = FakeWindowSystem()
+    fake.add_process(1234, "OBS64.EXE", create_time=1.0)
+    cache = ProcessCache(revalidate_interval=60.0, open_process=fake.open_process)
+
+    cache.get(1234)
+    cache.get(1234)
+    cache.get(1234, revalidate=True)
+
+    stats = cache.get_stats()
+    assert (stats.misses, stats.hits, stats.revalidations) == (1, 1, 1)
+    assert stats.hit_rate == 1 / 3
+
+
+def test_violating_window_that_stays_put_is_not_reopened_every_check():
+    fake = FakeWindowSystem(monitor_count=2)
+    fake.add_process(1234, "NOTEPAD.EXE", create_time=1.0)
+    fake.add_window(0x100, 1234, (0, 0, 800, 600), title="Notes")
+    fake.place_window(0x100, 1)
+
+    opens = []
+    open_process = fake.open_process
+    fake.open_process = lambda pid: opens.append(pid) or open_process(pid)
+    # Moves fail, so the window keeps violating
+    fake.set_window_pos = lambda *args: None
+    fake.set_window_pos_batch = lambda placements: None
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = ConfigStore(os.path.join(directory, "config.json"), write_delay=0)
+        monitor = WindowMonitor(
+            [fake.monitors[1].device_name],
+            whitelist=Whitelist(store=store),
+            window_system=fake,
+        )
+        monitor.process_cache.revalidate_interval = 60.0
+        # Let the move debounce expire between checks
+        clock = [0.0]
+        monitor._recently_moved = ExpiringSet(0.5, max_entries=4096, clock=lambda: clock[0])
+
+        for _ in range(5):
+            monitor.check_and_enforce()
+            clock[0] += 1.0
+
+    assert opens == [1234]
@@ -0,0 +1,33 @@
+"""Tests for combining regular expression rules in the whitelist matcher."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.whitelist_rules import WhitelistMatcher
+
+
+def test_backreference_keeps_its_meaning_after_other_groups():
+    rules = [r"re:^(B)X\.EXE$", r"re:^(A)\1\.EXE$"]
+
+    assert WhitelistMatcher(rules[1:]).matches("AA.EXE")
+    matcher = WhitelistMatcher(rules)
+    assert matcher.matches("AA.EXE")
+    assert matcher.matches("BX.EXE")
+    assert not matcher.matches("AB.EXE")
+
+
+def test_named_groups_and_inline_flags_are_compiled_alone():
+    matcher = WhitelistMatcher([
+        r"re:^(?P<tool>X)(?P=tool)\.EXE$",
+        r"re:^(?P<tool>Y)\.EXE$",
+        r"re:(?s)^NOTE.*\.EXE$",
+        "*VIEWER*.EXE",
+    ])
+
+    assert matcher.matches("XX.EXE")
+    assert matcher.matches("Y.EXE")
+    assert matcher.matches("NOTEPAD.EXE")
+    assert matcher.matches("PDFVIEWER.EXE")
+    assert not matcher.matches("XY.EXE")
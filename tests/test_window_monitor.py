@@ -0,0 +1,118 @@
+"""Tests for WindowMonitor running against the in-memory window system."""
+
+import os
+import sys
+import tempfile
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fake_window_system import FakeWindowSystem
+from core.config_store import ConfigStore
+from core.whitelist import Whitelist
+from core.window_events import EVENT_OBJECT_SHOW, WindowEvent
+from core.window_monitor import WindowMonitor
+
+
+@pytest.fixture
+def fake():
+    fake = FakeWindowSystem(monitor_count=2)
+    fake.add_process(100, "NOTEPAD.EXE")
+    fake.add_process(200, "OBS64.EXE")
+    return fake
+
+
+@pytest.fixture
+def monitor(fake):
+    with tempfile.TemporaryDirectory() as directory:
+        store = ConfigStore(os.path.join(directory, "config.json"), write_delay=0)
+        yield WindowMonitor(
+            [fake.monitors[1].device_name],
+            whitelist=Whitelist(store=store),
+            window_system=fake,
+        )
+
+
+def test_window_added_by_hook_event_counts_as_activity(fake, monitor):
+    fake.add_window(0x10, 200, (0, 0, 800, 600), title="OBS")
+    monitor.check_and_enforce()
+    monitor.check_and_enforce()
+    assert not monitor.last_tick_activity
+
+    # A new window arrives through a hook event between two checks
+    fake.add_window(0x20, 200, (0, 0, 800, 600), title="OBS 2")
+    monitor.handle_window_event(WindowEvent(EVENT_OBJECT_SHOW, 0x20, time.perf_counter()))
+
+    monitor.check_and_enforce()
+    assert monitor.last_tick_activity
+
+
+def _counts(monitor):
+    return monitor.stats.verdicts_computed, monitor.stats.verdicts_reused
+
+
+def test_unchanged_window_reuses_its_verdict(fake, monitor):
+    fake.add_window(0x10, 100, (0, 0, 800, 600), title="Notes")
+
+    monitor.check_and_enforce()
+    assert _counts(monitor) == (1, 0)
+
+    monitor.check_and_enforce()
+    monitor.check_and_enforce()
+    assert _counts(monitor) == (1, 2)
+
+
+def test_changed_window_state_is_decided_again(fake, monitor):
+    fake.add_window(0x10, 100, (0, 0, 800, 600), title="Notes")
+    monitor.check_and_enforce()
+
+    fake.windows[0x10].title = "Notes - edited"
+    monitor.check_and_enforce()
+    assert _counts(monitor) == (2, 0)
+
+
+def test_whitelist_add_and_remove_force_a_fresh_decision(fake, monitor):
+    monitor.whitelist.add("NOTEPAD.EXE")
+    fake.add_window(0x10, 100, (0, 0, 800, 600), title="Notes")
+    fake.place_window(0x10, 1)
+
+    assert monitor.check_and_enforce() == 0
+    assert monitor.check_and_enforce() == 0
+    assert _counts(monitor) == (1, 1)
+
+    # Unrelated change: still decided again, the verdict stays the same
+    monitor.whitelist.add("OTHER.EXE")
+    assert monitor.check_and_enforce() == 0
+    assert _counts(monitor) == (2, 1)
+
+    monitor.whitelist.remove("NOTEPAD.EXE")
+    assert monitor.check_and_enforce() == 1
+    assert fake.windows[0x10].hmonitor == fake.monitors[0].handle
+
+
+def test_topology_change_forces_a_fresh_decision(fake, monitor):
+    fake.add_window(0x10, 100, (0, 0, 800, 600), title="Notes")
+    monitor.check_and_enforce()
+    monitor.check_and_enforce()
+    assert _counts(monitor) == (1, 1)
+
+    fake.topology_generation += 1
+    monitor.check_and_enforce()
+    assert _counts(monitor) == (2, 1)
+
+
+def test_pid_change_forces_a_fresh_decision(fake, monitor):
+    fake.add_window(0x10, 200, (0, 0, 800, 600), title="Window")
+    fake.place_window(0x10, 1)
+
+    # OBS is whitelisted, so the window may stay on the projector
+    assert monitor.check_and_enforce() == 0
+    assert monitor.check_and_enforce() == 0
+    assert _counts(monitor) == (1, 1)
+
+    # Same handle and state, but now owned by a process that is not
+    fake.windows[0x10].pid = 100
+    assert monitor.check_and_enforce() == 1
+    assert fake.windows[0x10].hmonitor == fake.monitors[0].handle
@@ -16,6 +16,8 @@ from PySide6.QtWidgets import (
     QListWidget,
     QListWidgetItem,
     QInputDialog,
+    QFileDialog,
+    QAbstractItemView,
     QMessageBox,
     QDialogButtonBox,
     QWidget,
@@ -32,35 +34,22 @@ from PySide6.QtGui import QFont
 
 import sys
 import os
-from pathlib import Path
 import win32gui
 import win32con
 import win32process
 import psutil
 
+from core.config_store import get_config_store
 from core.monitor_info import (
     get_monitors,
     get_monitor_groups,
     set_primary_monitor,
     get_primary_device_name,
+    invalidate_monitors,
     MonitorGroup,
 )
 
 
-def get_config_path() -> Path:
-    """Get config file path, using AppData for PyInstaller builds."""
-    if getattr(sys, 'frozen', False):
-        # Running as exe - use AppData directory
-        config_dir = Path(os.environ.get('APPDATA', os.path.expanduser('~')))
-        config_dir = config_dir / "NoMore2ndScreen"
-    else:
-        # Running as Python script - use same directory as script
-        config_dir = Path(__file__).parent.parent
-
-    config_dir.mkdir(parents=True, exist_ok=True)
-    return config_dir / "config.json"
-
-
 class SettingsDialog(QDialog):
     """Settings dialog for the application."""
 
@@ -105,9 +94,20 @@ class SettingsDialog(QDialog):
         interval_layout.addWidget(self.spin_interval)
         interval_layout.addStretch()
 
+        adaptive_layout = QHBoxLayout()
+        self.chk_adaptive_interval = QCheckBox("Slow down when idle, up to (ms):")
+        self.spin_max_interval = QSpinBox()
+        self.spin_max_interval.setMinimum(100)
+        self.spin_max_interval.setMaximum(10000)
+        self.spin_max_interval.setSingleStep(100)
+        adaptive_layout.addWidget(self.chk_adaptive_interval)
+        adaptive_layout.addWidget(self.spin_max_interval)
+        adaptive_layout.addStretch()
+
         general_layout.addWidget(self.chk_enable_protection)
         general_layout.addWidget(self.chk_autostart)
         general_layout.addLayout(interval_layout)
+        general_layout.addLayout(adaptive_layout)
         general_group.setLayout(general_layout)
 
         monitors_group = QGroupBox("Protected Monitors")
@@ -154,16 +154,20 @@ class SettingsDialog(QDialog):
 
         self.list_whitelist = QListWidget()
         self.list_whitelist.setMinimumHeight(150)
+        self.list_whitelist.setSelectionMode(QAbstractItemView.ExtendedSelection)
         whitelist_layout.addWidget(self.list_whitelist)
 
         buttons_layout = QHBoxLayout()
         self.btn_add_process = QPushButton("Add Process...")
         self.btn_add_executable = QPushButton("Add by Name...")
+        self.btn_import = QPushButton("Import...")
+        self.btn_import.setToolTip("Add entries from a text file (one per line)")
         self.btn_remove = QPushButton("Remove")
         self.btn_remove.setEnabled(False)
 
         buttons_layout.addWidget(self.btn_add_process)
         buttons_layout.addWidget(self.btn_add_executable)
+        buttons_layout.addWidget(self.btn_import)
         buttons_layout.addWidget(self.btn_remove)
         buttons_layout.addStretch()
 
@@ -188,8 +192,9 @@ class SettingsDialog(QDialog):
         self.list_whitelist.itemSelectionChanged.connect(self.on_selection_changed)
         self.btn_add_process.clicked.connect(self.add_process_by_window)
         self.btn_add_executable.clicked.connect(self.add_process_by_name)
+        self.btn_import.clicked.connect(self.import_whitelist)
         self.btn_remove.clicked.connect(self.remove_process)
-        self.btn_refresh.clicked.connect(self._load_monitor_groups)
+        self.btn_refresh.clicked.connect(self._refresh_monitor_groups)
         self.btn_set_primary.clicked.connect(self.set_primary_monitor)
         self.tree_monitors.itemChanged.connect(self._update_status_label)
         self.tree_monitors.itemSelectionChanged.connect(self._on_monitor_selection_changed)
@@ -199,6 +204,8 @@ class SettingsDialog(QDialog):
         self.chk_enable_protection.stateChanged.connect(self._mark_modified)
         self.chk_autostart.stateChanged.connect(self._mark_modified)
         self.spin_interval.valueChanged.connect(self._mark_modified)
+        self.chk_adaptive_interval.stateChanged.connect(self._mark_modified)
+        self.spin_max_interval.valueChanged.connect(self._mark_modified)
 
     def _mark_modified(self):
         """Mark settings as modified."""
@@ -219,6 +226,17 @@ class SettingsDialog(QDialog):
         self.spin_interval.setValue(
             self.config.get("check_interval_ms", 500)
         )
+        self.chk_adaptive_interval.setChecked(
+            self.config.get("adaptive_interval", False)
+        )
+        self.spin_max_interval.setValue(
+            self.config.get("max_check_interval_ms", 2000)
+        )
+
+    def _refresh_monitor_groups(self):
+        """Re-enumerate the monitors and rebuild the tree view."""
+        invalidate_monitors()
+        self._load_monitor_groups()
 
     def _load_monitor_groups(self):
         """Load monitor groups and build tree view."""
@@ -349,7 +367,7 @@ class SettingsDialog(QDialog):
             try:
                 success = set_primary_monitor(device_name)
                 if success:
-                    self.config["primary_monitor"] = device_name
+                    get_config_store().set("primary_monitor", device_name)
                     self._load_monitor_groups()  # Refresh the display
                     QMessageBox.information(
                         self, "Success", f"{group.name} has been set as the primary monitor."
@@ -375,49 +393,79 @@ class SettingsDialog(QDialog):
         process_name, ok = QInputDialog.getText(
             self,
             "Add Process by Name",
-            "Enter the executable name (e.g., NOTEPAD.EXE):",
+            "Enter the executable name (e.g., NOTEPAD.EXE) or a rule\n"
+            "(e.g., *VIEWER*.EXE, C:\\Program Files\\App\\, CHROME.EXE | class=...):",
         )
 
         if ok and process_name:
             self.whitelist.add(process_name, custom=True)
             self.refresh_whitelist_list()
 
+    def import_whitelist(self):
+        """Add whitelist entries from a text file, one per line."""
+        path, _ = QFileDialog.getOpenFileName(
+            self,
+            "Import Whitelist",
+            "",
+            "Text Files (*.txt);;All Files (*)",
+        )
+        if not path:
+            return
+
+        try:
+            added = self.whitelist.import_file(path)
+        except Exception as e:
+            QMessageBox.warning(self, "Error", f"Failed to import whitelist: {e}")
+            return
+
+        self.refresh_whitelist_list()
+        QMessageBox.information(self, "Import Whitelist", f"Added {added} new entries.")
+
     def remove_process(self):
-        """Remove selected process from whitelist."""
-        current_item = self.list_whitelist.currentItem()
-        if current_item:
-            text = current_item.text()
+        """Remove the selected processes from the whitelist."""
+        process_names = []
+        for item in self.list_whitelist.selectedItems():
+            text = item.text()
 
             if "(default)" in text:
-                process_name = text.replace(" (default)", "")
+                process_names.append(text.replace(" (default)", ""))
             else:
-                process_name = text
-
-            if self.whitelist.is_default(process_name):
-                QMessageBox.warning(
-                    self,
-                    "Cannot Remove",
-                    "Cannot remove default whitelisted applications.",
-                )
-                return
+                process_names.append(text)
+
+        if not process_names:
+            return
+
+        defaults = [name for name in process_names if self.whitelist.is_default(name)]
+        if defaults:
+            QMessageBox.warning(
+                self,
+                "Cannot Remove",
+                "Cannot remove default whitelisted applications.",
+            )
+            process_names = [name for name in process_names if name not in defaults]
 
-            self.whitelist.remove(process_name)
+        if process_names:
+            self.whitelist.remove_many(process_names)
             self.refresh_whitelist_list()
 
     def apply_settings(self):
         """Apply the current settings."""
-        self.config["protection_enabled"] = self.chk_enable_protection.isChecked()
-        self.config["check_interval_ms"] = self.spin_interval.value()
-
-        protected_devices = self._get_selected_protected_devices()
-
-        if protected_devices:
-            self.config["protected_monitors"] = protected_devices
-        else:
-            self.config["protected_monitors"] = []
+        values = {
+            "protection_enabled": self.chk_enable_protection.isChecked(),
+            "check_interval_ms": self.spin_interval.value(),
+            "adaptive_interval": self.chk_adaptive_interval.isChecked(),
+            "max_check_interval_ms": max(
+                self.spin_max_interval.value(), self.spin_interval.value()
+            ),
+            "protected_monitors": self._get_selected_protected_devices() or [],
+        }
 
         self.set_autostart(self.chk_autostart.isChecked())
 
+        # Applied under the store's lock, so the write-behind never sees a
+        # half-applied change
+        get_config_store().update(values)
+
         self.save_config()
 
         self.settings_changed.emit()
@@ -497,14 +545,14 @@ class SettingsDialog(QDialog):
                     app_path = f'"{app_path}" "{script_path}"'
 
                 winreg.SetValueEx(key, "NoMore2ndScreen", 0, winreg.REG_SZ, app_path)
-                self.config["autostart"] = True
+                get_config_store().set("autostart", True)
             else:
                 try:
                     winreg.DeleteValue(key, "NoMore2ndScreen")
                 except FileNotFoundError:
                     pass
 
-                self.config["autostart"] = False
+                get_config_store().set("autostart", False)
 
             winreg.CloseKey(key)
         except Exception as e:
@@ -512,36 +560,13 @@ class SettingsDialog(QDialog):
 
     def save_config(self):
         """Save configuration to file."""
-        import json
-
-        config_path = get_config_path()
-
-        try:
-            existing_config = {}
-            if config_path.exists():
-                with open(config_path, "r", encoding="utf-8") as f:
-                    existing_config = json.load(f)
-
-            existing_config["autostart"] = self.config.get("autostart", False)
-            existing_config["protection_enabled"] = self.config.get(
-                "protection_enabled", True
+        # The changes are already in the config store (see apply_settings);
+        # write them now so errors can be reported here
+        store = get_config_store()
+        if not store.flush():
+            QMessageBox.warning(
+                self, "Save Error", f"Could not save configuration: {store.last_error}"
             )
-            existing_config["check_interval_ms"] = self.config.get(
-                "check_interval_ms", 500
-            )
-
-            protected_devices = self._get_selected_protected_devices()
-            existing_config["protected_monitors"] = protected_devices if protected_devices else []
-
-            primary_monitor = self.config.get("primary_monitor", "")
-            if primary_monitor:
-                existing_config["primary_monitor"] = primary_monitor
-
-            with open(config_path, "w", encoding="utf-8") as f:
-                json.dump(existing_config, f, indent=4)
-
-        except Exception as e:
-            QMessageBox.warning(self, "Save Error", f"Could not save configuration: {e}")
 
 
 class WindowPickerDialog(QDialog):
@@ -22,6 +22,8 @@ class TrayIconManager(QObject):
     show_settings = Signal()
     exit_app = Signal()
     protection_toggled = Signal(bool)
+    profiling_toggled = Signal(bool)
+    export_profile = Signal()
 
     def __init__(self, parent=None):
         """
@@ -33,6 +35,7 @@ class TrayIconManager(QObject):
         super().__init__(parent)
 
         self.protection_enabled = True
+        self.check_interval_ms = None
         self.tray_icon = None
 
     def create_tray_icon(self):
@@ -82,6 +85,18 @@ class TrayIconManager(QObject):
         action_settings.triggered.connect(self.show_settings.emit)
         menu.addAction(action_settings)
 
+        # Profiling submenu
+        menu_profiling = menu.addMenu("Profiling")
+
+        self.action_profiling = QAction("Collect Timings", menu_profiling)
+        self.action_profiling.setCheckable(True)
+        self.action_profiling.toggled.connect(self.profiling_toggled.emit)
+        menu_profiling.addAction(self.action_profiling)
+
+        action_export_profile = QAction("Export as JSON...", menu_profiling)
+        action_export_profile.triggered.connect(self.export_profile.emit)
+        menu_profiling.addAction(action_export_profile)
+
         # About action
         action_about = QAction("About", menu)
         action_about.triggered.connect(self._show_about)
@@ -168,7 +183,20 @@ class TrayIconManager(QObject):
         """Update the tray icon tooltip."""
         if self.tray_icon:
             status = "enabled" if self.protection_enabled else "disabled"
-            self.tray_icon.setToolTip(f"No More 2nd Screen\nProtection: {status}")
+            tooltip = f"No More 2nd Screen\nProtection: {status}"
+            if self.check_interval_ms is not None:
+                tooltip += f"\nCheck interval: {self.check_interval_ms} ms"
+            self.tray_icon.setToolTip(tooltip)
+
+    def set_check_interval(self, interval_ms: int):
+        """
+        Show the current check interval in the tooltip.
+
+        Args:
+            interval_ms: Current check interval in milliseconds
+        """
+        self.check_interval_ms = interval_ms
+        self.update_tooltip()
 
     def _on_toggle_protection(self):
         """Handle toggle protection action."""